@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from dimacs import read_dimacs, iter_clauses
+from knowledge_base import KnowledgeBase
+
+
+def _backbone_partiel(fichier, candidats):
+    """
+    Tâche exécutée dans un processus du pool : recharge la base et
+    teste uniquement les candidats reçus.
+    """
+    lits, offsets, nb_vars = read_dimacs(fichier)
+    base = KnowledgeBase(iter_clauses(lits, offsets), nb_vars)
+    return base.backbone(candidats), base.stats()
+
+
+def entailed_literals(fichier, processes=1):
+    """
+    Calcule en une passe tous les littéraux impliqués par la base CNF du fichier.
+    Un premier modèle filtre les candidats ; avec processes > 1, les candidats
+    restants sont répartis entre plusieurs processus.
+    Retourne un dictionnaire sérialisable en JSON.
+    """
+    debut = time.perf_counter()
+    lits, offsets, nb_vars = read_dimacs(fichier)
+    base = KnowledgeBase(iter_clauses(lits, offsets), nb_vars)
+    coherente = base.is_consistent()
+
+    if not coherente or processes <= 1 or base.moteur is not None:
+        impliques = base.backbone()
+        stats = [base.stats()]
+    else:
+        candidats = base.solver.model()
+        taille = -(-len(candidats) // processes)
+        lots = [candidats[i:i + taille] for i in range(0, len(candidats), taille)]
+        impliques = []
+        stats = []
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for partiel, stats_partiel in pool.map(_backbone_partiel, [fichier] * len(lots), lots):
+                impliques.extend(partiel)
+                stats.append(stats_partiel)
+        impliques.sort(key=abs)
+
+    return {
+        "file": fichier,
+        "nb_vars": base.nb_vars,
+        "nb_clauses": len(offsets) - 1,
+        "consistent": coherente,
+        "entailed": impliques,
+        "fragment": base.fragment,
+        "processes": processes,
+        "time": round(time.perf_counter() - debut, 6),
+        "conflicts": sum(s["conflicts"] for s in stats),
+        "propagations": sum(s["propagations"] for s in stats),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Liste en JSON tous les littéraux impliqués par une base CNF.")
+    parser.add_argument("fichiers", nargs="+", help="fichiers DIMACS CNF")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help=f"nombre de processus (ex: {os.cpu_count()})")
+    args = parser.parse_args()
+
+    resultats = [entailed_literals(f, args.processes) for f in args.fichiers]
+    print(json.dumps(resultats[0] if len(resultats) == 1 else resultats, ensure_ascii=False))
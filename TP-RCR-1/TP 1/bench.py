@@ -0,0 +1,201 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from dimacs import read_dimacs, iter_clauses
+from knowledge_base import KnowledgeBase
+from obdd import CompiledBase
+from preprocess import Preprocessor
+from solvers import get_backend
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+CORPUS = ["test1.cnf", "test2.cnf", "zoo.cnf", "uf200-015.cnf", "uuf200-079.cnf"]
+
+# nom affiché -> (backend, prétraitement)
+CONFIGURATIONS = {
+    "cdcl": ("cdcl", False),
+    "cdcl+preprocess": ("cdcl", True),
+    "ubcsat": ("ubcsat", False),
+    "portfolio": ("portfolio", False),
+    "obdd": ("obdd", False),
+}
+
+
+def _memoire_max():
+    """
+    Pic de mémoire résidente du processus courant, en Ko.
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if platform.system() == "Darwin" else rss
+
+
+def _requetes(nb_vars, nb_requetes, graine):
+    litteraux = [l for v in range(1, nb_vars + 1) for l in (v, -v)]
+    if nb_requetes is None or nb_requetes >= len(litteraux):
+        return litteraux
+    return sorted(random.Random(graine).sample(litteraux, nb_requetes), key=abs)
+
+
+def run_config(fichier, config, nb_requetes=None, graine=0, ubcsat_path="./ubcsat"):
+    """
+    Exécute toutes les requêtes d'entailment d'un fichier avec une configuration.
+    Appelée dans un processus neuf, pour que le pic de mémoire lui soit propre.
+    """
+    backend, pretraitement = CONFIGURATIONS[config]
+    debut = time.perf_counter()
+    lits, offsets, nb_vars = read_dimacs(fichier, cache=False)
+    requetes = _requetes(nb_vars, nb_requetes, graine)
+
+    if backend == "cdcl":
+        base = KnowledgeBase(iter_clauses(lits, offsets), nb_vars, preprocess=pretraitement)
+        chargement = time.perf_counter() - debut
+        reponses = {l: base.entails(l) for l in requetes}
+        stats = base.stats()
+    elif backend == "obdd":
+        # compilation comprise dans le temps de chargement (le fichier compilé n'est pas relu)
+        try:
+            base = CompiledBase.compile(iter_clauses(lits, offsets), nb_vars)
+        except RuntimeError as e:
+            return {"file": os.path.basename(fichier), "config": config, "skipped": str(e)}
+        chargement = time.perf_counter() - debut
+        reponses = {l: base.entails(l) for l in requetes}
+        stats = {}
+    else:
+        solver = get_backend(backend, ubcsat_path=ubcsat_path)
+        if pretraitement:
+            pre = Preprocessor(iter_clauses(lits, offsets), nb_vars).run()
+            solver.load(pre.clauses, pre.nb_vars)
+        else:
+            solver.load(iter_clauses(lits, offsets), nb_vars)
+        chargement = time.perf_counter() - debut
+        reponses = {l: not solver.solve([-l]) for l in requetes}
+        stats = {}
+
+    duree = time.perf_counter() - debut
+    propagations = stats.get("propagations")
+    return {
+        "file": os.path.basename(fichier),
+        "config": config,
+        "complete": backend in ("cdcl", "obdd"),
+        "queries": len(requetes),
+        "entailed": sum(reponses.values()),
+        "wall_time": round(duree, 6),
+        "load_time": round(chargement, 6),
+        "conflicts": stats.get("conflicts"),
+        "propagations": propagations,
+        "propagations_per_sec": round(propagations / duree) if propagations and duree else None,
+        "peak_rss_kb": _memoire_max(),
+        "answers": {str(l): r for l, r in reponses.items()},
+    }
+
+
+def _accord(resultats):
+    """
+    Compare les réponses des différentes configurations sur un même fichier.
+    """
+    desaccords = []
+    par_config = {r["config"]: r["answers"] for r in resultats if "answers" in r}
+    litteraux = set().union(*par_config.values()) if par_config else set()
+    for l in sorted(litteraux, key=lambda x: (abs(int(x)), int(x))):
+        reponses = {c: a[l] for c, a in par_config.items() if l in a}
+        if len(set(reponses.values())) > 1:
+            desaccords.append({"literal": int(l), "answers": reponses})
+    return {"configs": sorted(par_config), "agree": not desaccords, "disagreements": desaccords}
+
+
+def _comparer(rapport, reference):
+    """
+    Rapport de régression : temps actuel / temps de référence par (fichier, configuration).
+    """
+    avant = {(r["file"], r["config"]): r["wall_time"] for r in reference.get("results", []) if "wall_time" in r}
+    comparaison = []
+    for r in rapport["results"]:
+        cle = (r["file"], r["config"])
+        if cle in avant and "wall_time" in r and avant[cle] > 0:
+            comparaison.append({"file": cle[0], "config": cle[1], "before": avant[cle],
+                                "after": r["wall_time"], "ratio": round(r["wall_time"] / avant[cle], 3)})
+    return comparaison
+
+
+def collect_files(chemins):
+    """
+    Fichiers CNF à mesurer : le corpus du TP par défaut, plus les fichiers
+    et dossiers donnés (tous les *.cnf d'un dossier).
+    """
+    fichiers = []
+    for chemin in chemins or [os.path.join(DOSSIER, f) for f in CORPUS]:
+        if os.path.isdir(chemin):
+            fichiers.extend(sorted(glob.glob(os.path.join(chemin, "*.cnf"))))
+        else:
+            fichiers.append(chemin)
+    return fichiers
+
+
+def benchmark(fichiers, configs, nb_requetes=None, graine=0, ubcsat_path="./ubcsat", keep_answers=False):
+    """
+    Mesure chaque configuration sur chaque fichier, chacune dans un processus neuf.
+    """
+    externe = os.path.isfile(ubcsat_path) and os.access(ubcsat_path, os.X_OK)
+    contexte = multiprocessing.get_context("spawn")
+    resultats = []
+    accords = {}
+
+    for fichier in fichiers:
+        resultats_fichier = []
+        for config in configs:
+            if CONFIGURATIONS[config][0] not in ("cdcl", "obdd") and not externe:
+                resultats_fichier.append({"file": os.path.basename(fichier), "config": config,
+                                          "skipped": f"binaire ubcsat introuvable : {ubcsat_path}"})
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexte) as pool:
+                resultats_fichier.append(
+                    pool.submit(run_config, fichier, config, nb_requetes, graine, ubcsat_path).result())
+        accords[os.path.basename(fichier)] = _accord(resultats_fichier)
+        if not keep_answers:
+            for r in resultats_fichier:
+                r.pop("answers", None)
+        resultats.extend(resultats_fichier)
+
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "queries_per_file": nb_requetes,
+        "seed": graine,
+        "results": resultats,
+        "agreement": accords,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark non interactif des backends d'inférence sur des fichiers CNF.")
+    parser.add_argument("chemins", nargs="*", help="fichiers CNF ou dossiers (défaut : corpus du TP 1)")
+    parser.add_argument("-c", "--configs", nargs="+", choices=list(CONFIGURATIONS), default=list(CONFIGURATIONS))
+    parser.add_argument("-n", "--queries", type=int, default=None,
+                        help="nombre de littéraux tirés au hasard par fichier (défaut : tous)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ubcsat", default="./ubcsat", help="chemin du binaire ubcsat")
+    parser.add_argument("-o", "--output", help="fichier JSON de sortie (défaut : sortie standard)")
+    parser.add_argument("--baseline", help="rapport JSON précédent à comparer")
+    parser.add_argument("--answers", action="store_true", help="inclure les réponses de chaque requête")
+    args = parser.parse_args()
+
+    rapport = benchmark(collect_files(args.chemins), args.configs, args.queries, args.seed,
+                        args.ubcsat, args.answers)
+    if args.baseline:
+        with open(args.baseline) as f:
+            rapport["comparison"] = _comparer(rapport, json.load(f))
+
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(texte + "\n")
+    else:
+        print(texte)
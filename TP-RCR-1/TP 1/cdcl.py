@@ -0,0 +1,383 @@
+import heapq
+
+
+def luby(y, i):
+    """
+    Suite de Luby (1, 1, 2, 1, 1, 2, 4, ...) utilisée pour espacer les redémarrages.
+    """
+    taille, seq = 1, 0
+    while taille < i + 1:
+        seq += 1
+        taille = 2 * taille + 1
+    while taille - 1 != i:
+        taille = (taille - 1) >> 1
+        seq -= 1
+        i = i % taille
+    return y ** seq
+
+
+class CDCLSolver:
+    """
+    Solveur SAT complet en mémoire (CDCL) :
+    - propagation unitaire avec deux littéraux surveillés par clause,
+    - apprentissage de clauses (premier UIP) avec minimisation locale,
+    - heuristique VSIDS avec sauvegarde de phase,
+    - redémarrages selon la suite de Luby et nettoyage des clauses apprises.
+
+    Un littéral DIMACS x est codé en interne par 2*|x| (+1 si x < 0),
+    la négation d'un littéral codé l est donc l ^ 1.
+    """
+
+    def __init__(self, nb_vars=0, restart_base=100, decay=0.95):
+        self.nb_vars = 0
+        self.ok = True              # False dès que la base est insatisfiable au niveau 0
+        self.clauses = []
+        self.learnts = []
+        self.watches = [[], []]     # watches[l] : clauses qui surveillent le littéral codé l
+        self.valeur = [0, 0]        # valeur[l] : 1 vrai, -1 faux, 0 non affecté
+        self.niveau = [0]
+        self.raison = [None]
+        self.activite = [0.0]
+        self.phase = [1]
+        self.vu = [0]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.tas = []
+        self.var_inc = 1.0
+        self.decay = decay
+        self.restart_base = restart_base
+        self.max_learnts = 0
+        self.stats = {"decisions": 0, "propagations": 0, "conflicts": 0, "restarts": 0, "learnts": 0}
+        self._modele = None
+        self._nouvelles_vars(nb_vars)
+
+    # --- Gestion des variables et des clauses ---
+
+    def _nouvelles_vars(self, nb_vars):
+        for v in range(self.nb_vars + 1, nb_vars + 1):
+            self.watches.extend(([], []))
+            self.valeur.extend((0, 0))
+            self.niveau.append(0)
+            self.raison.append(None)
+            self.activite.append(0.0)
+            self.phase.append(1)    # phase initiale : négative (1 = bit de signe)
+            self.vu.append(0)
+            heapq.heappush(self.tas, (0.0, v))
+        self.nb_vars = max(self.nb_vars, nb_vars)
+
+    def add_clause(self, clause):
+        """
+        Ajoute une clause (liste de littéraux DIMACS) à la base.
+        Retourne False si la base devient insatisfiable.
+        """
+        if not self.ok:
+            return False
+        if self.trail_lim:
+            self._annuler_jusqua(0)
+        max_var = max((abs(x) for x in clause), default=0)
+        if max_var > self.nb_vars:
+            self._nouvelles_vars(max_var)
+
+        valeur = self.valeur
+        lits = []
+        for x in clause:
+            l = (x << 1) if x > 0 else ((-x << 1) | 1)
+            if valeur[l] == 1 or (l ^ 1) in lits:
+                return True         # clause déjà satisfaite ou tautologique
+            if valeur[l] == 0 and l not in lits:
+                lits.append(l)
+
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._affecter(lits[0], None)
+            self.ok = self._propager() is None
+        else:
+            self.clauses.append(lits)
+            self.watches[lits[0]].append(lits)
+            self.watches[lits[1]].append(lits)
+        return self.ok
+
+    # --- Affectation, propagation et retour arrière ---
+
+    def _affecter(self, l, raison):
+        v = l >> 1
+        self.valeur[l] = 1
+        self.valeur[l ^ 1] = -1
+        self.niveau[v] = len(self.trail_lim)
+        self.raison[v] = raison
+        self.trail.append(l)
+
+    def _propager(self):
+        """
+        Propagation unitaire par littéraux surveillés.
+        Retourne la clause en conflit, ou None.
+        """
+        valeur = self.valeur
+        watches = self.watches
+        trail = self.trail
+        niveau = self.niveau
+        raison = self.raison
+        dl = len(self.trail_lim)
+        debut = self.qhead
+
+        while self.qhead < len(trail):
+            faux = trail[self.qhead] ^ 1
+            self.qhead += 1
+            ws = watches[faux]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                c = ws[i]
+                i += 1
+                # le littéral devenu faux est placé en position 1
+                if c[0] == faux:
+                    c[0] = c[1]
+                    c[1] = faux
+                premier = c[0]
+                if valeur[premier] == 1:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    l = c[k]
+                    if valeur[l] != -1:
+                        c[1] = l
+                        c[k] = faux
+                        watches[l].append(c)
+                        break
+                else:
+                    ws[j] = c
+                    j += 1
+                    if valeur[premier] == -1:
+                        # conflit : on garde les surveillances restantes
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.stats["propagations"] += len(trail) - debut
+                        return c
+                    v = premier >> 1
+                    valeur[premier] = 1
+                    valeur[premier ^ 1] = -1
+                    niveau[v] = dl
+                    raison[v] = c
+                    trail.append(premier)
+            del ws[j:]
+
+        self.stats["propagations"] += len(trail) - debut
+        return None
+
+    def _annuler_jusqua(self, dl):
+        if len(self.trail_lim) <= dl:
+            return
+        valeur = self.valeur
+        raison = self.raison
+        phase = self.phase
+        activite = self.activite
+        tas = self.tas
+        limite = self.trail_lim[dl]
+        for l in reversed(self.trail[limite:]):
+            v = l >> 1
+            valeur[l] = 0
+            valeur[l ^ 1] = 0
+            raison[v] = None
+            phase[v] = l & 1
+            heapq.heappush(tas, (-activite[v], v))
+        del self.trail[limite:]
+        del self.trail_lim[dl:]
+        self.qhead = limite
+
+    # --- Heuristique VSIDS ---
+
+    def _augmenter(self, v):
+        a = self.activite[v] + self.var_inc
+        self.activite[v] = a
+        if a > 1e100:
+            for w in range(1, self.nb_vars + 1):
+                self.activite[w] *= 1e-100
+            self.var_inc *= 1e-100
+            self.tas = [(-self.activite[w], w) for w in range(1, self.nb_vars + 1)
+                        if self.valeur[w << 1] == 0]
+            heapq.heapify(self.tas)
+        elif self.valeur[v << 1] == 0:
+            heapq.heappush(self.tas, (-a, v))
+
+    def _choisir(self):
+        tas = self.tas
+        valeur = self.valeur
+        activite = self.activite
+        while tas:
+            a, v = heapq.heappop(tas)
+            if valeur[v << 1] == 0 and -a == activite[v]:
+                return (v << 1) | self.phase[v]
+        # les entrées périmées ont toutes été consommées : vérification complète
+        for v in range(1, self.nb_vars + 1):
+            if valeur[v << 1] == 0:
+                return (v << 1) | self.phase[v]
+        return None
+
+    # --- Analyse de conflit ---
+
+    def _analyser(self, confl):
+        """
+        Calcule la clause apprise (premier UIP) et le niveau de retour arrière.
+        """
+        vu = self.vu
+        niveau = self.niveau
+        raison = self.raison
+        trail = self.trail
+        dl = len(self.trail_lim)
+        appris = [0]
+        compteur = 0
+        p = None
+        idx = len(trail) - 1
+
+        while True:
+            for q in (confl if p is None else confl[1:]):
+                v = q >> 1
+                if not vu[v] and niveau[v] > 0:
+                    vu[v] = 1
+                    self._augmenter(v)
+                    if niveau[v] >= dl:
+                        compteur += 1
+                    else:
+                        appris.append(q)
+            while not vu[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = raison[p >> 1]
+            vu[p >> 1] = 0
+            compteur -= 1
+            if compteur == 0:
+                break
+        appris[0] = p ^ 1
+
+        # minimisation locale : un littéral impliqué par les autres est retiré
+        minimal = [appris[0]]
+        for q in appris[1:]:
+            r = raison[q >> 1]
+            if r is None or any(not vu[x >> 1] and niveau[x >> 1] > 0 for x in r[1:]):
+                minimal.append(q)
+        for q in appris[1:]:
+            vu[q >> 1] = 0
+
+        # le littéral de plus haut niveau (hors UIP) est surveillé en position 1
+        niveau_bt = 0
+        if len(minimal) > 1:
+            k = max(range(1, len(minimal)), key=lambda i: niveau[minimal[i] >> 1])
+            minimal[1], minimal[k] = minimal[k], minimal[1]
+            niveau_bt = niveau[minimal[1] >> 1]
+        return minimal, niveau_bt
+
+    def _reduire(self):
+        """
+        Supprime la moitié des clauses apprises les plus longues (hors raisons et binaires),
+        puis reconstruit les listes de surveillance.
+        """
+        raison = self.raison
+        verrouillees = {id(raison[l >> 1]) for l in self.trail if raison[l >> 1] is not None}
+        self.learnts.sort(key=len)
+        moitie = len(self.learnts) // 2
+        self.learnts = [c for i, c in enumerate(self.learnts)
+                        if i < moitie or len(c) == 2 or id(c) in verrouillees]
+        self.watches = [[] for _ in range(2 * self.nb_vars + 2)]
+        for c in self.clauses:
+            self.watches[c[0]].append(c)
+            self.watches[c[1]].append(c)
+        for c in self.learnts:
+            self.watches[c[0]].append(c)
+            self.watches[c[1]].append(c)
+
+    # --- Recherche ---
+
+    def _chercher(self, max_conflits, hypotheses):
+        """
+        Recherche CDCL jusqu'à max_conflits conflits.
+        Retourne True (modèle trouvé), False (insatisfiable) ou None (redémarrage).
+        """
+        conflits = 0
+        while True:
+            confl = self._propager()
+            if confl is not None:
+                conflits += 1
+                self.stats["conflicts"] += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                appris, niveau_bt = self._analyser(confl)
+                self._annuler_jusqua(niveau_bt)
+                if len(appris) == 1:
+                    self._affecter(appris[0], None)
+                else:
+                    self.learnts.append(appris)
+                    self.stats["learnts"] += 1
+                    self.watches[appris[0]].append(appris)
+                    self.watches[appris[1]].append(appris)
+                    self._affecter(appris[0], appris)
+                self.var_inc /= self.decay
+                continue
+
+            if conflits >= max_conflits:
+                self._annuler_jusqua(0)
+                return None
+            if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                self._reduire()
+                self.max_learnts = int(self.max_learnts * 1.1)
+
+            suivant = None
+            while len(self.trail_lim) < len(hypotheses):
+                p = hypotheses[len(self.trail_lim)]
+                if self.valeur[p] == 1:
+                    self.trail_lim.append(len(self.trail))   # niveau factice
+                elif self.valeur[p] == -1:
+                    return False    # les hypothèses contredisent la base
+                else:
+                    suivant = p
+                    break
+            if suivant is None:
+                suivant = self._choisir()
+                if suivant is None:
+                    return True
+                self.stats["decisions"] += 1
+            self.trail_lim.append(len(self.trail))
+            self._affecter(suivant, None)
+
+    def solve(self, assumptions=()):
+        """
+        Résout la base sous les hypothèses données (littéraux DIMACS).
+        Retourne True si satisfiable (modèle disponible via model()), False sinon.
+        Les clauses apprises sont conservées d'un appel à l'autre.
+        """
+        self._modele = None
+        if not self.ok:
+            return False
+        max_var = max((abs(x) for x in assumptions), default=0)
+        if max_var > self.nb_vars:
+            self._nouvelles_vars(max_var)
+        hypotheses = [(x << 1) if x > 0 else ((-x << 1) | 1) for x in assumptions]
+        if not self.max_learnts:
+            self.max_learnts = max(len(self.clauses) // 3, 2000)
+
+        resultat = None
+        i = 0
+        while resultat is None:
+            resultat = self._chercher(luby(2, i) * self.restart_base, hypotheses)
+            if resultat is None:
+                self.stats["restarts"] += 1
+            i += 1
+
+        if resultat:
+            valeur = self.valeur
+            self._modele = [v if valeur[v << 1] == 1 else -v for v in range(1, self.nb_vars + 1)]
+        self._annuler_jusqua(0)
+        return resultat
+
+    def model(self):
+        """
+        Retourne le dernier modèle trouvé (liste de littéraux DIMACS), ou None.
+        """
+        return self._modele
@@ -0,0 +1,113 @@
+import mmap
+import os
+import struct
+from array import array
+
+# En-tête du cache binaire : magic, mtime (ns), taille, nb_vars, nb_clauses, nb_lits
+_ENTETE = struct.Struct("<8sqqiii")
+_MAGIC = b"CNFCACH1"
+CACHE_DIR = ".cnf_cache"
+
+
+def parse_dimacs(flux):
+    """
+    Lit un flux binaire DIMACS CNF ligne par ligne, sans construire de liste de listes.
+    Les clauses peuvent s'étendre sur plusieurs lignes ou partager une ligne ;
+    seul le 0 termine une clause. Les commentaires "c" et le marqueur de fin
+    SATLIB "%" sont gérés.
+    Retourne : littéraux à plat (array('i')), débuts des clauses (array('i'),
+    nb_clauses + 1 entrées), nombre de variables.
+    """
+    lits = array("i")
+    offsets = array("i", [0])
+    nb_vars = 0
+
+    for ligne in flux:
+        debut = ligne.lstrip()[:1]
+        if debut == b"c" or debut == b"":
+            continue  # ignorer les commentaires
+        if debut == b"%":
+            break  # fin de fichier au format SATLIB
+        if debut == b"p":
+            # ex: p cnf 200 860
+            _, _, nb_vars_str, _ = ligne.split()
+            nb_vars = int(nb_vars_str)
+            continue
+
+        valeurs = array("i", map(int, ligne.split()))
+        i = 0
+        for _ in range(valeurs.count(0)):
+            k = valeurs.index(0, i)
+            lits.extend(valeurs[i:k])
+            offsets.append(len(lits))
+            i = k + 1
+        lits.extend(valeurs[i:])  # clause qui continue à la ligne suivante
+
+    if len(lits) > offsets[-1]:
+        offsets.append(len(lits))  # dernière clause sans 0 final
+    if lits:
+        nb_vars = max(nb_vars, max(lits), -min(lits))
+    return lits, offsets, nb_vars
+
+
+def _chemin_cache(fichier):
+    dossier, nom = os.path.split(os.path.abspath(fichier))
+    return os.path.join(dossier, CACHE_DIR, nom + ".bin")
+
+
+def _lire_cache(chemin, st):
+    try:
+        with open(chemin, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, mtime, taille, nb_vars, nb_clauses, nb_lits = _ENTETE.unpack_from(mm)
+            if magic != _MAGIC or mtime != st.st_mtime_ns or taille != st.st_size:
+                return None
+            debut = _ENTETE.size
+            fin = debut + 4 * (nb_clauses + 1)
+            offsets = array("i")
+            offsets.frombytes(mm[debut:fin])
+            lits = array("i")
+            lits.frombytes(mm[fin:fin + 4 * nb_lits])
+            return lits, offsets, nb_vars
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def _ecrire_cache(chemin, st, lits, offsets, nb_vars):
+    try:
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        temp = chemin + f".{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(_ENTETE.pack(_MAGIC, st.st_mtime_ns, st.st_size, nb_vars, len(offsets) - 1, len(lits)))
+            offsets.tofile(f)
+            lits.tofile(f)
+        os.replace(temp, chemin)
+    except OSError:
+        pass  # le cache est facultatif
+
+
+def read_dimacs(fichier, cache=True):
+    """
+    Lit un fichier DIMACS CNF au format plat (voir parse_dimacs).
+    Avec cache=True, le résultat est conservé dans un fichier binaire projeté
+    en mémoire, invalidé dès que la date de modification ou la taille du CNF change.
+    """
+    st = os.stat(fichier)
+    chemin = _chemin_cache(fichier)
+    if cache:
+        resultat = _lire_cache(chemin, st)
+        if resultat is not None:
+            return resultat
+
+    with open(fichier, "rb") as f:
+        lits, offsets, nb_vars = parse_dimacs(f)
+    if cache:
+        _ecrire_cache(chemin, st, lits, offsets, nb_vars)
+    return lits, offsets, nb_vars
+
+
+def iter_clauses(lits, offsets):
+    """
+    Parcourt les clauses d'une base au format plat.
+    """
+    for i in range(len(offsets) - 1):
+        yield lits[offsets[i]:offsets[i + 1]]
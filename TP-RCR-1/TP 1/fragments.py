@@ -0,0 +1,314 @@
+HORN = "horn"
+TWO_SAT = "2-sat"
+GENERAL = "general"
+
+
+def is_horn(clause):
+    """
+    Clause de Horn : au plus un littéral positif.
+    """
+    return sum(1 for x in clause if x > 0) <= 1
+
+
+def classify(clauses):
+    """
+    Fragment d'une base CNF : "horn" (toutes les clauses de Horn), "2-sat" (toutes
+    les clauses ont au plus deux littéraux) ou "general". Une base à la fois de Horn
+    et binaire est classée "horn" : un seul chaînage avant donne tous ses atomes impliqués.
+    """
+    horn = binaire = True
+    for clause in clauses:
+        horn = horn and is_horn(clause)
+        binaire = binaire and len(clause) <= 2
+        if not horn and not binaire:
+            return GENERAL
+    return HORN if horn else TWO_SAT
+
+
+def accepts(fragment, clause):
+    """
+    True si la clause peut être ajoutée à une base du fragment sans en sortir.
+    """
+    if fragment == HORN:
+        return is_horn(clause)
+    if fragment == TWO_SAT:
+        return len(clause) <= 2
+    return True
+
+
+class HornSolver:
+    """
+    Base de Horn résolue en temps linéaire par propagation unitaire (Dowling–Gallier) :
+    chaque clause garde le nombre de ses atomes négatifs pas encore établis, et déclenche
+    sa tête quand ce compteur tombe à zéro. Le chaînage avant calcule une fois pour toutes
+    le plus petit modèle : ses atomes sont exactement les atomes impliqués par la base.
+
+    BC ⊨ ¬p se vérifie en ajoutant p au plus petit modèle et en propageant ; les
+    compteurs modifiés sont restaurés ensuite, le coût ne dépend que de ce qui est déclenché.
+    """
+
+    def __init__(self, clauses=(), nb_vars=0):
+        self.nb_vars = 0
+        self.ok = True              # False si la base est incohérente
+        self.tete = []              # tete[c] : atome positif de la clause c, 0 si aucun
+        self.compte = []            # compte[c] : atomes négatifs de c pas encore vrais
+        self.occurrences = [[]]     # occurrences[p] : clauses contenant ¬p
+        self.vrai = [False]         # vrai[p] : p appartient au plus petit modèle
+        self.stats = {"propagations": 0, "conflicts": 0}
+        self._nouvelles_vars(nb_vars)
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def _nouvelles_vars(self, nb_vars):
+        for _ in range(self.nb_vars, nb_vars):
+            self.occurrences.append([])
+            self.vrai.append(False)
+        self.nb_vars = max(self.nb_vars, nb_vars)
+
+    def add_clause(self, clause):
+        """
+        Ajoute une clause de Horn et propage ; retourne False si la base devient incohérente.
+        """
+        if not is_horn(clause):
+            raise ValueError(f"clause hors du fragment de Horn : {list(clause)}")
+        self._nouvelles_vars(max((abs(x) for x in clause), default=0))
+        negatifs = {-x for x in clause if x < 0}
+        tete = next((x for x in clause if x > 0), 0)
+        if tete in negatifs:
+            return self.ok          # tautologie
+        if not self.ok:
+            return False
+
+        c = len(self.tete)
+        self.tete.append(tete)
+        self.compte.append(sum(1 for p in negatifs if not self.vrai[p]))
+        for p in negatifs:
+            self.occurrences[p].append(c)
+        if self.compte[c] == 0:
+            if tete == 0:
+                self.ok = False
+            elif not self.vrai[tete]:
+                self.vrai[tete] = True
+                self.ok = self._propager([tete], None)
+        return self.ok
+
+    def _propager(self, file, trace):
+        """
+        Chaînage avant depuis les atomes de file (déjà marqués vrais).
+        Si trace est une liste, les atomes et les clauses touchés y sont notés pour
+        pouvoir annuler. Retourne False en cas de conflit (clause négative falsifiée).
+        """
+        compte, tete, vrai, occurrences = self.compte, self.tete, self.vrai, self.occurrences
+        while file:
+            p = file.pop()
+            self.stats["propagations"] += 1
+            for c in occurrences[p]:
+                compte[c] -= 1
+                if trace is not None:
+                    trace.append(c)
+                if compte[c] == 0:
+                    h = tete[c]
+                    if h == 0:
+                        self.stats["conflicts"] += 1
+                        return False
+                    if not vrai[h]:
+                        vrai[h] = True
+                        file.append(h)
+                        if trace is not None:
+                            trace.append(-h)
+        return True
+
+    def is_consistent(self):
+        return self.ok
+
+    def entailed_atoms(self):
+        """
+        Atomes impliqués par la base (le plus petit modèle), calculés par le chaînage avant.
+        """
+        return [p for p in range(1, self.nb_vars + 1) if self.vrai[p]]
+
+    def model(self):
+        """
+        Plus petit modèle, en littéraux DIMACS (None si la base est incohérente).
+        """
+        if not self.ok:
+            return None
+        return [p if self.vrai[p] else -p for p in range(1, self.nb_vars + 1)]
+
+    def entails(self, literal):
+        """
+        Retourne True si BC ⊨ literal.
+        """
+        if not self.ok:
+            return True
+        p = abs(literal)
+        if p > self.nb_vars:
+            return False
+        if literal > 0:
+            return self.vrai[p]
+        if self.vrai[p]:
+            return False            # le plus petit modèle satisfait p
+        # BC ∧ p incohérente ?
+        self.vrai[p] = True
+        trace = [-p]
+        coherente = self._propager([p], trace)
+        for x in trace:
+            if x < 0:
+                self.vrai[-x] = False
+            else:
+                self.compte[x] += 1
+        return not coherente
+
+    def backbone(self, candidates=None):
+        """
+        Littéraux impliqués : les atomes du plus petit modèle, puis les ¬p dont
+        l'ajout de p rend la base incohérente.
+        """
+        if candidates is None:
+            candidates = [l for p in range(1, self.nb_vars + 1) for l in (p, -p)]
+        return sorted((l for l in candidates if self.entails(l)), key=abs)
+
+
+class TwoSatSolver:
+    """
+    Base 2-SAT résolue sur son graphe d'implications : la clause (a ∨ b) donne les
+    arcs ¬a → b et ¬b → a. La base est cohérente si aucune variable n'est dans la même
+    composante fortement connexe que sa négation (Tarjan, temps linéaire), et
+    BC ⊨ l si et seulement si ¬l → ... → l dans le graphe.
+
+    Les littéraux sont codés comme dans cdcl.py : 2*|x| (+1 si x < 0), la négation est l ^ 1.
+    """
+
+    def __init__(self, clauses=(), nb_vars=0):
+        self.nb_vars = 0
+        self.ok = True
+        self.succ = [[], []]        # succ[l] : littéraux impliqués directement par l
+        self.composante = None      # calculées à la demande, oubliées à chaque ajout
+        self.stats = {"propagations": 0, "conflicts": 0}
+        self._nouvelles_vars(nb_vars)
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def _nouvelles_vars(self, nb_vars):
+        for _ in range(self.nb_vars, nb_vars):
+            self.succ.extend(([], []))
+        self.nb_vars = max(self.nb_vars, nb_vars)
+
+    def add_clause(self, clause):
+        """
+        Ajoute une clause d'au plus deux littéraux. La cohérence n'est recalculée
+        qu'à la requête suivante ; retourne False si la base est déjà incohérente.
+        """
+        if len(clause) > 2:
+            raise ValueError(f"clause hors du fragment 2-SAT : {list(clause)}")
+        self._nouvelles_vars(max((abs(x) for x in clause), default=0))
+        lits = [(x << 1) if x > 0 else ((-x << 1) | 1) for x in clause]
+        if not lits:
+            self.ok = False
+            return False
+        a, b = lits[0], lits[-1]
+        if a == b ^ 1:
+            return self.ok          # tautologie
+        self.succ[a ^ 1].append(b)
+        if a != b:
+            self.succ[b ^ 1].append(a)
+        self.composante = None
+        return self.ok
+
+    def _composantes(self):
+        """
+        Composantes fortement connexes (Tarjan itératif), numérotées puits d'abord.
+        """
+        succ = self.succ
+        n = len(succ)
+        numero = [-1] * n
+        bas = [0] * n
+        composante = [-1] * n
+        pile = []
+        compteur = nb_composantes = 0
+        for racine in range(2, n):
+            if numero[racine] != -1:
+                continue
+            appels = [(racine, 0)]
+            numero[racine] = bas[racine] = compteur
+            compteur += 1
+            pile.append(racine)
+            while appels:
+                u, i = appels[-1]
+                if i < len(succ[u]):
+                    appels[-1] = (u, i + 1)
+                    v = succ[u][i]
+                    if numero[v] == -1:
+                        numero[v] = bas[v] = compteur
+                        compteur += 1
+                        pile.append(v)
+                        appels.append((v, 0))
+                    elif composante[v] == -1:
+                        bas[u] = min(bas[u], numero[v])
+                    continue
+                appels.pop()
+                if appels:
+                    parent = appels[-1][0]
+                    bas[parent] = min(bas[parent], bas[u])
+                if bas[u] == numero[u]:
+                    while True:
+                        v = pile.pop()
+                        composante[v] = nb_composantes
+                        if v == u:
+                            break
+                    nb_composantes += 1
+        return composante
+
+    def is_consistent(self):
+        if self.ok and self.composante is None:
+            self.composante = self._composantes()
+            self.ok = all(self.composante[2 * v] != self.composante[2 * v + 1]
+                          for v in range(1, self.nb_vars + 1))
+        return self.ok
+
+    def model(self):
+        """
+        Un modèle (None si la base est incohérente) : x est vrai si sa composante
+        vient avant celle de ¬x dans l'ordre de Tarjan, c.-à-d. plus près des puits.
+        """
+        if not self.is_consistent():
+            return None
+        c = self.composante
+        return [v if c[2 * v] < c[2 * v + 1] else -v for v in range(1, self.nb_vars + 1)]
+
+    def entails(self, literal):
+        """
+        Retourne True si BC ⊨ literal : un chemin ¬literal → literal existe.
+        """
+        if not self.is_consistent():
+            return True
+        v = abs(literal)
+        if v > self.nb_vars:
+            return False
+        l = (v << 1) | (literal < 0)
+        c = self.composante
+        if c[l] > c[l ^ 1]:
+            return False            # le modèle canonique falsifie literal
+        vus = {l ^ 1}
+        pile = [l ^ 1]
+        while pile:
+            u = pile.pop()
+            self.stats["propagations"] += 1
+            for w in self.succ[u]:
+                if w == l:
+                    return True
+                if w not in vus:
+                    vus.add(w)
+                    pile.append(w)
+        return False
+
+    def backbone(self, candidates=None):
+        """
+        Littéraux impliqués ; seuls ceux vrais dans le modèle canonique sont examinés.
+        """
+        if candidates is None:
+            candidates = [l for v in range(1, self.nb_vars + 1) for l in (v, -v)]
+        return sorted((l for l in candidates if self.entails(l)), key=abs)
+
+
+SOLVERS = {HORN: HornSolver, TWO_SAT: TwoSatSolver}
@@ -0,0 +1,186 @@
+from cdcl import CDCLSolver
+from fragments import GENERAL, SOLVERS, accepts, classify
+from preprocess import Preprocessor
+
+
+class KnowledgeBase:
+    """
+    Base de connaissances chargée une seule fois dans un solveur CDCL persistant.
+    Chaque requête BC ⊨ φ est résolue sous l'hypothèse ¬φ, sans recopier les clauses :
+    les clauses apprises sont conservées entre les requêtes et les réponses sont
+    mémorisées jusqu'à la prochaine modification de la base.
+
+    Avec preprocess=True, la base est d'abord simplifiée (voir preprocess.py) ;
+    les requêtes portant sur une variable éliminée sont alors posées à un second
+    solveur, construit à la demande sur la base d'origine.
+
+    Une base entièrement de Horn ou 2-SAT (voir fragments.py) est confiée à un
+    moteur linéaire exact (fragment, moteur) ; le solveur CDCL n'est alors construit
+    que si une clause ajoutée fait sortir la base de son fragment.
+    """
+
+    def __init__(self, clauses=(), nb_vars=0, preprocess=False):
+        self.nb_vars = nb_vars
+        self.version = 0
+        self._cache = {}
+        self.preprocessor = None
+        self._originales = [[int(x) for x in clause] for clause in clauses]
+        self._solver_original = None
+        self.solver = None
+        self.moteur = None
+        self._preprocess = preprocess
+        for clause in self._originales:
+            self.nb_vars = max(self.nb_vars, max((abs(x) for x in clause), default=0))
+
+        self.fragment = classify(self._originales)
+        if self.fragment != GENERAL:
+            # rien à gagner à prétraiter : le moteur est déjà linéaire
+            self.moteur = SOLVERS[self.fragment](self._originales, self.nb_vars)
+        elif preprocess:
+            self._pretraiter()
+        else:
+            self._general()
+
+    def _pretraiter(self):
+        self.preprocessor = Preprocessor(self._originales, self.nb_vars).run()
+        self.solver = CDCLSolver(self.nb_vars)
+        for clause in self.preprocessor.clauses:
+            self.solver.add_clause(clause)
+        self._solver_original = None
+
+    def _general(self):
+        self.solver = CDCLSolver(self.nb_vars)
+        for clause in self._originales:
+            self.solver.add_clause(clause)
+        self._originales = None     # le solveur suffit désormais
+
+    def _original(self):
+        if self._solver_original is None:
+            self._solver_original = CDCLSolver(self.nb_vars)
+            for clause in self._originales:
+                self._solver_original.add_clause(clause)
+        return self._solver_original
+
+    def _resoudre(self, units=()):
+        """
+        Résout BC ∧ units ; retourne (satisfiable, modèle de la base d'origine ou None).
+        """
+        pre = self.preprocessor
+        if pre is None:
+            sat = self.solver.solve(units)
+            return sat, self.solver.model()
+        if pre.unsat:
+            return False, None
+        if any(abs(x) in pre.eliminated for x in units):
+            solver = self._original()
+            sat = solver.solve(units)
+            return sat, solver.model()
+        if any(pre.fixed.get(abs(x)) == -x for x in units):
+            return False, None
+        sat = self.solver.solve([x for x in units if abs(x) not in pre.fixed])
+        return sat, pre.extend_model(self.solver.model()) if sat else None
+
+    def add_clause(self, clause):
+        """
+        Ajoute une clause à la base ; invalide les réponses mémorisées.
+        """
+        self.nb_vars = max(self.nb_vars, max((abs(x) for x in clause), default=0))
+        if self.moteur is not None:
+            clause = [int(x) for x in clause]
+            self._originales.append(clause)
+            if accepts(self.fragment, clause):
+                self.moteur.add_clause(clause)
+            else:
+                # la base devient mixte : retour au solveur général
+                self.fragment, self.moteur = GENERAL, None
+                if self._preprocess:
+                    self._pretraiter()
+                else:
+                    self._general()
+        elif self.preprocessor is not None:
+            # la base réduite a oublié des variables : on la reconstruit
+            self._originales.append(list(clause))
+            self._pretraiter()
+        else:
+            self.solver.add_clause(clause)
+        self.version += 1
+        self._cache.clear()
+
+    def is_consistent(self):
+        """
+        Vérifie que la base elle-même est satisfiable.
+        """
+        if self.moteur is not None:
+            return self.moteur.is_consistent()
+        return self._resoudre()[0]
+
+    def entails(self, literal):
+        """
+        Retourne True si BC ⊨ literal, c.-à-d. si BC ∧ ¬literal est insatisfiable.
+        """
+        if literal not in self._cache and self.moteur is not None:
+            self._cache[literal] = self.moteur.entails(literal)
+        elif literal not in self._cache:
+            self._cache[literal] = not self._resoudre([-literal])[0]
+        return self._cache[literal]
+
+    def backbone(self, candidates=None):
+        """
+        Calcule l'ensemble des littéraux impliqués par la base (le "backbone").
+        Seuls les littéraux vrais dans un modèle peuvent être impliqués : chaque
+        modèle trouvé élimine d'un coup tous les candidats qu'il falsifie.
+        Si candidates est donné, seuls ces littéraux sont examinés.
+        Pour une base de Horn ou 2-SAT, le moteur du fragment répond directement.
+        """
+        if self.moteur is not None:
+            impliques = self.moteur.backbone(candidates)
+            examines = candidates if candidates is not None else \
+                [l for v in range(1, self.nb_vars + 1) for l in (v, -v)]
+            self._cache.update(dict.fromkeys(examines, False))
+            self._cache.update(dict.fromkeys(impliques, True))
+            return impliques
+
+        sat, modele = self._resoudre()
+        if not sat:
+            # base incohérente : elle implique tout
+            tous = [l for v in range(1, self.nb_vars + 1) for l in (v, -v)]
+            self._cache.update(dict.fromkeys(tous, True))
+            return tous if candidates is None else list(candidates)
+
+        restants = set(modele)
+        if candidates is not None:
+            for l in candidates:
+                if l not in restants:
+                    self._cache[l] = False
+            restants &= set(candidates)
+
+        pre = self.preprocessor
+        impliques = []
+        while restants:
+            l = restants.pop()
+            if self._cache.get(l) is True:
+                sat = False
+            else:
+                sat, modele = self._resoudre([-l])
+            if not sat:
+                impliques.append(l)
+                self._cache[l] = True
+                # l est impliqué : l'ajouter ne change pas les modèles et accélère la suite
+                if pre is None:
+                    self.solver.add_clause([l])
+                elif abs(l) not in pre.eliminated and abs(l) not in pre.fixed:
+                    self.solver.add_clause([l])
+            else:
+                self._cache[l] = False
+                restants.intersection_update(modele)
+        return sorted(impliques, key=abs)
+
+    def stats(self):
+        """
+        Statistiques cumulées du solveur (décisions, propagations, conflits, ...).
+        """
+        moteur = self.moteur if self.moteur is not None else self.solver
+        stats = dict(moteur.stats, fragment=self.fragment, version=self.version, cached=len(self._cache))
+        if self.preprocessor is not None:
+            stats["preprocess"] = self.preprocessor.stats
+        return stats
@@ -0,0 +1,433 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+
+from dimacs import CACHE_DIR, read_dimacs, iter_clauses
+
+# En-tête du fichier compilé : magic, mtime (ns) et taille du CNF, nb_vars, nb_noeuds, racine
+_ENTETE = struct.Struct("<8sqqiii")
+_MAGIC = b"OBDD0001"
+_MAGIC_TROP_GRAND = b"OBDDTROP"     # même en-tête, nb_noeuds = limite dépassée
+MAX_NODES = 2_000_000
+
+
+def force_order(clauses, nb_vars, iterations=32):
+    """
+    Ordre des variables par l'heuristique FORCE : chaque variable est placée au
+    barycentre des clauses où elle apparaît, chaque clause au barycentre de ses
+    variables, jusqu'à ce que l'étendue totale des clauses ne diminue plus.
+    Des variables qui apparaissent ensemble se retrouvent proches, ce qui garde l'OBDD petit.
+    Retourne la liste des variables, du premier niveau au dernier.
+    """
+    clauses = [sorted({abs(x) for x in clause}) for clause in clauses if clause]
+    ordre = list(range(1, nb_vars + 1))
+    position = [0] * (nb_vars + 1)
+    meilleur, meilleure_etendue = ordre, None
+    for _ in range(iterations):
+        for i, v in enumerate(ordre):
+            position[v] = i
+        etendue = sum(max(position[v] for v in c) - min(position[v] for v in c) for c in clauses)
+        if meilleure_etendue is not None and etendue >= meilleure_etendue:
+            break
+        meilleur, meilleure_etendue = ordre, etendue
+
+        somme = [0.0] * (nb_vars + 1)
+        nombre = [0] * (nb_vars + 1)
+        for c in clauses:
+            centre = sum(position[v] for v in c) / len(c)
+            for v in c:
+                somme[v] += centre
+                nombre[v] += 1
+        ordre = sorted(ordre, key=lambda v: (somme[v] / nombre[v] if nombre[v] else position[v], position[v]))
+    return meilleur
+
+
+class CompiledBase:
+    """
+    Base CNF compilée hors ligne en OBDD réduit (diagramme de décision binaire ordonné).
+    Les noeuds 0 et 1 sont les feuilles faux/vrai ; le noeud u teste la variable
+    placée au niveau var[u] et mène à lo[u] si elle est fausse, à hi[u] si elle est vraie.
+    Après compilation les noeuds sont renumérotés fils avant pères.
+
+    Toutes les requêtes sont des parcours du diagramme, linéaires en sa taille,
+    sans aucun appel à un solveur :
+    - entails(l) : les littéraux impliqués sont calculés en une passe puis mémorisés,
+    - entails_clause(C) : existe-t-il un chemin vers 1 qui falsifie C ?
+    - count_models(hypothèses) : nombre de modèles, avec ou sans hypothèses.
+    """
+
+    def __init__(self, nb_vars, ordre, var, lo, hi, racine):
+        self.nb_vars = nb_vars
+        self.ordre = list(ordre)            # niveau -> variable
+        self.niveau = [0] * (nb_vars + 1)   # variable -> niveau
+        for i, v in enumerate(self.ordre):
+            self.niveau[v] = i
+        self.var = var
+        self.lo = lo
+        self.hi = hi
+        self.racine = racine
+        self._impliques = None
+
+    # --- Compilation ---
+
+    @classmethod
+    def compile(cls, clauses, nb_vars, ordre=None, max_nodes=MAX_NODES):
+        """
+        Compile des clauses DIMACS ; ordre est la liste des variables par niveau
+        (FORCE par défaut). RuntimeError si le diagramme dépasse max_nodes noeuds.
+        """
+        clauses = [[int(x) for x in clause] for clause in clauses]
+        nb_vars = max([nb_vars] + [abs(x) for clause in clauses for x in clause])
+        if ordre is None:
+            ordre = force_order(clauses, nb_vars)
+        compilateur = _Compilateur(nb_vars, ordre, max_nodes)
+
+        # les clauses du bas de l'ordre d'abord : le diagramme grandit par le bas
+        niveau = compilateur.niveau
+        clauses.sort(key=lambda c: min((niveau[abs(x)] for x in c), default=-1), reverse=True)
+        racine = 1
+        for clause in clauses:
+            racine = compilateur.et(racine, compilateur.clause(clause))
+            if racine == 0:
+                break
+        return cls(nb_vars, ordre, *compilateur.compacter(racine))
+
+    # --- Fichier compilé ---
+
+    def save(self, chemin, st):
+        """
+        Écrit le diagramme ; st (os.stat du CNF) sert à invalider le fichier si le CNF change.
+        """
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        temp = chemin + f".{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(_ENTETE.pack(_MAGIC, st.st_mtime_ns, st.st_size, self.nb_vars, len(self.var), self.racine))
+            for tableau in (self.ordre, self.var, self.lo, self.hi):
+                array("i", tableau).tofile(f)
+        os.replace(temp, chemin)
+
+    @classmethod
+    def load(cls, chemin, st=None):
+        """
+        Relit un diagramme écrit par save ; None s'il manque ou ne correspond plus au CNF (st).
+        """
+        try:
+            with open(chemin, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, mtime, taille, nb_vars, nb_noeuds, racine = _ENTETE.unpack_from(mm)
+                if magic != _MAGIC or (st is not None and (mtime, taille) != (st.st_mtime_ns, st.st_size)):
+                    return None
+                tableaux = []
+                debut = _ENTETE.size
+                for longueur in (nb_vars, nb_noeuds, nb_noeuds, nb_noeuds):
+                    t = array("i")
+                    t.frombytes(mm[debut:debut + 4 * longueur])
+                    tableaux.append(t)
+                    debut += 4 * longueur
+                return cls(nb_vars, *tableaux, racine)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    # --- Requêtes ---
+
+    def size(self):
+        return len(self.var)
+
+    def is_consistent(self):
+        return self.racine != 0
+
+    def entailed_literals(self):
+        """
+        Tous les littéraux impliqués, en une passe sur les noeuds : v est impliqué si
+        aucun chemin vers 1 ne le rend faux, c.-à-d. si aucun noeud de v ne mène par
+        lo ailleurs qu'en 0 et si aucun arc vers 1 ne saute son niveau.
+        """
+        if self._impliques is not None:
+            return self._impliques
+        n = self.nb_vars
+        if self.racine == 0:
+            self._impliques = {l for v in range(1, n + 1) for l in (v, -v)}
+            return self._impliques
+        var, lo, hi = self.var, self.lo, self.hi
+        possible = [[False, False] for _ in range(n)]   # [niveau][valeur] apparaît sur un chemin vers 1
+        saute = [0] * (n + 1)                           # différences : niveaux sautés par un arc
+
+        def sauter(debut, fin):
+            saute[debut] += 1
+            saute[fin] -= 1
+
+        sauter(0, var[self.racine])
+        for u in range(2, len(var)):
+            for valeur, fils in ((0, lo[u]), (1, hi[u])):
+                if fils != 0:
+                    possible[var[u]][valeur] = True
+                    sauter(var[u] + 1, var[fils])
+        impliques = set()
+        libres = 0
+        for niveau in range(n):
+            libres += saute[niveau]
+            if libres == 0:
+                faux, vrai = possible[niveau]
+                v = self.ordre[niveau]
+                if not faux:
+                    impliques.add(v)
+                if not vrai:
+                    impliques.add(-v)
+        self._impliques = impliques
+        return impliques
+
+    def entails(self, literal):
+        """
+        Retourne True si BC ⊨ literal.
+        """
+        return literal in self.entailed_literals()
+
+    def _forcer(self, litteraux):
+        # niveau -> valeur imposée (0/1) ; None si les littéraux se contredisent
+        force = {}
+        for x in litteraux:
+            if abs(x) > self.nb_vars:
+                continue
+            niveau, valeur = self.niveau[abs(x)], int(x > 0)
+            if force.setdefault(niveau, valeur) != valeur:
+                return None
+        return force
+
+    def entails_clause(self, clause):
+        """
+        Retourne True si BC ⊨ clause : aucun chemin vers 1 ne falsifie tous ses littéraux.
+        """
+        force = self._forcer([-x for x in clause])
+        if force is None:
+            return True         # clause tautologique
+        vus = {self.racine}
+        pile = [self.racine]
+        while pile:
+            u = pile.pop()
+            if u == 1:
+                return False
+            if u == 0:
+                continue
+            valeur = force.get(self.var[u])
+            for fils in (self.lo[u] if valeur != 1 else None, self.hi[u] if valeur != 0 else None):
+                if fils is not None and fils not in vus:
+                    vus.add(fils)
+                    pile.append(fils)
+        return True
+
+    def count_models(self, assumptions=()):
+        """
+        Nombre de modèles de BC (sur ses nb_vars variables) qui satisfont les hypothèses.
+        """
+        force = self._forcer(assumptions)
+        if force is None:
+            return 0
+        n = self.nb_vars
+        libres = [0] * (n + 1)      # libres[k] : niveaux non imposés avant le niveau k
+        for niveau in range(n):
+            libres[niveau + 1] = libres[niveau] + (niveau not in force)
+        var, lo, hi = self.var, self.lo, self.hi
+        compte = [0, 1] + [0] * (len(var) - 2)
+        for u in range(2, len(var)):
+            valeur = force.get(var[u])
+            total = 0
+            for b, fils in ((0, lo[u]), (1, hi[u])):
+                if valeur is None or valeur == b:
+                    total += compte[fils] << (libres[var[fils]] - libres[var[u] + 1])
+            compte[u] = total
+        return compte[self.racine] << libres[var[self.racine]]
+
+
+class _Compilateur:
+    """
+    Table unique et opération ET d'un OBDD en construction (itérative, sans récursion).
+    """
+
+    def __init__(self, nb_vars, ordre, max_nodes):
+        self.niveau = [0] * (nb_vars + 1)
+        for i, v in enumerate(ordre):
+            self.niveau[v] = i
+        self.max_nodes = max_nodes
+        self.var = [nb_vars, nb_vars]   # les feuilles sont sous le dernier niveau
+        self.lo = [0, 1]
+        self.hi = [0, 1]
+        self.unique = {}
+
+    def noeud(self, niveau, lo, hi):
+        if lo == hi:
+            return lo
+        cle = (niveau, lo, hi)
+        u = self.unique.get(cle)
+        if u is None:
+            u = len(self.var)
+            if u >= self.max_nodes:
+                raise RuntimeError(f"OBDD trop grand (plus de {self.max_nodes} noeuds)")
+            self.var.append(niveau)
+            self.lo.append(lo)
+            self.hi.append(hi)
+            self.unique[cle] = u
+        return u
+
+    def clause(self, clause):
+        """
+        OBDD d'une clause : une chaîne, construite depuis son littéral le plus bas.
+        """
+        litteraux = {}
+        for x in clause:
+            if litteraux.setdefault(self.niveau[abs(x)], x) != x:
+                return 1        # tautologie
+        u = 0
+        for niveau in sorted(litteraux, reverse=True):
+            u = self.noeud(niveau, u, 1) if litteraux[niveau] > 0 else self.noeud(niveau, 1, u)
+        return u
+
+    def et(self, a, b):
+        var, lo, hi = self.var, self.lo, self.hi
+        memo = {}
+        resultats = []
+        pile = [(a, b, False)]
+        while pile:
+            u, v, developpe = pile.pop()
+            if developpe:
+                r_hi = resultats.pop()
+                r_lo = resultats.pop()
+                r = memo[u, v] = self.noeud(min(var[u], var[v]), r_lo, r_hi)
+                resultats.append(r)
+                continue
+            if u == 0 or v == 0:
+                resultats.append(0)
+            elif u == 1 or u == v:
+                resultats.append(v)
+            elif v == 1:
+                resultats.append(u)
+            else:
+                if u > v:
+                    u, v = v, u
+                if (u, v) in memo:
+                    resultats.append(memo[u, v])
+                    continue
+                m = min(var[u], var[v])
+                u0, u1 = (lo[u], hi[u]) if var[u] == m else (u, u)
+                v0, v1 = (lo[v], hi[v]) if var[v] == m else (v, v)
+                pile.append((u, v, True))
+                pile.append((u1, v1, False))
+                pile.append((u0, v0, False))
+        return resultats[0]
+
+    def compacter(self, racine):
+        """
+        Garde les noeuds accessibles depuis la racine, numérotés fils avant pères.
+        Retourne (var, lo, hi, racine) sous forme d'array('i').
+        """
+        nouveau = {0: 0, 1: 1}
+        var, lo, hi = array("i", self.var[:2]), array("i", [0, 1]), array("i", [0, 1])
+        pile = [racine]
+        while pile:
+            u = pile[-1]
+            if u in nouveau:
+                pile.pop()
+                continue
+            fils = [f for f in (self.lo[u], self.hi[u]) if f not in nouveau]
+            if fils:
+                pile.extend(fils)
+                continue
+            pile.pop()
+            nouveau[u] = len(var)
+            var.append(self.var[u])
+            lo.append(nouveau[self.lo[u]])
+            hi.append(nouveau[self.hi[u]])
+        return var, lo, hi, nouveau[racine]
+
+
+def _chemin_compile(fichier):
+    dossier, nom = os.path.split(os.path.abspath(fichier))
+    return os.path.join(dossier, CACHE_DIR, nom + ".obdd")
+
+
+def _limite_depassee(chemin, st):
+    """
+    Limite de noeuds dépassée par une compilation précédente du CNF (st), ou None
+    s'il n'y a pas de marqueur "trop grand" à jour.
+    """
+    try:
+        with open(chemin, "rb") as f:
+            magic, mtime, taille, _, limite, _ = _ENTETE.unpack(f.read(_ENTETE.size))
+    except (OSError, struct.error):
+        return None
+    if magic != _MAGIC_TROP_GRAND or (mtime, taille) != (st.st_mtime_ns, st.st_size):
+        return None
+    return limite
+
+
+def _marquer_trop_grand(chemin, st, limite):
+    try:
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        temp = chemin + f".{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(_ENTETE.pack(_MAGIC_TROP_GRAND, st.st_mtime_ns, st.st_size, 0, limite, -1))
+        os.replace(temp, chemin)
+    except OSError:
+        pass  # le marqueur est facultatif, comme le fichier compilé
+
+
+def compile_file(fichier, cache=True, **options):
+    """
+    Base compilée du fichier CNF : relue sur disque si elle est à jour, sinon
+    compilée (voir CompiledBase.compile) puis enregistrée.
+    Si le diagramme dépasse max_nodes, un marqueur "trop grand" est enregistré à la
+    place : tant que le CNF ne change pas (mtime, taille), RuntimeError est levée
+    aussitôt, sans recompiler, sauf avec une limite max_nodes plus haute.
+    """
+    st = os.stat(fichier)
+    chemin = _chemin_compile(fichier)
+    max_nodes = options.get("max_nodes", MAX_NODES)
+    if cache:
+        base = CompiledBase.load(chemin, st)
+        if base is not None:
+            return base
+        limite = _limite_depassee(chemin, st)
+        if limite is not None and max_nodes <= limite:
+            raise RuntimeError(f"OBDD trop grand (plus de {limite} noeuds, d'après {chemin})")
+    lits, offsets, nb_vars = read_dimacs(fichier)
+    try:
+        base = CompiledBase.compile(iter_clauses(lits, offsets), nb_vars, **options)
+    except RuntimeError:
+        if cache:
+            _marquer_trop_grand(chemin, st, max_nodes)
+        raise
+    if cache:
+        try:
+            base.save(chemin, st)
+        except OSError:
+            pass  # le fichier compilé est facultatif
+    return base
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile des bases CNF en OBDD (étape hors ligne).")
+    parser.add_argument("fichiers", nargs="+", help="fichiers DIMACS CNF")
+    parser.add_argument("--max-nodes", type=int, default=MAX_NODES)
+    parser.add_argument("--force", action="store_true", help="recompiler même si le fichier compilé est à jour")
+    args = parser.parse_args()
+
+    for fichier in args.fichiers:
+        debut = time.perf_counter()
+        try:
+            base = compile_file(fichier, cache=not args.force, max_nodes=args.max_nodes)
+        except RuntimeError as e:
+            print(json.dumps({"file": fichier, "error": str(e)}, ensure_ascii=False))
+            continue
+        if args.force:
+            base.save(_chemin_compile(fichier), os.stat(fichier))
+        print(json.dumps({
+            "file": fichier,
+            "nb_vars": base.nb_vars,
+            "nodes": base.size(),
+            "consistent": base.is_consistent(),
+            "models": base.count_models(),
+            "entailed": sorted(base.entailed_literals(), key=abs),
+            "time": round(time.perf_counter() - debut, 6),
+        }, ensure_ascii=False))
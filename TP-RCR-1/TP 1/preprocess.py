@@ -0,0 +1,246 @@
+import time
+
+
+class Preprocessor:
+    """
+    Simplification d'une base CNF avant résolution :
+    - propagation unitaire (littéraux fixés, impliqués par la base),
+    - élimination des littéraux purs,
+    - subsomption et résolution auto-subsumante,
+    - élimination bornée de variables (BVE) : une variable n'est éliminée que si
+      ses résolvantes ne sont pas plus nombreuses que les clauses qu'elles remplacent.
+
+    Les littéraux purs et la BVE « oublient » une variable (la base réduite vaut ∃v.BC) :
+    les implications entre les autres variables sont conservées, et la pile de
+    reconstruction permet d'étendre un modèle de la base réduite à la base d'origine.
+    Les variables de frozen ne sont jamais éliminées.
+    """
+
+    def __init__(self, clauses, nb_vars, frozen=(), bve=True, max_resolvent=16, max_occurrences=16):
+        self.nb_vars = nb_vars
+        self.frozen = set(abs(x) for x in frozen)
+        self.bve = bve
+        self.max_resolvent = max_resolvent
+        self.max_occurrences = max_occurrences
+        self.unsat = False
+        self.fixed = {}         # variable -> littéral impliqué par la base
+        self.eliminated = set()
+        self.stack = []         # (variable, clauses supprimées contenant la variable)
+        self.stats = {"units": 0, "pure": 0, "subsumed": 0, "strengthened": 0, "eliminated": 0}
+
+        self._clauses = []
+        self._occ = {}
+        self._unites = []
+        for clause in clauses:
+            self._ajouter(clause)
+            self.nb_vars = max(self.nb_vars, max((abs(x) for x in clause), default=0))
+        self.initial_clauses = len(self._clauses)
+
+    # --- Gestion des clauses ---
+
+    def _ajouter(self, clause):
+        c = set(clause)
+        if any(-x in c for x in c):
+            return  # tautologie
+        if not c:
+            self.unsat = True
+            return
+        i = len(self._clauses)
+        self._clauses.append(c)
+        for x in c:
+            self._occ.setdefault(x, set()).add(i)
+        if len(c) == 1:
+            self._unites.append(i)
+
+    def _supprimer(self, i):
+        for x in self._clauses[i]:
+            self._occ[x].discard(i)
+        self._clauses[i] = None
+
+    def _retirer_litteral(self, i, x):
+        c = self._clauses[i]
+        c.discard(x)
+        self._occ[x].discard(i)
+        if not c:
+            self.unsat = True
+        elif len(c) == 1:
+            self._unites.append(i)
+
+    def _occurrences(self, x):
+        return self._occ.get(x, ())
+
+    # --- Étapes ---
+
+    def _propager(self):
+        while self._unites and not self.unsat:
+            i = self._unites.pop()
+            c = self._clauses[i]
+            if c is None or len(c) != 1:
+                continue
+            x = next(iter(c))
+            self.fixed[abs(x)] = x
+            self.stats["units"] += 1
+            for j in list(self._occurrences(x)):
+                self._supprimer(j)
+            for j in list(self._occurrences(-x)):
+                self._retirer_litteral(j, -x)
+
+    def _purs(self):
+        change = False
+        for v in range(1, self.nb_vars + 1):
+            if v in self.frozen or v in self.fixed or v in self.eliminated:
+                continue
+            pos, neg = self._occurrences(v), self._occurrences(-v)
+            if bool(pos) != bool(neg):
+                self._eliminer(v, list(pos or neg))
+                self.stats["pure"] += 1
+                change = True
+        return change
+
+    def _subsumer(self):
+        change = False
+        ordre = sorted((i for i, c in enumerate(self._clauses) if c is not None),
+                       key=lambda i: len(self._clauses[i]))
+        for i in ordre:
+            c = self._clauses[i]
+            if c is None:
+                continue
+            # subsomption : C ⊆ D, on parcourt le littéral de C le moins fréquent
+            rare = min(c, key=lambda x: len(self._occurrences(x)))
+            for j in list(self._occurrences(rare)):
+                if j != i and c <= self._clauses[j]:
+                    self._supprimer(j)
+                    self.stats["subsumed"] += 1
+                    change = True
+            # auto-subsomption : C = C' ∨ x et D ⊇ C' ∨ ¬x  =>  ¬x retiré de D
+            for x in list(c):
+                reste = c - {x}
+                for j in list(self._occurrences(-x)):
+                    d = self._clauses[j]
+                    if j != i and d is not None and reste <= d:
+                        self._retirer_litteral(j, -x)
+                        self.stats["strengthened"] += 1
+                        change = True
+                if self._clauses[i] is None:
+                    break
+            self._propager()
+            if self.unsat:
+                return False
+        return change
+
+    def _eliminer(self, v, indices):
+        self.stack.append((v, [sorted(self._clauses[i]) for i in indices]))
+        self.eliminated.add(v)
+        for i in indices:
+            self._supprimer(i)
+
+    def _resolvantes(self, v, pos, neg):
+        """
+        Résolvantes non tautologiques sur v, ou None si l'élimination ferait grossir la base.
+        """
+        resolvantes = []
+        for i in pos:
+            for j in neg:
+                r = (self._clauses[i] | self._clauses[j]) - {v, -v}
+                if any(-x in r for x in r):
+                    continue
+                if len(r) > self.max_resolvent or len(resolvantes) == len(pos) + len(neg):
+                    return None
+                resolvantes.append(r)
+        return resolvantes
+
+    def _bve(self):
+        change = False
+        candidats = sorted(
+            (v for v in range(1, self.nb_vars + 1)
+             if v not in self.frozen and v not in self.fixed and v not in self.eliminated),
+            key=lambda v: len(self._occurrences(v)) * len(self._occurrences(-v)))
+        for v in candidats:
+            pos, neg = list(self._occurrences(v)), list(self._occurrences(-v))
+            if not pos or not neg or len(pos) + len(neg) > self.max_occurrences:
+                continue
+            resolvantes = self._resolvantes(v, pos, neg)
+            if resolvantes is None:
+                continue
+            self._eliminer(v, pos + neg)
+            for r in resolvantes:
+                self._ajouter(r)
+            self.stats["eliminated"] += 1
+            change = True
+            self._propager()
+            if self.unsat:
+                return False
+        return change
+
+    # --- Interface ---
+
+    def run(self, max_rounds=8):
+        """
+        Applique les simplifications jusqu'à stabilité (ou max_rounds tours).
+        """
+        debut = time.perf_counter()
+        self._propager()
+        for _ in range(max_rounds):
+            if self.unsat:
+                break
+            change = self._purs()
+            change |= self._subsumer()
+            if self.bve and not self.unsat:
+                change |= self._bve()
+            self._propager()
+            if not change:
+                break
+        self.stats["time"] = time.perf_counter() - debut
+        self.stats["clauses_before"] = self.initial_clauses
+        self.stats["clauses_after"] = len(self.clauses)
+        return self
+
+    @property
+    def clauses(self):
+        """
+        Clauses de la base réduite (numérotation des variables inchangée).
+        """
+        if self.unsat:
+            return [[]]
+        return [sorted(c, key=abs) for c in self._clauses if c is not None]
+
+    def extend_model(self, model):
+        """
+        Étend un modèle de la base réduite (liste de littéraux DIMACS)
+        en un modèle de la base d'origine.
+        """
+        valeur = dict.fromkeys(range(1, self.nb_vars + 1), False)
+        for x in model:
+            valeur[abs(x)] = x > 0
+        for v, x in self.fixed.items():
+            valeur[v] = x > 0
+        for v, clauses in reversed(self.stack):
+            valeur[v] = False
+            for c in clauses:
+                if v in c and not any(valeur[abs(x)] == (x > 0) for x in c if x != v):
+                    valeur[v] = True
+                    break
+        return [v if valeur[v] else -v for v in range(1, self.nb_vars + 1)]
+
+    def entails(self, literal, solve, solve_original):
+        """
+        Décide BC ⊨ literal à l'aide de la base réduite.
+        solve(units) résout la base réduite, solve_original(units) la base d'origine
+        (utilisée seulement si la variable du littéral a été éliminée).
+        """
+        v = abs(literal)
+        if self.unsat:
+            return True
+        if v in self.fixed:
+            # BC ⊨ ¬literal : literal n'est impliqué que si BC est incohérente
+            return self.fixed[v] == literal or not solve([])
+        if v in self.eliminated:
+            return not solve_original([-literal])
+        return not solve([-literal])
+
+
+def preprocess(clauses, nb_vars, frozen=(), **options):
+    """
+    Simplifie la base et retourne le Preprocessor (clauses réduites, pile de reconstruction).
+    """
+    return Preprocessor(clauses, nb_vars, frozen, **options).run()
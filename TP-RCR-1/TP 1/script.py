@@ -1,90 +1,163 @@
-import subprocess
-import tempfile
 import os
 
+from dimacs import read_dimacs, iter_clauses
+from solvers import get_backend
+from knowledge_base import KnowledgeBase
+from fragments import GENERAL, classify
+from obdd import compile_file
+from preprocess import Preprocessor
+
+# Bases déjà chargées, indexées par fichier (rechargées si le fichier change)
+_bases = {}
+
 def read_file(fichier):
     """
-    Lit un fichier DIMACS CNF.
+    Lit un fichier DIMACS CNF (clauses sur plusieurs lignes acceptées).
     Retourne : liste des clauses, nombre de variables
     """
-    clauses = []
-    nb_vars = 0
-
     try:
-        with open(fichier, "r") as f:
-            for ligne in f:
-                ligne = ligne.strip()
-                if ligne.startswith("c") or ligne == "":
-                    continue  # ignorer les commentaires
-                elif ligne.startswith("p"):
-                    # ex: p cnf 200 860
-                    _, _, nb_vars_str, _ = ligne.split()
-                    nb_vars = int(nb_vars_str)
-                else:
-                    # ligne de clause
-                    clause = list(map(int, ligne.split()[:-1]))  # enlever le 0 final
-                    clauses.append(clause)
-        return clauses, nb_vars
-                
+        lits, offsets, nb_vars = read_dimacs(fichier)
     except FileNotFoundError:
         print(f"\n❌ Erreur : le fichier '{fichier}'' n'existe pas.")
         return [], 0
+    return [clause.tolist() for clause in iter_clauses(lits, offsets)], nb_vars
 
-def create_temp_file(clauses, nb_vars):
+def _charger(fichier, cle, construire):
     """
-    Crée un fichier temporaire .cnf en DIMACS avec les clauses données.
+    Retourne l'objet associé au fichier CNF (et à la clé), en ne relisant le fichier
+    que s'il a été modifié depuis le dernier chargement.
     """
-    content = f"p cnf {nb_vars} {len(clauses)}\n"
-    for clause in clauses:
-        content += " ".join(map(str, clause)) + " 0\n"
+    try:
+        mtime = os.stat(fichier).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime is not None and (fichier, cle) in _bases and _bases[(fichier, cle)][0] == mtime:
+        return _bases[(fichier, cle)][1]
 
-    temp = tempfile.NamedTemporaryFile(delete=False, suffix=".cnf", mode="w")
-    temp.write(content)
-    temp.close()
-    return temp.name
+    try:
+        lits, offsets, nb_vars = read_dimacs(fichier)
+    except FileNotFoundError:
+        print(f"\n❌ Erreur : le fichier '{fichier}'' n'existe pas.")
+        return None
+    if len(offsets) < 2:
+        return None
+    objet = construire(iter_clauses(lits, offsets), nb_vars)
+    _bases[(fichier, cle)] = (mtime, objet)
+    return objet
 
-def check_inference(file, literal, ubcsat_path="./ubcsat"):
+def load_knowledge_base(fichier, preprocess=False):
     """
-    Vérifie si le fichier CNF d'origine + clauses supplémentaires est insatisfiable.
+    Retourne la KnowledgeBase (solveur CDCL persistant) associée au fichier CNF.
     """
-    bc_clauses, nb_vars = read_file(file)
+    def construire(clauses, nb_vars):
+        return KnowledgeBase(clauses, nb_vars, preprocess=preprocess)
+    return _charger(fichier, ("cdcl", preprocess), construire)
 
-    if bc_clauses: # Vérifier si le fichier a été lu correctement
+def load_fragment(fichier):
+    """
+    Fragment de la base du fichier CNF : "horn", "2-sat" ou "general" (voir fragments.py).
+    """
+    return _charger(fichier, "fragment", lambda clauses, nb_vars: classify([c.tolist() for c in clauses]))
 
-        # Ajouter l'inverse du literal φ
-        all_clauses = bc_clauses + [[-1*literal]]
+def load_compiled(fichier):
+    """
+    Retourne la base compilée en OBDD (voir obdd.py) : relue depuis le fichier compilé
+    s'il est à jour, compilée sinon ; gardée en mémoire tant que le CNF ne change pas.
+    Une base dont l'OBDD dépasse la limite de noeuds n'a pas de forme compilée : on le
+    signale, et c'est alors la KnowledgeBase qui est retournée, donc un appel au solveur
+    CDCL par requête. L'échec est mémorisé dans .cnf_cache (voir compile_file) : la
+    compilation n'est pas retentée tant que le CNF ne change pas.
+    """
+    try:
+        mtime = os.stat(fichier).st_mtime_ns
+    except OSError:
+        print(f"\n❌ Erreur : le fichier '{fichier}'' n'existe pas.")
+        return None
+    if _bases.get((fichier, "obdd"), (None,))[0] != mtime:
+        try:
+            base = compile_file(fichier)
+        except RuntimeError as e:
+            print(f"\n❌ Erreur : la base '{fichier}' n'a pas de forme compilée ({e}) ; "
+                  f"les réponses viendront du solveur CDCL, pas de l'OBDD.")
+            base = load_knowledge_base(fichier)
+        _bases[(fichier, "obdd")] = (mtime, base)
+    return _bases[(fichier, "obdd")][1]
+
+def load_backend(fichier, backend, preprocess=False, **options):
+    """
+    Retourne un backend externe dans lequel la base du fichier CNF est déjà chargée.
+    Avec preprocess=True, retourne le couple (backend chargé avec la base réduite, Preprocessor).
+    """
+    def construire(clauses, nb_vars):
+        solver = get_backend(backend, **options)
+        if not preprocess:
+            solver.load(clauses, nb_vars)
+            return solver
+        pre = Preprocessor(clauses, nb_vars).run()
+        solver.load(pre.clauses, pre.nb_vars)
+        return solver, pre
+    return _charger(fichier, (backend, preprocess, tuple(sorted(options.items()))), construire)
+
+def check_inference(file, literal, ubcsat_path="./ubcsat", backend="cdcl", preprocess=False):
+    """
+    Vérifie si le fichier CNF d'origine + clauses supplémentaires est insatisfiable.
+    Le backend "cdcl" (par défaut) interroge une KnowledgeBase chargée une seule fois
+    et prouve l'insatisfiabilité sans processus externe ; les backends "ubcsat"
+    (recherche locale, incomplet) et "portfolio" (plusieurs algorithmes ubcsat
+    en parallèle) restent disponibles.
+    Avec preprocess=True, la base est simplifiée (unités, littéraux purs,
+    subsomption, élimination de variables) avant d'être confiée au backend.
+    Une base de Horn ou 2-SAT est toujours confiée à la KnowledgeBase, qui la résout
+    exactement en temps linéaire : la recherche locale n'y apporterait rien.
+    Le backend "obdd" répond sur la base compilée hors ligne (python obdd.py fichier.cnf),
+    en temps linéaire dans la taille du diagramme et sans appel à un solveur ; une base
+    trop grande pour être compilée est signalée et confiée au solveur CDCL.
+    """
+    x = "{{{}}}".format(-1*literal)
 
-        # Ajuster le nombre de variables si nécessaire
-        max_var_utilisee = max(abs(lit) for clause in all_clauses for lit in clause)
-        nb_vars = max(nb_vars, max_var_utilisee)
+    if backend not in ("cdcl", "obdd") and load_fragment(file) not in (None, GENERAL):
+        backend = "cdcl"
 
-        # Écrire dans un fichier temporaire
-        cnf_temp = create_temp_file(all_clauses, nb_vars)
+    if backend == "obdd":
+        base = load_compiled(file)
+        if base is None: # Vérifier si le fichier a été lu correctement
+            return None
+        infere = base.entails(literal)
+        preuve = ""
+    elif backend == "cdcl":
+        base = load_knowledge_base(file, preprocess)
+        if base is None: # Vérifier si le fichier a été lu correctement
+            return None
+        infere = base.entails(literal)
+        preuve = ""
+    else:
+        charge = load_backend(file, backend, preprocess, ubcsat_path=ubcsat_path)
+        if charge is None: # Vérifier si le fichier a été lu correctement
+            return None
 
-        try:
-            result = subprocess.run(
-                [ubcsat_path, "-alg", "saps", "-i", cnf_temp, "-solve"],
-                capture_output=True, text=True
-            )
-
-            output = result.stdout
-            x = "{{{}}}".format(-1*literal)
-            if "Solution Found" not in output:
-                print(f"\n✅ BC U {x} est insatisfiable, donc BC infère bien {literal} (BC ⊨ {literal})")
-                return True
-            else:
-                print(f"\n❌ BC U {x} est satisfiable, donc BC n'infère pas {literal} (BC ⊭ {literal})")
-                return False
-
-        finally: # Nettoyer le fichier temporaire
-            os.remove(cnf_temp)
+        # Ajouter l'inverse du literal φ
+        if preprocess:
+            solver, pre = charge
+            original = lambda units: load_backend(file, backend, ubcsat_path=ubcsat_path).solve(units)
+            infere = pre.entails(literal, solver.solve, original)
+        else:
+            infere = not charge.solve([-1*literal])
+        preuve = " (aucune solution trouvée, non prouvé)"
+
+    if infere:
+        print(f"\n✅ BC U {x} est insatisfiable{preuve}, donc BC infère bien {literal} (BC ⊨ {literal})")
+        return True
+    else:
+        print(f"\n❌ BC U {x} est satisfiable, donc BC n'infère pas {literal} (BC ⊭ {literal})")
+        return False
 
 # Exemple d'utilisation
 
-while True:
-    try:
-        fichier = input("\nEntrer le fichier CNF : ")
-        phi = int(input("\nEntrer un literal φ (ex: 3 pour c, -3 pour ¬c) : "))
-        check_inference(fichier, phi)
-    except ValueError:
-        print("\n❌ Erreur : le literal φ doit être un entier.")
+if __name__ == "__main__":
+    while True:
+        try:
+            fichier = input("\nEntrer le fichier CNF : ")
+            phi = int(input("\nEntrer un literal φ (ex: 3 pour c, -3 pour ¬c) : "))
+            check_inference(fichier, phi)
+        except ValueError:
+            print("\n❌ Erreur : le literal φ doit être un entier.")
@@ -0,0 +1,244 @@
+import json
+import os
+import selectors
+import subprocess
+import threading
+import time
+
+from cdcl import CDCLSolver
+
+
+class CDCLBackend:
+    """
+    Backend complet en mémoire : aucune écriture de fichier ni processus externe.
+    Une réponse False est une preuve d'insatisfiabilité.
+    """
+    name = "cdcl"
+    complete = True
+
+    def __init__(self, **options):
+        self.options = options
+        self.stats = {}
+
+        self.solver = None
+
+    def load(self, clauses, nb_vars):
+        """
+        Charge la base dans un solveur persistant ; les requêtes suivantes la réutilisent.
+        """
+        self.solver = CDCLSolver(nb_vars, **self.options)
+        for clause in clauses:
+            if not self.solver.add_clause(clause):
+                break
+
+    def solve(self, units=()):
+        """
+        Résout la base chargée sous les hypothèses unitaires données.
+        """
+        resultat = self.solver.solve(units)
+        self.stats = dict(self.solver.stats)
+        return resultat
+
+    def is_satisfiable(self, clauses, nb_vars):
+        self.load(clauses, nb_vars)
+        return self.solve()
+
+
+class UbcsatBackend:
+    """
+    Backend historique : recherche locale stochastique via le binaire ubcsat.
+    Incomplet : l'absence de "Solution Found" ne prouve pas l'insatisfiabilité.
+    La base est encodée une seule fois en DIMACS (load) puis envoyée directement
+    sur l'entrée standard d'ubcsat à chaque requête, sans fichier temporaire.
+    """
+    name = "ubcsat"
+    complete = False
+
+    def __init__(self, ubcsat_path="./ubcsat", alg="saps"):
+        self.ubcsat_path = ubcsat_path
+        self.alg = alg
+        self.stats = {}
+        self._corps = b""
+        self._nb_clauses = 0
+        self.nb_vars = 0
+
+    def load(self, clauses, nb_vars):
+        """
+        Encode la base une fois pour toutes ; les requêtes n'ajoutent que leurs clauses unitaires.
+        """
+        self._corps = encode_clauses(clauses)
+        self._nb_clauses = self._corps.count(b"\n")
+        self.nb_vars = nb_vars
+
+    def solve(self, units=()):
+        """
+        Lance ubcsat sur la base chargée augmentée des clauses unitaires données.
+        """
+        process = self._lancer(self.alg, None, units)
+        output = process.stdout.read().decode(errors="replace")
+        process.wait()
+        return "Solution Found" in output
+
+    def _lancer(self, alg, seed, units):
+        """
+        Démarre ubcsat et lui envoie la base (plus les clauses unitaires) sur stdin.
+        """
+        nb_vars = max([self.nb_vars] + [abs(x) for x in units])
+        entete = f"p cnf {nb_vars} {self._nb_clauses + len(units)}\n".encode()
+        extra = "".join(f"{x} 0\n" for x in units).encode()
+
+        commande = [self.ubcsat_path, "-alg", alg, "-solve"]
+        if seed is not None:
+            commande += ["-seed", str(seed)]
+        process = subprocess.Popen(
+            commande, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        # l'écriture se fait dans un thread pour ne pas bloquer si ubcsat remplit stdout
+        threading.Thread(target=_ecrire_stdin, args=(process.stdin, (entete, self._corps, extra)),
+                         daemon=True).start()
+        return process
+
+    def is_satisfiable(self, clauses, nb_vars):
+        self.load(clauses, nb_vars)
+        return self.solve()
+
+
+class PortfolioBackend(UbcsatBackend):
+    """
+    Portefeuille d'algorithmes ubcsat lancés en parallèle (un processus par couple
+    algorithme/graine). Le premier qui trouve une solution tranche la requête et les
+    autres sont arrêtés. Les victoires par algorithme sont enregistrées dans un fichier
+    JSON et servent à choisir en priorité les algorithmes qui gagnent le plus souvent.
+    """
+    name = "portfolio"
+    complete = False
+
+    ALGORITHMS = ["saps", "rsaps", "adaptnovelty+", "walksat", "novelty+", "rnovelty+", "gsat", "walksat-tabu"]
+    WORKERS = 4     # processus ubcsat par requête, sauf workers explicite
+
+    def __init__(self, ubcsat_path="./ubcsat", algorithms=None, workers=None, timeout=None,
+                 stats_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolio_stats.json")):
+        super().__init__(ubcsat_path)
+        self.algorithms = list(algorithms or self.ALGORITHMS)
+        self.workers = workers or min(self.WORKERS, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.stats_path = stats_path
+        self.win_stats = self._lire_stats()
+        self._requetes = 0
+
+    def _lire_stats(self):
+        try:
+            with open(self.stats_path) as f:
+                return json.load(f)
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _ecrire_stats(self):
+        if not self.stats_path:
+            return
+        try:
+            with open(self.stats_path, "w") as f:
+                json.dump(self.win_stats, f, indent=2, sort_keys=True)
+        except OSError:
+            pass
+
+    def _taux(self, alg):
+        s = self.win_stats.get(alg, {})
+        # lissage de Laplace : un algorithme jamais essayé reste compétitif
+        return (s.get("wins", 0) + 1) / (s.get("runs", 0) + 2)
+
+    def portfolio(self):
+        """
+        Couples (algorithme, graine) à lancer, les meilleurs algorithmes en premier.
+        """
+        classement = sorted(self.algorithms, key=self._taux, reverse=True)
+        return [(classement[i % len(classement)], self._requetes * self.workers + i + 1)
+                for i in range(self.workers)]
+
+    def solve(self, units=()):
+        """
+        Lance le portefeuille ; retourne True dès qu'un algorithme trouve une solution.
+        """
+        lancement = self.portfolio()
+        self._requetes += 1
+        debut = time.perf_counter()
+        actifs = {}
+        sorties = {}
+        selecteur = selectors.DefaultSelector()
+        for alg, seed in lancement:
+            p = self._lancer(alg, seed, units)
+            os.set_blocking(p.stdout.fileno(), False)
+            actifs[p] = alg
+            sorties[p] = b""
+            selecteur.register(p.stdout, selectors.EVENT_READ, p)
+
+        gagnant = None
+        try:
+            while actifs and gagnant is None:
+                reste = None if self.timeout is None else self.timeout - (time.perf_counter() - debut)
+                if reste is not None and reste <= 0:
+                    break
+                for cle, _ in selecteur.select(reste):
+                    p = cle.data
+                    morceau = p.stdout.read()
+                    if morceau:
+                        sorties[p] += morceau
+                        if b"Solution Found" in sorties[p]:
+                            gagnant = actifs[p]
+                            break
+                    elif morceau is not None:   # fin de flux : ce processus a abandonné
+                        selecteur.unregister(p.stdout)
+                        del actifs[p]
+        finally:
+            # arrêter les processus encore en course
+            for p in sorties:
+                if p.poll() is None:
+                    p.kill()
+                p.wait()
+                p.stdout.close()
+            selecteur.close()
+
+        for alg, _ in lancement:
+            s = self.win_stats.setdefault(alg, {"runs": 0, "wins": 0, "time": 0.0})
+            s["runs"] += 1
+        if gagnant is not None:
+            s = self.win_stats[gagnant]
+            s["wins"] += 1
+            s["time"] += time.perf_counter() - debut
+        self.stats = {"winner": gagnant, "time": time.perf_counter() - debut}
+        self._ecrire_stats()
+        return gagnant is not None
+
+
+BACKENDS = {
+    CDCLBackend.name: CDCLBackend,
+    UbcsatBackend.name: UbcsatBackend,
+    PortfolioBackend.name: PortfolioBackend,
+}
+
+
+def get_backend(name, **options):
+    """
+    Instancie le backend de résolution demandé ("cdcl", "ubcsat" ou "portfolio").
+    """
+    try:
+        return BACKENDS[name](**options)
+    except KeyError:
+        raise ValueError(f"Backend inconnu : '{name}' (disponibles : {', '.join(BACKENDS)})")
+
+
+def encode_clauses(clauses):
+    """
+    Encode des clauses en texte DIMACS (sans en-tête) en une seule passe.
+    """
+    lignes = [" ".join(map(str, clause)) + " 0" for clause in clauses]
+    return ("\n".join(lignes) + "\n").encode() if lignes else b""
+
+
+def _ecrire_stdin(flux, morceaux):
+    try:
+        for morceau in morceaux:
+            flux.write(memoryview(morceau))
+        flux.close()
+    except BrokenPipeError:
+        pass  # ubcsat s'est arrêté avant de tout lire
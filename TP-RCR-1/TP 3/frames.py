@@ -0,0 +1,371 @@
+from kripke import KripkeModel, DENSE_LIMIT, indices
+
+# Propriétés de cadre caractéristiques des logiques modales usuelles
+LOGICS = {
+    "K": (),
+    "D": ("serial",),
+    "T": ("reflexive",),
+    "B": ("reflexive", "symmetric"),
+    "S4": ("reflexive", "transitive"),
+    "KD45": ("serial", "transitive", "euclidean"),
+    "S5": ("reflexive", "euclidean"),
+}
+
+
+# --- Extraction du cadre ---
+
+def frame(model, agent=None):
+    """
+    Listes de successeurs (indices de mondes) de la relation d'un agent.
+    Fonctionne avec KripkeModel et CSRKripkeModel, via leurs listes de prédécesseurs.
+    """
+    pred = model.predecessors(agent)
+    succ = [[] for _ in range(len(pred))]
+    for v in range(len(pred)):
+        for u in pred[v]:
+            succ[u].append(v)
+    return succ
+
+
+def edges(model, succ):
+    """
+    Arcs (monde, monde) de listes de successeurs, pour KripkeModel.add_relation.
+    """
+    noms = model.worlds if model.worlds is not None else range(len(succ))
+    return [(noms[u], noms[v]) for u, s in enumerate(succ) for v in s]
+
+
+# --- Vérification des propriétés ---
+# Chaque test s'arrête au premier contre-exemple.
+
+def is_serial(succ):
+    return all(succ)
+
+
+def is_reflexive(succ):
+    return all(u in s for u, s in enumerate(succ))
+
+
+def is_symmetric(succ):
+    ensembles = [set(s) for s in succ]
+    return all(u in ensembles[v] for u, s in enumerate(succ) for v in s)
+
+
+def is_transitive(succ):
+    # uRv ⇒ R(v) ⊆ R(u)
+    ensembles = [set(s) for s in succ]
+    return all(ensembles[v] <= ensembles[u] for u in range(len(succ)) for v in succ[u])
+
+
+def is_euclidean(succ):
+    # uRv ⇒ R(u) ⊆ R(v)
+    ensembles = [set(s) for s in succ]
+    return all(ensembles[u] <= ensembles[v] for u in range(len(succ)) for v in succ[u])
+
+
+def is_equivalence(succ):
+    """
+    Réflexive, symétrique et transitive, en O(arcs) : chaque monde doit voir
+    exactement sa composante connexe (union-find sur les arcs).
+    """
+    classes = _union_find(len(succ), ((u, v) for u, s in enumerate(succ) for v in s))
+    taille = {}
+    for c in classes:
+        taille[c] = taille.get(c, 0) + 1
+    return all(len(set(s)) == taille[classes[u]] for u, s in enumerate(succ))
+
+
+_TESTS = {
+    "serial": is_serial,
+    "reflexive": is_reflexive,
+    "symmetric": is_symmetric,
+    "transitive": is_transitive,
+    "euclidean": is_euclidean,
+}
+
+
+def _partition(model, agent):
+    """
+    Test en O(mondes) pour les relations données par des classes partagées
+    (KripkeModel.add_partition) : les mondes qui partagent la même ligne doivent
+    être exactement les mondes de cette ligne. Un échec ne prouve rien.
+    """
+    if getattr(model, "sparse", True):
+        lignes = model.predecessors(agent)
+        if hasattr(lignes, "ptr"):
+            # CSR : chaque lignes[v] est une nouvelle tranche, une ligne se reconnaît à sa position
+            cle = lambda v: (lignes.ptr[v], lignes.ptr[v + 1])
+        else:
+            # listes partagées par add_partition : une ligne se reconnaît à son identité
+            cle = lambda v: id(lignes[v])
+    else:
+        lignes = model.succ[model._agent(agent)]
+        cle = None
+    groupes = {}
+    for v in range(len(lignes)):
+        k = cle(v) if cle else lignes[v]
+        groupes.setdefault(k, (lignes[v], []))[1].append(v)
+    if cle:
+        return all(len(ligne) == len(mondes) and set(ligne) == set(mondes)
+                   for ligne, mondes in groupes.values())
+    return all(ligne == sum(1 << v for v in mondes) for ligne, mondes in groupes.values())
+
+
+def properties(model, agent=None):
+    """
+    Dictionnaire propriété -> booléen pour la relation d'un agent.
+    """
+    if _partition(model, agent):
+        return dict.fromkeys(_TESTS, True)
+    succ = frame(model, agent)
+    if is_equivalence(succ):
+        return dict.fromkeys(_TESTS, True)
+    return {nom: test(succ) for nom, test in _TESTS.items()}
+
+
+def logics(model, agent=None):
+    """
+    Logiques de LOGICS dont le cadre de l'agent vérifie toutes les propriétés.
+    """
+    props = properties(model, agent)
+    return [nom for nom, requises in LOGICS.items() if all(props[p] for p in requises)]
+
+
+def check_frame(model, logic, agent=None):
+    """
+    Lève une ValueError si le cadre de l'agent n'est pas un cadre de la logique donnée.
+    """
+    props = properties(model, agent)
+    manquantes = [p for p in LOGICS[logic] if not props[p]]
+    if manquantes:
+        raise ValueError(f"Le cadre de {agent!r} n'est pas {logic} : non {', '.join(manquantes)}")
+
+
+# --- Clôtures ---
+
+def reflexive_closure(succ):
+    return [s if u in s else s + [u] for u, s in enumerate(succ)]
+
+
+def symmetric_closure(succ):
+    res = [list(s) for s in succ]
+    ensembles = [set(s) for s in succ]
+    for u, s in enumerate(succ):
+        for v in s:
+            if u not in ensembles[v]:
+                ensembles[v].add(u)
+                res[v].append(u)
+    return res
+
+
+def transitive_closure(succ):
+    """
+    Clôture transitive : Warshall sur des vecteurs de bits pour les petits cadres,
+    condensation en composantes fortement connexes sinon.
+    """
+    if len(succ) <= DENSE_LIMIT:
+        return _warshall(succ)
+    return _closure_scc(succ)
+
+
+def _warshall(succ):
+    lignes = [0] * len(succ)
+    for u, s in enumerate(succ):
+        for v in s:
+            lignes[u] |= 1 << v
+    for k in range(len(succ)):
+        bit, ligne_k = 1 << k, lignes[k]
+        for u in range(len(succ)):
+            if lignes[u] & bit:
+                lignes[u] |= ligne_k
+    return [indices(l) for l in lignes]
+
+
+def _closure_scc(succ):
+    """
+    Les mondes d'une même composante fortement connexe ont les mêmes successeurs
+    dans la clôture : on calcule l'atteignabilité sur le DAG des composantes,
+    puits d'abord (ordre de sortie de Tarjan).
+    """
+    composante, ordre = strongly_connected_components(succ)
+    membres = [0] * len(ordre)
+    cyclique = [False] * len(ordre)
+    for u, c in enumerate(composante):
+        membres[c] |= 1 << u
+    atteint = [0] * len(ordre)
+    for c, mondes in enumerate(ordre):
+        res = 0
+        for u in mondes:
+            for v in succ[u]:
+                d = composante[v]
+                if d == c:
+                    cyclique[c] = True
+                else:
+                    res |= membres[d] | atteint[d]
+        if cyclique[c]:
+            res |= membres[c]
+        atteint[c] = res
+    cache = {}
+    res = []
+    for u in range(len(succ)):
+        c = composante[u]
+        if c not in cache:
+            cache[c] = indices(atteint[c])
+        res.append(cache[c])
+    return res
+
+
+def strongly_connected_components(succ):
+    """
+    Tarjan itératif. Retourne (composante de chaque monde, liste des composantes)
+    où les composantes sont numérotées puits d'abord (ordre topologique inverse).
+    """
+    n = len(succ)
+    numero = [-1] * n
+    bas = [0] * n
+    composante = [-1] * n
+    ordre = []
+    pile = []
+    compteur = 0
+    for racine in range(n):
+        if numero[racine] != -1:
+            continue
+        appels = [(racine, 0)]
+        numero[racine] = bas[racine] = compteur
+        compteur += 1
+        pile.append(racine)
+        while appels:
+            u, i = appels[-1]
+            if i < len(succ[u]):
+                appels[-1] = (u, i + 1)
+                v = succ[u][i]
+                if numero[v] == -1:
+                    numero[v] = bas[v] = compteur
+                    compteur += 1
+                    pile.append(v)
+                    appels.append((v, 0))
+                elif composante[v] == -1:
+                    bas[u] = min(bas[u], numero[v])
+                continue
+            appels.pop()
+            if appels:
+                parent = appels[-1][0]
+                bas[parent] = min(bas[parent], bas[u])
+            if bas[u] == numero[u]:
+                c = len(ordre)
+                mondes = []
+                while True:
+                    v = pile.pop()
+                    composante[v] = c
+                    mondes.append(v)
+                    if v == u:
+                        break
+                ordre.append(mondes)
+    return composante, ordre
+
+
+def euclidean_closure(succ):
+    """
+    Plus petite relation euclidienne contenant R. Dans un cadre euclidien, tout
+    monde ayant un prédécesseur est réflexif et les successeurs d'un même monde
+    sont deux à deux reliés : ces mondes forment des classes d'équivalence,
+    calculées par union-find.
+    """
+    n = len(succ)
+    image = [False] * n
+    for s in succ:
+        for v in s:
+            image[v] = True
+    paires = []
+    for u, s in enumerate(succ):
+        if s:
+            paires.extend((s[0], v) for v in s[1:])
+        if image[u]:
+            paires.extend((u, v) for v in s)
+    classes = _union_find(n, paires)
+    membres = {}
+    for v in range(n):
+        if image[v]:
+            membres.setdefault(classes[v], []).append(v)
+    res = []
+    for u, s in enumerate(succ):
+        if image[u]:
+            res.append(membres[classes[u]])
+        else:
+            res.append(list(s))
+    return res
+
+
+def equivalence_closure(succ):
+    """
+    Plus petite relation d'équivalence contenant R (clôture S5) :
+    chaque monde voit toute sa composante connexe.
+    """
+    classes = _union_find(len(succ), ((u, v) for u, s in enumerate(succ) for v in s))
+    membres = {}
+    for v, c in enumerate(classes):
+        membres.setdefault(c, []).append(v)
+    return [membres[c] for c in classes]
+
+
+CLOSURES = {
+    "reflexive": reflexive_closure,
+    "symmetric": symmetric_closure,
+    "transitive": transitive_closure,
+    "euclidean": euclidean_closure,
+    "equivalence": equivalence_closure,
+}
+
+
+def close(model, *closures, agent=None):
+    """
+    Remplace la relation de l'agent par sa clôture, les clôtures étant appliquées
+    dans l'ordre donné (ex. close(M, "reflexive", "transitive") pour S4).
+    """
+    succ = frame(model, agent)
+    for nom in closures:
+        succ = CLOSURES[nom](succ)
+    if agent is None and len(model.agents) == 1:
+        agent = model.agents[0]
+    model.add_relation(agent, edges(model, succ))
+    return model
+
+
+def _union_find(n, paires):
+    """
+    Représentant de la classe de chaque élément après union des paires.
+    """
+    parent = list(range(n))
+
+    def trouver(x):
+        racine = x
+        while parent[racine] != racine:
+            racine = parent[racine]
+        while parent[x] != racine:
+            parent[x], x = racine, parent[x]
+        return racine
+
+    for u, v in paires:
+        ru, rv = trouver(u), trouver(v)
+        if ru != rv:
+            parent[ru] = rv
+    return [trouver(x) for x in range(n)]
+
+
+# --- Génération de modèles épistémiques ---
+
+def epistemic_model(worlds, valuation, observations, sparse=None):
+    """
+    Modèle S5 multi-agents généré automatiquement : observations associe à chaque
+    agent une fonction monde -> ce que l'agent observe dans ce monde. Deux mondes
+    sont indiscernables pour un agent s'il y observe la même chose.
+    Les classes sont partagées entre leurs mondes (KripkeModel.add_partition) :
+    la mémoire reste linéaire en le nombre de mondes.
+    """
+    model = KripkeModel(worlds, {}, valuation, sparse)
+    for agent, observe in observations.items():
+        classes = {}
+        for w in model.worlds:
+            classes.setdefault(observe(w), []).append(w)
+        model.add_partition(agent, classes.values())
+    return model
@@ -0,0 +1,543 @@
+from dataclasses import dataclass
+
+# --- Formules modales ---
+# Une formule est un arbre immuable (atomes, ¬, ∧, ∨, →, □, ◇).
+# Les opérateurs Python permettent d'écrire : ~p, p & q, p | q, p >> q.
+
+class Formula:
+    def __invert__(self):
+        return Not(self)
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __rshift__(self, other):
+        return Implies(self, other)
+
+
+@dataclass(frozen=True)
+class Atom(Formula):
+    name: str
+
+    def __str__(self):
+        return self.name
+
+
+@dataclass(frozen=True)
+class Not(Formula):
+    sub: Formula
+
+    def __str__(self):
+        return f"¬{self.sub}"
+
+
+@dataclass(frozen=True)
+class And(Formula):
+    left: Formula
+    right: Formula
+
+    def __str__(self):
+        return f"({self.left} ∧ {self.right})"
+
+
+@dataclass(frozen=True)
+class Or(Formula):
+    left: Formula
+    right: Formula
+
+    def __str__(self):
+        return f"({self.left} ∨ {self.right})"
+
+
+@dataclass(frozen=True)
+class Implies(Formula):
+    left: Formula
+    right: Formula
+
+    def __str__(self):
+        return f"({self.left} → {self.right})"
+
+
+@dataclass(frozen=True)
+class Box(Formula):
+    sub: Formula
+    agent: str = None   # relation utilisée (None : relation unique du modèle)
+
+    def __str__(self):
+        return f"□{_indice(self.agent)}{self.sub}"
+
+
+@dataclass(frozen=True)
+class Dia(Formula):
+    sub: Formula
+    agent: str = None
+
+    def __str__(self):
+        return f"◇{_indice(self.agent)}{self.sub}"
+
+
+def _indice(agent):
+    return "" if agent is None else f"_{agent} "
+
+
+# --- Connaissance de groupe ---
+
+@dataclass(frozen=True)
+class Everyone(Formula):
+    """E_G φ : chaque agent du groupe sait φ."""
+    group: tuple
+    sub: Formula
+
+    def __post_init__(self):
+        object.__setattr__(self, "group", tuple(self.group))
+
+    def __str__(self):
+        return f"E_{{{','.join(self.group)}}} {self.sub}"
+
+
+@dataclass(frozen=True)
+class Common(Formula):
+    """C_G φ : φ est vrai dans tout monde accessible en au moins un pas par les agents du groupe."""
+    group: tuple
+    sub: Formula
+
+    def __post_init__(self):
+        object.__setattr__(self, "group", tuple(self.group))
+
+    def __str__(self):
+        return f"C_{{{','.join(self.group)}}} {self.sub}"
+
+
+# --- Opérateurs temporels CTL ---
+# Sémantique des chemins maximaux : un chemin s'arrête dans un monde sans successeur.
+# EX et AX sont ◇ et □ ; les autres sont des points fixes calculés par listes de travail.
+
+EX = Dia
+AX = Box
+
+
+@dataclass(frozen=True)
+class EU(Formula):
+    """E[φ U ψ] : il existe un chemin où φ reste vrai jusqu'à ce que ψ le devienne."""
+    left: Formula
+    right: Formula
+    agent: str = None
+
+    def __str__(self):
+        return f"E[{self.left} U {self.right}]"
+
+
+@dataclass(frozen=True)
+class EF(Formula):
+    sub: Formula
+    agent: str = None
+
+    def __str__(self):
+        return f"EF {self.sub}"
+
+
+@dataclass(frozen=True)
+class EG(Formula):
+    sub: Formula
+    agent: str = None
+
+    def __str__(self):
+        return f"EG {self.sub}"
+
+
+@dataclass(frozen=True)
+class AF(Formula):
+    sub: Formula
+    agent: str = None
+
+    def __str__(self):
+        return f"AF {self.sub}"
+
+
+@dataclass(frozen=True)
+class AG(Formula):
+    sub: Formula
+    agent: str = None
+
+    def __str__(self):
+        return f"AG {self.sub}"
+
+
+def AU(left, right, agent=None):
+    """
+    A[φ U ψ] = ¬(E[¬ψ U (¬φ ∧ ¬ψ)] ∨ EG ¬ψ).
+    """
+    return ~(EU(~right, ~left & ~right, agent) | EG(~right, agent))
+
+
+# --- Modèle de Kripke à vecteurs de bits ---
+
+# Au-delà de cette taille, les masques de successeurs (un entier par monde, chacun
+# aussi long que le modèle) coûteraient O(n²) : on passe aux listes de prédécesseurs.
+DENSE_LIMIT = 4096
+
+_VERS_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def bits_from_flags(flags):
+    """
+    Convertit un bytearray de 0/1 (un octet par monde) en vecteur de bits.
+    """
+    return int(flags.translate(_VERS_ASCII)[::-1], 2) if flags else 0
+
+
+def indices(bits):
+    """
+    Indices des bits à 1 d'un vecteur de bits, par ordre croissant.
+    """
+    texte = bin(bits)[:1:-1]
+    res = []
+    i = texte.find("1")
+    while i != -1:
+        res.append(i)
+        i = texte.find("1", i + 1)
+    return res
+
+
+_DEPUIS_ASCII = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def flags_from_bits(bits, n):
+    """
+    Convertit un vecteur de bits en bytearray de 0/1 (un octet par monde).
+    """
+    return bytearray(bin(bits)[:1:-1].ljust(n, "0").encode().translate(_DEPUIS_ASCII))
+
+
+class KripkeModel:
+    """
+    Modèle de Kripke où chaque ensemble de mondes est un entier Python utilisé
+    comme vecteur de bits (bit i = monde d'indice i).
+    Pour les petits modèles, les successeurs de chaque monde sont précalculés sous
+    forme de masques : □φ et ◇φ sont calculés pour tous les mondes à la fois.
+    Pour les grands modèles creux, ◇φ est obtenu en marquant les prédécesseurs
+    des mondes de φ, en O(nombre d'arcs).
+
+    relation est soit une liste d'arcs, soit un dictionnaire agent -> liste d'arcs
+    pour les modèles multi-agents.
+    """
+
+    def __init__(self, worlds, relation, valuation, sparse=None):
+        self.worlds = list(worlds)
+        self.index = {w: i for i, w in enumerate(self.worlds)}
+        n = len(self.worlds)
+        self.all = (1 << n) - 1
+        self.sparse = n > DENSE_LIMIT if sparse is None else sparse
+        self.labels = {}    # mémo des sous-formules déjà étiquetées (voir label)
+        self.succ = {}      # agent -> masques de successeurs (modèle dense)
+        self.pred = {}      # agent -> listes de prédécesseurs (modèle creux, ou à la demande)
+        self._degres = {}
+        relations = relation if isinstance(relation, dict) else {None: relation}
+        for agent, arcs in relations.items():
+            self.add_relation(agent, arcs)
+        self.valuation = {p: self.mask(ws) for p, ws in valuation.items()}
+
+    @classmethod
+    def from_edges(cls, nb_worlds, edges, valuation, sparse=None):
+        """
+        Modèle dont les mondes sont les entiers 0..nb_worlds-1.
+        """
+        return cls(range(nb_worlds), edges, valuation, sparse)
+
+    def add_relation(self, agent, edges):
+        """
+        Ajoute (ou remplace) la relation d'accessibilité d'un agent.
+        """
+        n = len(self.worlds)
+        index = self.index
+        if self.sparse:
+            pred = [[] for _ in range(n)]
+            for u, v in edges:
+                pred[index[v]].append(index[u])
+            self.pred[agent] = pred
+        else:
+            succ = [0] * n
+            for u, v in edges:
+                succ[index[u]] |= 1 << index[v]
+            self.succ[agent] = succ
+            self.pred.pop(agent, None)
+        self._degres.pop(agent, None)
+        self.labels.clear()
+
+    def add_partition(self, agent, classes):
+        """
+        Relation d'équivalence d'un agent donnée par ses classes (listes de mondes) :
+        chaque monde voit toute sa classe. Le masque (ou la liste) d'une classe est
+        partagé entre ses mondes, sans construire les arcs un à un.
+        """
+        n = len(self.worlds)
+        lignes = [None] * n
+        for classe in classes:
+            ids = [self.index[w] for w in classe]
+            ligne = ids if self.sparse else self.mask(classe)
+            for i in ids:
+                lignes[i] = ligne
+        if None in lignes:
+            raise ValueError(f"Les classes de {agent!r} ne couvrent pas tous les mondes")
+        if self.sparse:
+            # relation symétrique : prédécesseurs = successeurs
+            self.pred[agent] = lignes
+        else:
+            self.succ[agent] = lignes
+            self.pred.pop(agent, None)
+        self._degres.pop(agent, None)
+        self.labels.clear()
+
+    @property
+    def agents(self):
+        return list(self.pred if self.sparse else self.succ)
+
+    def _agent(self, agent):
+        if agent is None and None not in (self.pred if self.sparse else self.succ):
+            agents = self.agents
+            if len(agents) != 1:
+                raise KeyError(f"Agent à préciser parmi {agents}")
+            return agents[0]
+        return agent
+
+    def atom(self, name):
+        """
+        Mondes où la proposition est vraie (vide si elle n'est pas valuée).
+        """
+        return self.valuation.get(name, 0)
+
+    def contains(self, bits, world):
+        """
+        Vérifie si le monde (nom) appartient au vecteur de bits.
+        """
+        return bool(bits >> self.index[world] & 1)
+
+    def mask(self, worlds):
+        """
+        Vecteur de bits d'un ensemble de mondes (noms).
+        """
+        flags = bytearray(len(self.worlds))
+        for w in worlds:
+            flags[self.index[w]] = 1
+        return bits_from_flags(flags)
+
+    def worlds_of(self, bits):
+        """
+        Ensemble des noms de mondes d'un vecteur de bits.
+        """
+        return {self.worlds[i] for i in indices(bits)}
+
+    def to_flags(self, bits):
+        return flags_from_bits(bits, len(self.worlds))
+
+    def from_flags(self, flags):
+        return bits_from_flags(flags)
+
+    def predecessors(self, agent=None):
+        """
+        Listes de prédécesseurs de chaque monde pour la relation de l'agent.
+        """
+        agent = self._agent(agent)
+        if agent not in self.pred:
+            pred = [[] for _ in self.worlds]
+            for u, s in enumerate(self.succ[agent]):
+                for v in indices(s):
+                    pred[v].append(u)
+            self.pred[agent] = pred
+        return self.pred[agent]
+
+    def out_degrees(self, agent=None):
+        """
+        Nombre de successeurs de chaque monde pour la relation de l'agent.
+        """
+        agent = self._agent(agent)
+        if agent not in self._degres:
+            if self.sparse:
+                degres = [0] * len(self.worlds)
+                for pred in self.pred[agent]:
+                    for u in pred:
+                        degres[u] += 1
+            else:
+                degres = [bin(s).count("1") for s in self.succ[agent]]
+            self._degres[agent] = degres
+        return self._degres[agent]
+
+    def box(self, bits, agent=None):
+        # □φ vrai en w si tous les successeurs de w sont dans φ (vrai si aucun successeur)
+        manque = self.all & ~bits
+        if self.sparse:
+            return self.all & ~self.dia(manque, agent)
+        res = 0
+        for i, s in enumerate(self.succ[self._agent(agent)]):
+            if not s & manque:
+                res |= 1 << i
+        return res
+
+    def dia(self, bits, agent=None):
+        # ◇φ vrai en w si au moins un successeur de w est dans φ
+        if self.sparse:
+            flags = bytearray(len(self.worlds))
+            pred = self.pred[self._agent(agent)]
+            for v in indices(bits):
+                for u in pred[v]:
+                    flags[u] = 1
+            return bits_from_flags(flags)
+        res = 0
+        for i, s in enumerate(self.succ[self._agent(agent)]):
+            if s & bits:
+                res |= 1 << i
+        return res
+
+
+# --- Points fixes par listes de travail (communs aux deux représentations) ---
+# Chaque monde entre au plus une fois dans la liste et chaque arc est parcouru
+# au plus une fois : O(mondes + arcs).
+
+def reach(model, target, agents):
+    """
+    Mondes depuis lesquels un chemin d'au moins un pas, par l'union des relations
+    des agents, atteint target (plus petit point fixe de X = ◇_G(target ∨ X)).
+    """
+    cible = model.to_flags(target)
+    preds = [model.predecessors(a) for a in agents]
+    res = bytearray(len(cible))
+    pile = [v for v, b in enumerate(cible) if b]
+    while pile:
+        v = pile.pop()
+        for pred in preds:
+            for u in pred[v]:
+                if not res[u]:
+                    res[u] = 1
+                    pile.append(u)
+    return model.from_flags(res)
+
+
+def until(model, phi, psi, agent=None):
+    """
+    E[φ U ψ] : plus petit point fixe de X = ψ ∨ (φ ∧ EX X), par propagation arrière depuis ψ.
+    """
+    res = model.to_flags(psi)
+    chemin = model.to_flags(phi)
+    pred = model.predecessors(agent)
+    pile = [v for v, b in enumerate(res) if b]
+    while pile:
+        v = pile.pop()
+        for u in pred[v]:
+            if not res[u] and chemin[u]:
+                res[u] = 1
+                pile.append(u)
+    return model.from_flags(res)
+
+
+def globally(model, phi, agent=None):
+    """
+    EG φ : plus grand point fixe de X = φ ∧ (EX X ∨ sans successeur).
+    Chaque monde de φ compte ses successeurs encore dans X ; un monde dont le
+    compteur tombe à 0 (et qui a des successeurs) sort de X et prévient ses prédécesseurs.
+    """
+    dans = model.to_flags(phi)
+    pred = model.predecessors(agent)
+    degres = model.out_degrees(agent)
+    compte = [0] * len(dans)
+    for v, b in enumerate(dans):
+        if b:
+            for u in pred[v]:
+                compte[u] += 1
+    pile = [u for u, b in enumerate(dans) if b and degres[u] and not compte[u]]
+    for u in pile:
+        dans[u] = 0
+    while pile:
+        v = pile.pop()
+        for u in pred[v]:
+            if dans[u]:
+                compte[u] -= 1
+                if not compte[u]:
+                    dans[u] = 0
+                    pile.append(u)
+    return model.from_flags(dans)
+
+
+def _children(f):
+    if isinstance(f, Atom):
+        return ()
+    if isinstance(f, (Not, Box, Dia, Everyone, Common, EF, EG, AF, AG)):
+        return (f.sub,)
+    if isinstance(f, (And, Or, Implies, EU)):
+        return (f.left, f.right)
+    raise TypeError(f"Formule inconnue : {f!r}")
+
+
+def _apply(m, f, args):
+    """
+    Calcule l'ensemble des mondes de f à partir de ceux de ses sous-formules.
+    """
+    if isinstance(f, Atom):
+        return m.atom(f.name)
+    if isinstance(f, Not):
+        return m.all & ~args[0]
+    if isinstance(f, And):
+        return args[0] & args[1]
+    if isinstance(f, Or):
+        return args[0] | args[1]
+    if isinstance(f, Implies):
+        return (m.all & ~args[0]) | args[1]
+    if isinstance(f, Box):
+        return m.box(args[0], f.agent)
+    if isinstance(f, Dia):
+        return m.dia(args[0], f.agent)
+    if isinstance(f, Everyone):
+        res = m.all
+        for a in f.group:
+            res = res & m.box(args[0], a)
+        return res
+    if isinstance(f, Common):
+        return m.all & ~reach(m, m.all & ~args[0], f.group)
+    if isinstance(f, EU):
+        return until(m, args[0], args[1], f.agent)
+    if isinstance(f, EF):
+        return until(m, m.all, args[0], f.agent)
+    if isinstance(f, AG):
+        return m.all & ~until(m, m.all, m.all & ~args[0], f.agent)
+    if isinstance(f, EG):
+        return globally(m, args[0], f.agent)
+    return m.all & ~globally(m, m.all & ~args[0], f.agent)    # AF
+
+
+def label(model, formula, memo=None):
+    """
+    Étiquetage global : calcule, de bas en haut, le vecteur de bits des mondes qui
+    satisfont chaque sous-formule, une seule fois par sous-formule distincte.
+    Le mémo (par défaut celui du modèle) est partagé entre les formules : K_A(R)
+    n'est calculé qu'une fois même s'il apparaît dans plusieurs formules.
+    """
+    memo = model.labels if memo is None else memo
+    pile = [formula]
+    while pile:
+        f = pile[-1]
+        if f in memo:
+            pile.pop()
+            continue
+        fils = [g for g in _children(f) if g not in memo]
+        if fils:
+            pile.extend(fils)
+            continue
+        pile.pop()
+        memo[f] = _apply(model, f, [memo[g] for g in _children(f)])
+    return memo[formula]
+
+
+def check(model, formula, memo=None):
+    """
+    Model checking global : ensemble des mondes du modèle qui satisfont la formule.
+    """
+    return model.worlds_of(label(model, formula, memo))
+
+
+def holds(model, formula, world):
+    """
+    Vérifie si la formule est vraie dans le monde donné.
+    """
+    return model.contains(label(model, formula), world)
@@ -0,0 +1,180 @@
+import numpy as np
+
+
+class CSRKripkeModel:
+    """
+    Modèle de Kripke compact : les mondes sont des entiers 0..n-1 et la relation
+    d'accessibilité est stockée au format CSR (indptr, indices), comme une matrice
+    creuse n x n. Les ensembles de mondes sont des tableaux NumPy de booléens et
+    □/◇ sont des réductions vectorisées sur les arcs.
+
+    Même interface que kripke.KripkeModel : kripke.label / check / holds
+    fonctionnent avec les deux représentations. La relation passée au constructeur
+    est celle de l'agent None ; add_relation en ajoute d'autres (modèles multi-agents).
+    """
+
+    def __init__(self, nb_worlds, indptr, indices, valuation=None, names=None):
+        self.nb_worlds = nb_worlds
+        self.relations = {}     # agent -> (indptr, indices, rows)
+        self._pred = {}
+        self._set_relation(None, indptr, indices)
+        self.worlds = list(names) if names is not None else None
+        self.index = {w: i for i, w in enumerate(self.worlds)} if names is not None else None
+        self.all = np.ones(nb_worlds, dtype=bool)
+        self.none = np.zeros(nb_worlds, dtype=bool)
+        self.labels = {}
+        self.valuation = {p: self.mask(ws) for p, ws in (valuation or {}).items()}
+
+    # --- Chargement ---
+
+    @classmethod
+    def from_edges(cls, nb_worlds, sources, targets=None, valuation=None, names=None):
+        """
+        Construit le modèle à partir d'une liste d'arcs (u, v), ou de deux tableaux
+        sources / targets d'entiers.
+        """
+        indptr, indices = _csr(nb_worlds, sources, targets)
+        return cls(nb_worlds, indptr, indices, valuation, names)
+
+    def _set_relation(self, agent, indptr, indices):
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int32)
+        # monde source de chaque arc, pour les réductions par ligne
+        rows = np.repeat(np.arange(self.nb_worlds, dtype=np.int32), np.diff(indptr))
+        self.relations[agent] = (indptr, indices, rows)
+        self._pred.pop(agent, None)
+        if agent is None:
+            self.indptr, self.indices, self.rows = indptr, indices, rows
+
+    def add_relation(self, agent, sources, targets=None):
+        """
+        Ajoute (ou remplace) la relation d'un agent, donnée comme dans from_edges.
+        """
+        if self.index is not None and targets is None:
+            sources = [(self.index[u], self.index[v]) for u, v in sources]
+        self._set_relation(agent, *_csr(self.nb_worlds, sources, targets))
+        self.labels.clear()
+
+    @classmethod
+    def from_structures(cls, worlds, relation, valuation):
+        """
+        Construit le modèle à partir des structures des scénarios de main.py :
+        W_* (liste de mondes), R_* (liste de couples) et V_* (proposition -> mondes).
+        """
+        index = {w: i for i, w in enumerate(worlds)}
+        sources = np.fromiter((index[u] for u, _ in relation), dtype=np.int64, count=len(relation))
+        targets = np.fromiter((index[v] for _, v in relation), dtype=np.int32, count=len(relation))
+        return cls.from_edges(len(worlds), sources, targets, valuation, names=worlds)
+
+    # --- Ensembles de mondes ---
+
+    def _id(self, world):
+        return self.index[world] if self.index is not None else world
+
+    def mask(self, worlds):
+        """
+        Tableau de booléens d'un ensemble de mondes (noms, ou entiers sans noms).
+        """
+        if isinstance(worlds, np.ndarray) and worlds.dtype == bool:
+            return worlds
+        res = np.zeros(self.nb_worlds, dtype=bool)
+        ids = [self._id(w) for w in worlds]
+        if ids:
+            res[np.asarray(ids, dtype=np.int64)] = True
+        return res
+
+    def worlds_of(self, bits):
+        """
+        Ensemble des mondes d'un tableau de booléens.
+        """
+        ids = np.flatnonzero(bits)
+        if self.worlds is None:
+            return set(ids.tolist())
+        return {self.worlds[i] for i in ids}
+
+    def atom(self, name):
+        return self.valuation.get(name, self.none)
+
+    def contains(self, bits, world):
+        return bool(bits[self._id(world)])
+
+    def to_flags(self, bits):
+        return bytearray(bits.astype(np.uint8).tobytes())
+
+    def from_flags(self, flags):
+        return np.frombuffer(flags, dtype=np.uint8).astype(bool)
+
+    # --- Relations ---
+
+    @property
+    def agents(self):
+        return list(self.relations)
+
+    def _relation(self, agent):
+        if agent not in self.relations and agent is None and len(self.relations) == 1:
+            agent = next(iter(self.relations))
+        return agent, self.relations[agent]
+
+    def predecessors(self, agent=None):
+        """
+        Prédécesseurs de chaque monde (CSR transposé), pour les points fixes de kripke.py.
+        """
+        agent, (_, indices, rows) = self._relation(agent)
+        if agent not in self._pred:
+            ordre = np.argsort(indices, kind="stable")
+            ptr = np.zeros(self.nb_worlds + 1, dtype=np.int64)
+            np.cumsum(np.bincount(indices, minlength=self.nb_worlds), out=ptr[1:])
+            self._pred[agent] = _Adjacence(ptr.tolist(), rows[ordre].tolist())
+        return self._pred[agent]
+
+    def out_degrees(self, agent=None):
+        _, (indptr, _, _) = self._relation(agent)
+        return np.diff(indptr).tolist()
+
+    def successors(self, world, agent=None):
+        _, (indptr, indices, _) = self._relation(agent)
+        i = self._id(world)
+        return indices[indptr[i]:indptr[i + 1]]
+
+    # --- Opérateurs modaux ---
+
+    def dia(self, bits, agent=None):
+        # ◇φ : mondes ayant au moins un arc vers φ
+        _, (_, indices, rows) = self._relation(agent)
+        return np.bincount(rows[bits[indices]], minlength=self.nb_worlds) > 0
+
+    def box(self, bits, agent=None):
+        # □φ = ¬◇¬φ (vrai si aucun successeur)
+        return ~self.dia(~bits, agent)
+
+
+class _Adjacence:
+    """
+    Listes d'adjacence à plat : adj[v] est la tranche des voisins de v.
+    """
+
+    def __init__(self, ptr, voisins):
+        self.ptr = ptr
+        self.voisins = voisins
+
+    def __getitem__(self, v):
+        return self.voisins[self.ptr[v]:self.ptr[v + 1]]
+
+    def __len__(self):
+        return len(self.ptr) - 1
+
+
+def _csr(nb_worlds, sources, targets=None):
+    """
+    (indptr, indices) d'une relation donnée par une liste d'arcs ou deux tableaux.
+    """
+    if targets is None:
+        aretes = np.asarray(sources if isinstance(sources, np.ndarray) else list(sources),
+                            dtype=np.int64).reshape(-1, 2)
+        sources, targets = aretes[:, 0], aretes[:, 1]
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int32)
+    ordre = np.argsort(sources, kind="stable")
+    indptr = np.zeros(nb_worlds + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=nb_worlds), out=indptr[1:])
+    return indptr, targets[ordre]
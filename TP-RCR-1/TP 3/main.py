@@ -1,41 +1,18 @@
-import networkx as nx
-from sympy import symbols, Not, Or, Implies, Equivalent
+from kripke import KripkeModel, Atom, Box, Dia, EX, EF, AX, AG, label
+from frames import check_frame, logics
 
 # --- Kripke Model Core Logic ---
-# These functions are general and will be used across all scenarios.
+# Formulas are trees (kripke.Atom, ~, &, |, >>, Box, Dia) labelled bottom-up
+# with bitsets: each distinct subformula is evaluated once for every world of
+# the model, then read back in the chosen world.
 
-# Define modal functions
-def box(formula, world, graph):
+def evaluate(model, formulas):
     """
-    Evaluates □formule (opérateur de nécessité) dans le monde 'world' donné
-    basé sur le 'graph' fourni (cadre de Kripke).
-    □formule est vraie dans 'world' si 'formule' est vraie dans tous les mondes accessibles depuis 'world'.
+    Évalue chaque formule sur tout le modèle ; retourne, pour chaque formule,
+    une fonction monde -> booléen.
     """
-    # Get all worlds accessible from the current 'world'
-    accessible_worlds = list(graph.successors(world))
-    
-    # If there are no accessible worlds, □formula is vacuously true.
-    if not accessible_worlds:
-        return True
-    
-    # Check if the formula holds for all successors of the current world
-    return all(formula(w_prime) for w_prime in accessible_worlds)
-
-def dia(formula, world, graph):
-    """
-    Evaluates ◇formule (opérateur de possibilité) dans le monde 'world' donné
-    basé sur le 'graph' fourni (cadre de Kripke).
-    ◇formule est vraie dans 'world' si 'formule' est vraie dans au moins un monde accessible depuis 'world'.
-    """
-    # Get all worlds accessible from the current 'world'
-    accessible_worlds = list(graph.successors(world))
-
-    # If there are no accessible worlds, ◇formula is vacuously false.
-    if not accessible_worlds:
-        return False
-
-    # Check if the formula holds for any successor of the current world
-    return any(formula(w_prime) for w_prime in accessible_worlds)
+    labels = [label(model, f) for f in formulas]
+    return [lambda world, bits=bits: model.contains(bits, world) for bits in labels]
 
 # --- Scenario 1: Epistemic Logic (Knowledge) ---
 def scenario_knowledge():
@@ -70,28 +47,23 @@ def scenario_knowledge():
         "S": {"ss", "sr"}
     }
 
-    # Create Kripke frame for this scenario
-    G_k = nx.DiGraph()
-    G_k.add_nodes_from(W_k)
-    G_k.add_edges_from(R_k)
+    # Create Kripke model for this scenario
+    M_k = KripkeModel(W_k, R_k, V_k)
 
-    # Propositional variables for this scenario
-    R_prop, S_prop = symbols('R S')
+    # K_A only behaves as knowledge (S5) if R_k is an equivalence relation
+    check_frame(M_k, "S5")
+    print(f"Cadre de R_k : {', '.join(logics(M_k))}")
 
-    def valuation_k(world):
-        """Returns valuation for knowledge scenario."""
-        return {
-            R_prop: world in V_k['R'],
-            S_prop: world in V_k['S']
-        }
+    # Propositional variables for this scenario
+    R_prop, S_prop = Atom('R'), Atom('S')
 
     # Epistemic operator: K_A (Alice knows) is represented by Box
     # K_A(phi) means "Alice knows that phi"
-    K_A = lambda formula, world: box(formula, world, G_k)
+    K_A = Box
 
     # Belief operator: P_A (Alice believes) is represented by Dia
     # P_A(phi) means "Alice believes that phi"
-    P_A = lambda formula, world: dia(formula, world, G_k)
+    P_A = Dia
 
     # Formulas to evaluate
     # 1. K_A(R_prop): Alice knows it's raining.
@@ -107,6 +79,16 @@ def scenario_knowledge():
     print("4. R → K_A(R) : S'il pleut, Alice sait qu'il pleut (Factivité).")
     print("5. P_A(R) → K_A(R) : Si Alice croit qu'il pleut, elle sait qu'il pleut.")
 
+    is_R, is_S, formula1, formula2, formula3, formula4, formula5 = evaluate(M_k, [
+        R_prop,
+        S_prop,
+        K_A(R_prop),
+        K_A(S_prop),
+        K_A(R_prop) | K_A(S_prop),
+        R_prop >> K_A(R_prop),
+        P_A(R_prop) >> K_A(R_prop),
+    ])
+
     while True:
         world_choice = input(f"\nEntrez un monde parmi {W_k} à évaluer (ou 'back' pour revenir au menu principal) : ").strip().lower()
         if world_choice == 'back':
@@ -115,30 +97,24 @@ def scenario_knowledge():
             print("Monde invalide. Veuillez choisir dans la liste.")
             continue
 
-        val = valuation_k(world_choice)
         print(f"\n--- Évaluation dans le Monde : {world_choice} ---")
-        print(f"  Est-ce qu'il pleut ? (R): {R_prop.subs(val)}")
-        print(f"  Est-ce qu'il fait beau ? (S): {S_prop.subs(val)}")
+        print(f"  Est-ce qu'il pleut ? (R): {is_R(world_choice)}")
+        print(f"  Est-ce qu'il fait beau ? (S): {is_S(world_choice)}")
 
         # Formula 1: K_A(R)
-        formula1_result = K_A(lambda x: R_prop.subs(valuation_k(x)), world_choice)
-        print(f"  Alice sait qu'il pleut (K_A(R)): {formula1_result}")
+        print(f"  Alice sait qu'il pleut (K_A(R)): {formula1(world_choice)}")
 
         # Formula 2: K_A(S)
-        formula2_result = K_A(lambda x: S_prop.subs(valuation_k(x)), world_choice)
-        print(f"  Alice sait qu'il fait beau (K_A(S)): {formula2_result}")
+        print(f"  Alice sait qu'il fait beau (K_A(S)): {formula2(world_choice)}")
 
         # Formula 3: K_A(R) OR K_A(S)
-        formula3_result = Or(formula1_result, formula2_result)
-        print(f"  Alice sait s'il pleut ou s'il fait beau (K_A(R) ∨ K_A(S)): {formula3_result}")
+        print(f"  Alice sait s'il pleut ou s'il fait beau (K_A(R) ∨ K_A(S)): {formula3(world_choice)}")
 
         # Formula 4: R_prop IMPLIES K_A(R_prop)
-        formula4_result = Implies(R_prop.subs(val), K_A(lambda x: R_prop.subs(valuation_k(x)), world_choice))
-        print(f"  S'il pleut, Alice sait qu'il pleut (R → K_A(R)): {formula4_result}")
+        print(f"  S'il pleut, Alice sait qu'il pleut (R → K_A(R)): {formula4(world_choice)}")
 
         # Formula 5: P_A(R_prop) IMPLIES K_A(R_prop)
-        formula5_result = Implies(P_A(lambda x: R_prop.subs(valuation_k(x)), world_choice), K_A(lambda x: R_prop.subs(valuation_k(x)), world_choice))
-        print(f"  Si Alice croit qu'il pleut, elle sait qu'il pleut (P_A(R) → K_A(R)): {formula5_result}")
+        print(f"  Si Alice croit qu'il pleut, elle sait qu'il pleut (P_A(R) → K_A(R)): {formula5(world_choice)}")
 
 # --- Scenario 2: Temporal Logic (Future Possibilities) ---
 def scenario_time():
@@ -175,28 +151,18 @@ def scenario_time():
         "Fail": {"t4"}
     }
 
-    # Create Kripke frame for this scenario
-    G_t = nx.DiGraph()
-    G_t.add_nodes_from(W_t)
-    G_t.add_edges_from(R_t)
+    # Create Kripke model for this scenario
+    M_t = KripkeModel(W_t, R_t, V_t)
 
     # Propositional variables for this scenario
-    Study, Exam, Pass, Fail = symbols('Study Exam Pass Fail')
-
-    def valuation_t(world):
-        """Returns valuation for temporal scenario."""
-        return {
-            Study: world in V_t['Study'],
-            Exam: world in V_t['Exam'],
-            Pass: world in V_t['Pass'],
-            Fail: world in V_t['Fail']
-        }
+    Study, Exam, Pass, Fail = Atom('Study'), Atom('Exam'), Atom('Pass'), Atom('Fail')
 
     # Temporal operators:
-    # F(phi) (Eventually phi) is represented by Dia
-    # G(phi) (Always in the future phi) is represented by Box
-    F = lambda formula, world: dia(formula, world, G_t)
-    G_op = lambda formula, world: box(formula, world, G_t)
+    # R_t only links consecutive steps, so the future is its transitive closure:
+    # F(phi) (Eventually phi) = EX EF phi: phi holds at some later step
+    # G(phi) (Always in the future phi) = AX AG phi: phi holds at every later step
+    F = lambda formula: EX(EF(formula))
+    G_op = lambda formula: AX(AG(formula))
 
     # Formulas to evaluate
     # 1. F(Pass): Eventually, I will pass the exam.
@@ -210,6 +176,17 @@ def scenario_time():
     print("3. Study → F(Pass) : Si j'étudie, je réussirai finalement.")
     print("4. F(Pass) ∧ F(Fail) : De t2, il est possible que je réussisse ET possible que j'échoue.")
 
+    is_Study, is_Exam, is_Pass, is_Fail, formula1, formula2, formula3, formula4 = evaluate(M_t, [
+        Study,
+        Exam,
+        Pass,
+        Fail,
+        F(Pass),
+        G_op(Study),
+        Study >> F(Pass),
+        F(Pass) & F(Fail),
+    ])
+
     while True:
         world_choice = input(f"\nEntrez un monde parmi {W_t} à évaluer (ou 'back' pour revenir au menu principal) : ").strip().lower()
         if world_choice == 'back':
@@ -218,29 +195,24 @@ def scenario_time():
             print("Monde invalide. Veuillez choisir dans la liste.")
             continue
 
-        val = valuation_t(world_choice)
         print(f"\n--- Évaluation dans le Monde : {world_choice} ---")
-        print(f"  Étudié ? (Study): {Study.subs(val)}")
-        print(f"  Examen passé ? (Exam): {Exam.subs(val)}")
-        print(f"  Réussi ? (Pass): {Pass.subs(val)}")
-        print(f"  Échoué ? (Fail): {Fail.subs(val)}")
+        print(f"  Étudié ? (Study): {is_Study(world_choice)}")
+        print(f"  Examen passé ? (Exam): {is_Exam(world_choice)}")
+        print(f"  Réussi ? (Pass): {is_Pass(world_choice)}")
+        print(f"  Échoué ? (Fail): {is_Fail(world_choice)}")
 
         # Formula 1: F(Pass)
-        formula1_result = F(lambda x: Pass.subs(valuation_t(x)), world_choice)
-        print(f"  Finalement, je réussirai l'examen (F(Pass)): {formula1_result}")
+        print(f"  Finalement, je réussirai l'examen (F(Pass)): {formula1(world_choice)}")
 
         # Formula 2: G(Study)
-        formula2_result = G_op(lambda x: Study.subs(valuation_t(x)), world_choice)
-        print(f"  J'étudierai toujours (G(Study)): {formula2_result}")
+        print(f"  J'étudierai toujours (G(Study)): {formula2(world_choice)}")
 
         # Formula 3: Study → F(Pass)
-        formula3_result = Implies(Study.subs(val), F(lambda x: Pass.subs(valuation_t(x)), world_choice))
-        print(f"  Si j'étudie, je réussirai finalement (Study → F(Pass)): {formula3_result}")
+        print(f"  Si j'étudie, je réussirai finalement (Study → F(Pass)): {formula3(world_choice)}")
 
         # Formula 4: F(Pass) AND F(Fail) (specifically from t2)
         if world_choice == "t2":
-            formula4_result = Or(F(lambda x: Pass.subs(valuation_t(x)), world_choice), F(lambda x: Fail.subs(valuation_t(x)), world_choice))
-            print(f"  De t2 : Possible de Réussir ∧ Possible d'Échouer (F(Pass) ∧ F(Fail)): {formula4_result}")
+            print(f"  De t2 : Possible de Réussir ∧ Possible d'Échouer (F(Pass) ∧ F(Fail)): {formula4(world_choice)}")
         else:
             print(f"  La formule F(Pass) ∧ F(Fail) est la plus pertinente depuis le monde t2.")
 
@@ -277,28 +249,19 @@ def scenario_obligation():
         "NoLitter": {"w_ideal", "w_tax_not_paid"}
     }
 
-    # Create Kripke frame for this scenario
-    G_o = nx.DiGraph()
-    G_o.add_nodes_from(W_o)
-    G_o.add_edges_from(R_o)
+    # Create Kripke model for this scenario
+    M_o = KripkeModel(W_o, R_o, V_o)
 
     # Propositional variables for this scenario
-    PayTax, NoLitter = symbols('PayTax NoLitter')
-
-    def valuation_o(world):
-        """Returns valuation for obligation scenario."""
-        return {
-            PayTax: world in V_o['PayTax'],
-            NoLitter: world in V_o['NoLitter']
-        }
+    PayTax, NoLitter = Atom('PayTax'), Atom('NoLitter')
 
     # Deontic operators:
     # O(phi) (Obligatory phi) is represented by Box
     # P(phi) (Permissible phi) is represented by Dia
     # F(phi) (Forbidden phi) is represented by O(Not(phi)) or Not(P(phi))
-    O = lambda formula, world: box(formula, world, G_o)
-    P = lambda formula, world: dia(formula, world, G_o)
-    F = lambda formula, world: O(lambda x: Not(formula(x)), world) # Forbidden is Obligatory Not
+    O = Box
+    P = Dia
+    F = lambda formula: O(~formula) # Forbidden is Obligatory Not
 
     # Formulas to evaluate
     # 1. O(PayTax): It is obligatory to pay taxes.
@@ -312,6 +275,15 @@ def scenario_obligation():
     print("3. F(PayTax) : Il est interdit de payer les impôts. (Ceci devrait être Faux)")
     print("4. O(PayTax ∧ NoLitter) : Il est obligatoire de payer les impôts ET de ne pas jeter de déchets.")
 
+    is_PayTax, is_NoLitter, formula1, formula2, formula3, formula4 = evaluate(M_o, [
+        PayTax,
+        NoLitter,
+        O(PayTax),
+        P(NoLitter),
+        F(PayTax),
+        O(PayTax & NoLitter),
+    ])
+
     while True:
         world_choice = input(f"\nEntrez un monde parmi {W_o} à évaluer (ou 'back' pour revenir au menu principal) : ").strip().lower()
         if world_choice == 'back':
@@ -320,26 +292,21 @@ def scenario_obligation():
             print("Monde invalide. Veuillez choisir dans la liste.")
             continue
 
-        val = valuation_o(world_choice)
         print(f"\n--- Évaluation dans le Monde : {world_choice} ---")
-        print(f"  Impôts payés ? (PayTax): {PayTax.subs(val)}")
-        print(f"  Pas de déchets ? (NoLitter): {NoLitter.subs(val)}")
+        print(f"  Impôts payés ? (PayTax): {is_PayTax(world_choice)}")
+        print(f"  Pas de déchets ? (NoLitter): {is_NoLitter(world_choice)}")
 
         # Formula 1: O(PayTax)
-        formula1_result = O(lambda x: PayTax.subs(valuation_o(x)), world_choice)
-        print(f"  Il est obligatoire de payer les impôts (O(PayTax)): {formula1_result}")
+        print(f"  Il est obligatoire de payer les impôts (O(PayTax)): {formula1(world_choice)}")
 
         # Formula 2: P(NoLitter)
-        formula2_result = P(lambda x: NoLitter.subs(valuation_o(x)), world_choice)
-        print(f"  Il est permis de ne pas jeter de déchets (P(NoLitter)): {formula2_result}")
+        print(f"  Il est permis de ne pas jeter de déchets (P(NoLitter)): {formula2(world_choice)}")
 
         # Formula 3: F(PayTax)
-        formula3_result = F(lambda x: PayTax.subs(valuation_o(x)), world_choice)
-        print(f"  Il est interdit de payer les impôts (F(PayTax)): {formula3_result}")
+        print(f"  Il est interdit de payer les impôts (F(PayTax)): {formula3(world_choice)}")
 
         # Formula 4: O(PayTax AND NoLitter)
-        formula4_result = O(lambda x: And(PayTax.subs(valuation_o(x)), NoLitter.subs(valuation_o(x))), world_choice)
-        print(f"  Il est obligatoire de payer les impôts ET de ne pas jeter de déchets (O(PayTax ∧ NoLitter)): {formula4_result}")
+        print(f"  Il est obligatoire de payer les impôts ET de ne pas jeter de déchets (O(PayTax ∧ NoLitter)): {formula4(world_choice)}")
 
 
 # --- Main Menu and Project Execution ---
@@ -372,6 +339,4 @@ def main_menu():
             print("Choix invalide. Veuillez entrer un nombre entre 1 et 4.")
 
 if __name__ == "__main__":
-    # Ensure And is imported for scenario_obligation
-    from sympy import And
     main_menu()
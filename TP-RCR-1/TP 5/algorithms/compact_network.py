@@ -0,0 +1,399 @@
+import json
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+# En-tête de l'instantané binaire : magic, mtime (ns) et taille du JSON source,
+# nb noeuds, nb arcs, avec coordonnées, taille de l'en-tête JSON (relations)
+_ENTETE = struct.Struct("<8sqqqqiq")
+_MAGIC = b"RESEAU02"
+CACHE_DIR = ".reseau_cache"
+
+
+# --- Lecture en flux du JSON ---
+
+def iter_network(fichier, taille_bloc=1 << 20):
+    """
+    Parcourt un fichier {"nodes": [...], "edges": [...]} sans le charger en entier :
+    produit des couples ("nodes" ou "edges", objet), dans l'ordre du fichier.
+    Les autres clés de premier niveau sont lues et ignorées.
+    """
+    decodeur = json.JSONDecoder()
+    with open(fichier, encoding="utf-8") as f:
+        tampon, pos, fin_fichier = "", 0, False
+
+        def remplir():
+            nonlocal tampon, pos, fin_fichier
+            bloc = f.read(taille_bloc)
+            fin_fichier = not bloc
+            tampon, pos = tampon[pos:] + bloc, 0
+            return bool(bloc)
+
+        def caractere():
+            # prochain caractère significatif (espaces sautés), sans le consommer
+            nonlocal pos
+            while True:
+                while pos < len(tampon) and tampon[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(tampon):
+                    return tampon[pos]
+                if not remplir():
+                    raise ValueError(f"{fichier} : fin de fichier inattendue")
+
+        def valeur():
+            # une valeur JSON complète ; si elle touche la fin du tampon, elle a pu être coupée
+            nonlocal pos
+            caractere()
+            while True:
+                try:
+                    objet, fin = decodeur.raw_decode(tampon, pos)
+                    if fin < len(tampon) or fin_fichier:
+                        pos = fin
+                        return objet
+                except json.JSONDecodeError:
+                    if fin_fichier:
+                        raise
+                remplir()
+
+        def attendre(c):
+            nonlocal pos
+            if caractere() != c:
+                raise ValueError(f"{fichier} : '{c}' attendu, '{tampon[pos]}' trouvé")
+            pos += 1
+
+        attendre("{")
+        if caractere() == "}":
+            return
+        while True:
+            cle = valeur()
+            attendre(":")
+            if cle in ("nodes", "edges") and caractere() == "[":
+                pos += 1
+                if caractere() == "]":
+                    pos += 1
+                else:
+                    while True:
+                        yield cle, valeur()
+                        if caractere() == "]":
+                            pos += 1
+                            break
+                        attendre(",")
+            else:
+                valeur()
+            if caractere() == "}":
+                return
+            attendre(",")
+
+
+# --- Réseau compact ---
+
+class CompactNetwork:
+    """
+    Réseau sémantique en lecture seule pour les grandes bases, avec la même
+    interface de parcours que SemanticNetwork (les algorithmes acceptent les deux) :
+    - les UUID des noeuds sont remplacés par des entiers 0..n-1 (les ids exposés),
+    - les relations sont numérotées,
+    - les arcs sont rangés au format CSR, triés par (noeud, relation) dans les deux
+      sens : destinations (sources), numéros de relation et drapeaux d'exception
+      dans des tableaux compacts, plus le numéro de l'arc dans le JSON pour les arcs
+      sortants, environ 18 octets par arc,
+    - les identifiants d'arcs et les coordonnées x/y sont abandonnés (sauf layout=True).
+    À relation égale, les arcs d'un noeud restent dans l'ordre du JSON ; les parcours
+    qui mélangent les relations (out_edges, iter_edges) et les listes de noeuds
+    (labels, labels_of) suivent l'ordre du JSON, comme SemanticNetwork.
+    """
+
+    def __init__(self):
+        self.labels_ = []       # noeud -> label
+        self.uuids = []         # noeud -> id d'origine
+        self.declare = bytearray()  # 1 si le noeud figure dans "nodes" (0 : vu seulement dans un arc)
+        self.rang = array("q")  # noeud -> position dans "nodes" (-1 : vu seulement dans un arc)
+        self.relations = []
+        self._ids = None
+        self.xs = self.ys = None
+        self.blocages = {}
+        self.version = 0
+        self.observers = []     # jamais prévenus : le réseau ne change pas
+
+    # --- Construction ---
+
+    @classmethod
+    def from_stream(cls, elements, layout=False):
+        """
+        Construit le réseau à partir de couples ("nodes" | "edges", objet) (voir iter_network).
+        """
+        reseau = cls()
+        numero = {}
+        num_relation = {}
+        if layout:
+            reseau.xs, reseau.ys = array("d"), array("d")
+        sources, cibles, rels, exc = array("i"), array("i"), array("H"), bytearray()
+
+        def interner(uuid):
+            i = numero.get(uuid)
+            if i is None:
+                i = numero[uuid] = len(reseau.uuids)
+                reseau.uuids.append(uuid)
+                reseau.labels_.append("")
+                reseau.declare.append(0)
+                reseau.rang.append(-1)
+                if layout:
+                    reseau.xs.append(0.0)
+                    reseau.ys.append(0.0)
+            return i
+
+        nb_declares = 0
+        for cle, objet in elements:
+            if cle == "nodes":
+                i = interner(objet["id"])
+                nb_declares += 1
+                if not reseau.declare[i]:
+                    reseau.declare[i] = 1
+                    reseau.rang[i] = nb_declares - 1
+                    reseau.labels_[i] = objet["label"]
+                    if layout:
+                        reseau.xs[i], reseau.ys[i] = objet.get("x", 0.0), objet.get("y", 0.0)
+            else:
+                r = num_relation.get(objet["label"])
+                if r is None:
+                    r = num_relation[objet["label"]] = len(reseau.relations)
+                    reseau.relations.append(objet["label"])
+                sources.append(interner(objet["from"]))
+                cibles.append(interner(objet["to"]))
+                rels.append(r)
+                exc.append(objet.get("edge_type") == "exception")
+        reseau._indexer(sources, cibles, rels, exc)
+        return reseau
+
+    def _indexer(self, sources, cibles, rels, exc):
+        n, m = len(self.uuids), len(sources)
+        self.n, self.m = n, m
+        self.nodes = range(n)
+        self._num_relation = {r: i for i, r in enumerate(self.relations)}
+        # tri stable par relation, puis par noeud : ordre (noeud, relation, JSON)
+        par_relation = _tri_comptage(rels, range(m), len(self.relations))
+        self.fwd_ptr, ordre = _csr(sources, par_relation, n)
+        self.fwd_dst = array("i", (cibles[k] for k in ordre))
+        self.fwd_rel = array("H", (rels[k] for k in ordre))
+        self.fwd_exc = bytearray(exc[k] for k in ordre)
+        self.fwd_seq = array("i", ordre)
+        self.bwd_ptr, ordre = _csr(cibles, par_relation, n)
+        self.bwd_src = array("i", (sources[k] for k in ordre))
+        self.bwd_rel = array("H", (rels[k] for k in ordre))
+        self.bwd_exc = bytearray(exc[k] for k in ordre)
+        self._blocages()
+
+    def _blocages(self):
+        self.blocages = {}
+        for k in (k for k, e in enumerate(self.fwd_exc) if e):
+            u = bisect_right(self.fwd_ptr, k) - 1
+            self.blocages.setdefault(u, set()).add((self.relations[self.fwd_rel[k]], self.fwd_dst[k]))
+
+    @classmethod
+    def load(cls, fichier, layout=False, cache=True):
+        """
+        Charge un réseau JSON en flux. Avec cache=True, un instantané binaire est
+        écrit à côté du fichier (dossier .reseau_cache) et relu tel quel aux
+        chargements suivants, tant que le JSON n'a pas changé (date, taille).
+        """
+        st = os.stat(fichier)
+        chemin = _chemin_cache(fichier)
+        if cache:
+            reseau = cls.read_snapshot(chemin, st, layout)
+            if reseau is not None:
+                return reseau
+        reseau = cls.from_stream(iter_network(fichier), layout)
+        if cache:
+            reseau.write_snapshot(chemin, st)
+        return reseau
+
+    # --- Instantané binaire ---
+
+    def write_snapshot(self, chemin, st=None):
+        """
+        Écrit le réseau dans un fichier binaire : en-tête, relations (JSON), puis les
+        tableaux bruts et les chaînes (labels, UUID) séparées par des octets nuls.
+        """
+        entete = json.dumps(self.relations).encode()
+        chaines = [("\0".join(self.labels_)).encode(), ("\0".join(self.uuids)).encode()]
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+            temp = chemin + f".{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(_ENTETE.pack(_MAGIC, st.st_mtime_ns if st else 0, st.st_size if st else 0,
+                                     self.n, self.m, self.xs is not None, len(entete)))
+                f.write(entete)
+                for tableau in self._tableaux():
+                    f.write(struct.pack("<q", len(tableau)))
+                    f.write(tableau)
+                for chaine in chaines:
+                    f.write(struct.pack("<q", len(chaine)))
+                    f.write(chaine)
+            os.replace(temp, chemin)
+        except OSError:
+            pass  # l'instantané est facultatif
+
+    def _tableaux(self):
+        tableaux = [self.declare, self.rang, self.fwd_ptr, self.fwd_dst, self.fwd_rel, self.fwd_exc,
+                    self.fwd_seq, self.bwd_ptr, self.bwd_src, self.bwd_rel, self.bwd_exc]
+        if self.xs is not None:
+            tableaux += [self.xs, self.ys]
+        return [bytes(t) if isinstance(t, bytearray) else t.tobytes() for t in tableaux]
+
+    @classmethod
+    def read_snapshot(cls, chemin, st=None, layout=False):
+        """
+        Relit un instantané ; None s'il manque, est périmé (st donné) ou n'a pas
+        les coordonnées demandées.
+        """
+        try:
+            with open(chemin, "rb") as f:
+                donnees = f.read()
+        except OSError:
+            return None
+        try:
+            magic, mtime, taille, n, m, avec_layout, longueur = _ENTETE.unpack_from(donnees)
+        except struct.error:
+            return None
+        if magic != _MAGIC or (st is not None and (mtime != st.st_mtime_ns or taille != st.st_size)):
+            return None
+        if layout and not avec_layout:
+            return None
+
+        pos = _ENTETE.size
+
+        def bloc():
+            nonlocal pos
+            (longueur_bloc,) = struct.unpack_from("<q", donnees, pos)
+            pos += 8 + longueur_bloc
+            return donnees[pos - longueur_bloc:pos]
+
+        reseau = cls()
+        reseau.n, reseau.m = n, m
+        reseau.nodes = range(n)
+        reseau.relations = json.loads(donnees[pos:pos + longueur])
+        reseau._num_relation = {r: i for i, r in enumerate(reseau.relations)}
+        pos += longueur
+        reseau.declare = bytearray(bloc())
+        reseau.rang = array("q", bloc())
+        for nom, code in (("fwd_ptr", "q"), ("fwd_dst", "i"), ("fwd_rel", "H"), ("fwd_exc", None),
+                          ("fwd_seq", "i"), ("bwd_ptr", "q"), ("bwd_src", "i"), ("bwd_rel", "H"), ("bwd_exc", None)):
+            setattr(reseau, nom, bytearray(bloc()) if code is None else array(code, bloc()))
+        if avec_layout:
+            reseau.xs, reseau.ys = array("d", bloc()), array("d", bloc())
+        reseau.labels_ = bloc().decode().split("\0") if n else []
+        reseau.uuids = bloc().decode().split("\0") if n else []
+        reseau._blocages()
+        return reseau
+
+    # --- Noeuds ---
+
+    @property
+    def ids(self):
+        # label -> noeud (premier noeud portant ce label), construit à la première requête
+        if self._ids is None:
+            self._ids = {}
+            for i in self._declares():
+                self._ids.setdefault(self.labels_[i], i)
+        return self._ids
+
+    def _declares(self):
+        # noeuds figurant dans "nodes", dans l'ordre du JSON
+        return sorted((i for i in range(self.n) if self.declare[i]), key=self.rang.__getitem__)
+
+    def node(self, label):
+        i = self.ids[label]
+        return {"id": i, "label": label}
+
+    def labels(self):
+        return [self.labels_[i] for i in self._declares()]
+
+    def label(self, node_id):
+        return self.labels_[node_id] if 0 <= node_id < self.n and self.declare[node_id] else ""
+
+    def labels_of(self, node_ids):
+        return [self.labels_[i] for i in sorted((i for i in set(node_ids) if 0 <= i < self.n and self.declare[i]),
+                                                key=self.rang.__getitem__)]
+
+    # --- Arcs ---
+
+    def _segment(self, ptr, rels, node_id, relation):
+        r = self._num_relation.get(relation)
+        if r is None or not 0 <= node_id < self.n:
+            return 0, 0
+        debut, fin = ptr[node_id], ptr[node_id + 1]
+        return bisect_left(rels, r, debut, fin), bisect_right(rels, r, debut, fin)
+
+    def targets(self, node_id, relation, exceptions=True):
+        debut, fin = self._segment(self.fwd_ptr, self.fwd_rel, node_id, relation)
+        if exceptions:
+            return self.fwd_dst[debut:fin].tolist()
+        return [self.fwd_dst[k] for k in range(debut, fin) if not self.fwd_exc[k]]
+
+    def sources(self, node_id, relation, exceptions=True):
+        debut, fin = self._segment(self.bwd_ptr, self.bwd_rel, node_id, relation)
+        if exceptions:
+            return self.bwd_src[debut:fin].tolist()
+        return [self.bwd_src[k] for k in range(debut, fin) if not self.bwd_exc[k]]
+
+    def in_degree(self, node_id, relation, exceptions=True):
+        debut, fin = self._segment(self.bwd_ptr, self.bwd_rel, node_id, relation)
+        return fin - debut if exceptions else fin - debut - sum(self.bwd_exc[debut:fin])
+
+    def has_edge(self, from_id, to_id, relation, exceptions=True):
+        return to_id in self.targets(from_id, relation, exceptions)
+
+    def blocks(self, node_id, relation, to_id):
+        return (relation, to_id) in self.blocages.get(node_id, ())
+
+    def out_edges(self, node_id):
+        # le segment du noeud est trié par relation : on revient à l'ordre du JSON
+        debut, fin = self.fwd_ptr[node_id], self.fwd_ptr[node_id + 1]
+        return [(self.relations[self.fwd_rel[k]], self.fwd_dst[k])
+                for k in sorted(range(debut, fin), key=self.fwd_seq.__getitem__)]
+
+    def iter_edges(self):
+        """
+        Tous les arcs (from, to, relation, exception), dans l'ordre du JSON.
+        """
+        position = array("q", bytes(8 * self.m))
+        for k, seq in enumerate(self.fwd_seq):
+            position[seq] = k
+        for k in position:
+            u = bisect_right(self.fwd_ptr, k) - 1
+            yield u, self.fwd_dst[k], self.relations[self.fwd_rel[k]], bool(self.fwd_exc[k])
+
+
+def _tri_comptage(cles, ordre, nb_cles):
+    """
+    Tri stable par comptage des positions de ordre selon cles (entiers 0..nb_cles-1).
+    """
+    debuts = [0] * (nb_cles + 1)
+    for k in ordre:
+        debuts[cles[k] + 1] += 1
+    for c in range(nb_cles):
+        debuts[c + 1] += debuts[c]
+    res = array("q", bytes(8 * len(ordre)))
+    for k in ordre:
+        res[debuts[cles[k]]] = k
+        debuts[cles[k]] += 1
+    return res
+
+
+def _csr(noeuds, ordre, n):
+    """
+    Pointeurs CSR (array('q'), n + 1 entrées) et ordre des arcs trié de façon stable par noeud.
+    """
+    trie = _tri_comptage(noeuds, ordre, n)
+    ptr = array("q", bytes(8 * (n + 1)))
+    for k in ordre:
+        ptr[noeuds[k] + 1] += 1
+    for u in range(n):
+        ptr[u + 1] += ptr[u]
+    return ptr, trie
+
+
+def _chemin_cache(fichier):
+    dossier, nom = os.path.split(os.path.abspath(fichier))
+    return os.path.join(dossier, CACHE_DIR, nom + ".bin")
@@ -1,54 +1,71 @@
-def get_label(reseau_semantique, node, relation):
-    node_relation_edges = [edge["from"] for edge in reseau_semantique["edges"] if (edge["to"] == node["id"] and edge["label"] == relation)]
-    node_relation_edges_label = [node["label"] for node in reseau_semantique["nodes"] if node["id"] in node_relation_edges]
+from algorithms.semantic_network import SemanticNetwork
+from algorithms.propagation import repondre, labels_chemin
+
+
+def get_label(reseau, node, relation):
+    node_relation_edges_label = reseau.labels_of(reseau.sources(node["id"], relation))
     if node_relation_edges_label:
         reponse = "il y a un lien entre les 2 noeuds : " + ", ".join(node_relation_edges_label)
     else:
         reponse = "il n'y a pas de lien entre les 2 noeuds"
     return reponse
 
-def propagation_de_marqueurs(reseau_semantique, requetes):
-    nodes = reseau_semantique["nodes"]
-    edges = reseau_semantique["edges"]
-    solutions_found = []
+def propagation_de_marqueurs(reseau_semantique, requetes, chemins=False, index=None):
+    # Propagation sans emprunter les arcs d'exception
+    reseau = SemanticNetwork.of(reseau_semantique)
+    return repondre(reseau, requetes, get_label, exceptions=False, index=index, chemins=chemins)
 
-    for req in requetes:
-        node1, node2, relation = req
-        solution_found = False
+def heriter(reseau, depart, arrivee, relation):
+    """
+    Héritage défaisable : M1 relation M2 si un ancêtre A de M1 (M1 compris, arcs
+    "is a" hors exceptions) a l'arc relation vers M2 et si un chemin M1 is a ... is a A
+    ne traverse aucun noeud dont une exception bloque (relation, M2).
+    L'exception la plus spécifique l'emporte : elle coupe les chemins qui la
+    traversent (préemption sur le chemin), sans toucher aux autres sous-arbres.
+    Le test d'un noeud est une lecture de son ensemble de blocages précompilé.
+    Retourne le chemin (arcs (from, relation, to) en ids, de M1 vers A puis M2) ou None.
+    """
+    parents = {depart: None}
+    frontiere = [depart]
+    while frontiere:
+        suivante = []
+        for n in frontiere:
+            if reseau.blocks(n, relation, arrivee):
+                continue
+            if reseau.has_edge(n, arrivee, relation, exceptions=False):
+                noeuds = [n]
+                while parents[noeuds[-1]] is not None:
+                    noeuds.append(parents[noeuds[-1]])
+                noeuds.reverse()
+                return [(a, "is a", b) for a, b in zip(noeuds, noeuds[1:])] + [(n, relation, arrivee)]
+            for p in reseau.targets(n, "is a", exceptions=False):
+                if p not in parents:
+                    parents[p] = n
+                    suivante.append(p)
+        frontiere = suivante
+    return None
 
-        try:
-            M1 = [node for node in nodes if node["label"] == node1][0]
-            M2 = [node for node in nodes if node["label"] == node2][0]
+def heritage_defaisable(reseau_semantique, requetes, chemins=False):
+    """
+    Réponses aux requêtes (node1, node2, relation) en héritage défaisable (voir heriter).
+    """
+    reseau = SemanticNetwork.of(reseau_semantique)
+    solutions_found = []
+    paths = []
 
-            # Vérification directe de la relation recherchée (hors exception)
-            direct_relation = any(
-                edge for edge in edges
-                if edge["from"] == M1["id"] and edge["to"] == M2["id"] and edge["label"] == relation and edge.get("edge_type") != "exception"
-            )
-            if direct_relation:
-                solution_found = True
+    for node1, node2, relation in requetes:
+        path = None
+        try:
+            M1 = reseau.node(node1)
+            M2 = reseau.node(node2)
+            path = heriter(reseau, M1["id"], M2["id"], relation)
+            if path:
+                # noeud le plus spécifique dont le lien est hérité
+                solutions_found.append("il y a un lien entre les 2 noeuds : " + reseau.label(path[-1][0]))
             else:
-                propagation_edges = [
-                    edge for edge in edges
-                    if (edge["to"] == M1["id"] and edge["label"] == "is a" and edge.get("edge_type") != "exception")
-                ]
-                while propagation_edges and not solution_found:
-                    temp_edge = propagation_edges.pop()
-                    temp_node_contient_edges = [
-                        edge for edge in edges
-                        if (edge["from"] == temp_edge["from"] and edge["label"] == relation and edge.get("edge_type") != "exception")
-                    ]
-                    solution_found = any(d['to'] == M2["id"] for d in temp_node_contient_edges)
-                    if not solution_found:
-                        temp_node_is_a_edges = [
-                            edge for edge in edges
-                            if (edge["to"] == temp_edge["from"] and edge["label"] == "is a" and edge.get("edge_type") != "exception")
-                        ]
-                        propagation_edges.extend(temp_node_is_a_edges)
-
-            solutions_found.append(get_label(reseau_semantique, M2, relation) if solution_found else "il n'y a pas de lien entre les 2 noeuds")
-        except IndexError:
+                solutions_found.append("il n'y a pas de lien entre les 2 noeuds")
+        except KeyError:
             solutions_found.append("Aucune reponse n'est fournie par manque de connaissances.")
+        paths.append(labels_chemin(reseau, path) if path else None)
 
-    return solutions_found
-
+    return (solutions_found, paths) if chemins else solutions_found
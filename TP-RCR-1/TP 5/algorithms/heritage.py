@@ -1,34 +1,125 @@
-def get_label(reseau_semantique, node_id):
-    label = [node["label"] for node in reseau_semantique["nodes"] if node["id"] == node_id]
-    return " ,".join(label)
+from algorithms.semantic_network import SemanticNetwork
 
-def heritage(reseau_semantique, starting_node_name):
-    nodes = reseau_semantique["nodes"]
-    edges = reseau_semantique["edges"]
-    all_edges = []
-    properties = []
 
-    #get node where given name
-    node = [node for node in nodes if node["label"] == starting_node_name][0]
+class InheritanceEngine:
+    """
+    Héritage de propriétés le long des arcs "is-a", avec mémoïsation :
+    les propriétés héritées de chaque noeud sont calculées une fois à partir de
+    celles de ses parents, et partagées par tous ses descendants.
 
-    # get all inherited nodes IDs
-    direct_edges = [edge["to"] for edge in edges if (edge["from"] == node["id"] and edge["label"] == "is-a")]
+    Règle de surcharge : pour une même relation, le noeud le plus proche l'emporte
+    (ses propres arcs, puis le parent le plus proche ; à distance égale, le premier
+    parent dans l'ordre du JSON). Toute la hiérarchie se calcule donc en une passe.
 
-    while direct_edges:
-        n = direct_edges.pop()
-        
-        # get inherited nodes label
-        all_edges.append(get_label(reseau_semantique, n))
-        
-        # if the inherited are also inherited by other nodes
-        direct_edges.extend([edge["to"] for edge in edges if (edge["from"] == n and edge["label"] == "is-a")])
-            
-        properties_nodes = [edge for edge in edges if ((edge["from"] == n or edge["from"] == node["id"]) and edge["label"] != "is-a")]
+    Le moteur s'abonne aux modifications du réseau : quand un arc partant de u
+    change, les propriétés mémorisées de u et de ses descendants sont oubliées.
+    """
 
-        for pn in properties_nodes:
-            properties.append(": ".join([pn["label"], get_label(reseau_semantique, pn["to"])]))
+    def __init__(self, reseau_semantique, relation="is-a"):
+        self.reseau = SemanticNetwork.of(reseau_semantique)
+        self.relation = relation
+        self._cache = {}    # id -> {relation: (distance, noeud source, [ids cibles])}
+        self.reseau.observers.append(self._invalider)
 
-    return all_edges, properties
+    def _invalider(self, edge):
+        # Invariant : un noeud n'est mémorisé que si tous ses ancêtres le sont,
+        # on peut donc s'arrêter aux descendants déjà oubliés.
+        pile = [edge["from"]]
+        while pile:
+            n = pile.pop()
+            if self._cache.pop(n, None) is not None:
+                pile.extend(self.reseau.sources(n, self.relation))
+
+    def parents(self, node_id):
+        return self.reseau.targets(node_id, self.relation)
+
+    def properties(self, node_id):
+        """
+        Propriétés (héritées comprises) d'un noeud : relation -> (distance, source, cibles).
+        Parcours postfixe itératif : chaque noeud est calculé après ses parents.
+        """
+        if node_id in self._cache:
+            return self._cache[node_id]
+        en_cours = {node_id}
+        pile = [(node_id, iter(self.parents(node_id)))]
+        while pile:
+            n, reste = pile[-1]
+            p = next(reste, None)
+            if p is not None:
+                # un cycle "is-a" est coupé à l'arc qui le referme
+                if p not in self._cache and p not in en_cours:
+                    en_cours.add(p)
+                    pile.append((p, iter(self.parents(p))))
+                continue
+            pile.pop()
+            en_cours.discard(n)
+            self._cache[n] = self._calculer(n)
+        return self._cache[node_id]
+
+    def _calculer(self, n):
+        props = {}
+        for label, cible in self.reseau.out_edges(n):
+            if label != self.relation:
+                props.setdefault(label, (0, n, []))[2].append(cible)
+        for p in self.parents(n):
+            for label, (distance, source, cibles) in self._cache.get(p, {}).items():
+                if label not in props or props[label][0] > distance + 1:
+                    props[label] = (distance + 1, source, cibles)
+        return props
+
+    def ancestors(self, node_id):
+        """
+        Ancêtres d'un noeud sans doublons, du plus proche au plus lointain.
+        """
+        vus = {node_id}
+        res = []
+        frontiere = [node_id]
+        while frontiere:
+            suivante = []
+            for n in frontiere:
+                for p in self.parents(n):
+                    if p not in vus:
+                        vus.add(p)
+                        res.append(p)
+                        suivante.append(p)
+            frontiere = suivante
+        return res
+
+    def inherit_all(self):
+        """
+        Propriétés de tous les noeuds du réseau, en une passe sur la hiérarchie.
+        """
+        return {node_id: self.properties(node_id) for node_id in self.reseau.nodes}
 
 
+def engine(reseau):
+    """
+    Moteur d'héritage associé à un réseau (un seul par réseau, pour partager le cache).
+    Il est rangé sur le réseau lui-même et disparaît avec lui.
+    """
+    moteur = getattr(reseau, "moteur_heritage", None)
+    if moteur is None:
+        moteur = reseau.moteur_heritage = InheritanceEngine(reseau)
+    return moteur
 
+
+def heritage(reseau_semantique, starting_node_name):
+    # un réseau construit ici à partir du dictionnaire ne sert qu'une fois : pas de cache
+    if isinstance(reseau_semantique, dict):
+        moteur = InheritanceEngine(reseau_semantique)
+    else:
+        moteur = engine(reseau_semantique)
+    reseau = moteur.reseau
+
+    #get node where given name
+    node = reseau.node(starting_node_name)
+
+    # inherited nodes, nearest first
+    all_edges = [reseau.label(n) for n in moteur.ancestors(node["id"])]
+
+    # properties, nearest first; a nearer node overrides the same relation
+    proprietes = sorted(moteur.properties(node["id"]).items(), key=lambda item: item[1][0])
+    properties = [": ".join([label, reseau.label(cible)])
+                  for label, (_, _, cibles) in proprietes for cible in cibles]
+
+    return all_edges, properties
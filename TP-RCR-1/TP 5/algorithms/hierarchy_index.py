@@ -0,0 +1,183 @@
+from bisect import bisect_left, bisect_right
+
+from algorithms.semantic_network import SemanticNetwork
+
+
+class HierarchyIndex:
+    """
+    Index d'intervalles sur la hiérarchie "is a" : x est un sous-concept de y
+    (x is a ... is a y, ou x == y) si le numéro de x tombe dans un des intervalles de y.
+
+    Les composantes fortement connexes (cycles de "is a") sont numérotées en
+    ordre postfixe, puits d'abord (ordre de sortie de Tarjan) : les sous-concepts
+    d'un noeud ont des numéros inférieurs au sien, et pour un arbre chaque noeud
+    n'a qu'un intervalle. Un test coûte une recherche dichotomique.
+
+    L'index s'abonne aux modifications du réseau : quand un arc de la relation
+    est ajouté ou retiré, il est reconstruit à sa prochaine utilisation.
+    """
+
+    def __init__(self, reseau_semantique, relation="is a", exceptions=True):
+        self.reseau = SemanticNetwork.of(reseau_semantique)
+        self.relation = relation
+        self.exceptions = exceptions
+        self._construire()
+        self.reseau.observers.append(self._invalider)
+
+    def _invalider(self, edge):
+        if edge["label"] == self.relation:
+            self._perime = True
+
+    def _a_jour(self):
+        if self._perime:
+            self._construire()
+
+    def _construire(self):
+        reseau = self.reseau
+        relation = self.relation
+        self._perime = False
+
+        # noeuds numérotés densément, y compris ceux qui n'apparaissent que dans les arcs
+        self.numero = {}
+        for node_id in reseau.nodes:
+            self.numero.setdefault(node_id, len(self.numero))
+        enfants = [[] for _ in self.numero]
+        for source, cible, label, exception in reseau.iter_edges():
+            if label != relation or (exception and not self.exceptions):
+                continue
+            for node_id in (source, cible):
+                if node_id not in self.numero:
+                    self.numero[node_id] = len(self.numero)
+                    enfants.append([])
+            enfants[self.numero[cible]].append(self.numero[source])
+
+        # parcours depuis les racines d'abord : un sous-arbre reçoit des numéros contigus
+        a_un_parent = [False] * len(enfants)
+        for fils in enfants:
+            for v in fils:
+                a_un_parent[v] = True
+        racines = [u for u in range(len(enfants)) if not a_un_parent[u]]
+        self.composante, composantes = _tarjan(enfants, racines + list(range(len(enfants))))
+        self.intervalles = []
+        for c, membres in enumerate(composantes):
+            morceaux = [(c, c)]
+            for u in membres:
+                for v in enfants[u]:
+                    d = self.composante[v]
+                    if d != c:
+                        morceaux.extend(self.intervalles[d])
+            self.intervalles.append(_fusionner(morceaux))
+        self.debuts = [[debut for debut, _ in ivs] for ivs in self.intervalles]
+
+    def is_descendant(self, x, y):
+        """
+        True si x est y ou un sous-concept de y (ids de noeuds).
+        """
+        self._a_jour()
+        if x not in self.numero or y not in self.numero:
+            return x == y
+        cx, cy = self.composante[self.numero[x]], self.composante[self.numero[y]]
+        i = bisect_right(self.debuts[cy], cx) - 1
+        return i >= 0 and cx <= self.intervalles[cy][i][1]
+
+    def ranks(self, node_ids):
+        """
+        Numéros triés d'un ensemble de noeuds, pour witness : (numéros, ids).
+        """
+        self._a_jour()
+        paires = sorted((self.composante[self.numero[x]], x) for x in node_ids if x in self.numero)
+        return [c for c, _ in paires], [x for _, x in paires]
+
+    def witness(self, ranks, y):
+        """
+        Un noeud de ranks (voir ranks) sous-concept de y, ou None :
+        une recherche dichotomique par intervalle de y.
+        """
+        self._a_jour()
+        numeros, ids = ranks
+        for debut, fin in self.intervalles[self.composante[self.numero[y]]]:
+            i = bisect_left(numeros, debut)
+            if i < len(numeros) and numeros[i] <= fin:
+                return ids[i]
+        return None
+
+    def chain(self, reseau, x, y):
+        """
+        Chemin x is a ... is a y (liste d'ids) pour x sous-concept de y : parcours en
+        largeur vers le haut depuis x, limité aux noeuds qui sont sous-concepts de y.
+        """
+        parents = {x: None}
+        frontiere = [x]
+        while y not in parents:
+            suivante = []
+            for n in frontiere:
+                for p in reseau.targets(n, self.relation, self.exceptions):
+                    if p not in parents and self.is_descendant(p, y):
+                        parents[p] = n
+                        suivante.append(p)
+            frontiere = suivante
+        noeuds = [y]
+        while parents[noeuds[-1]] is not None:
+            noeuds.append(parents[noeuds[-1]])
+        return noeuds[::-1]
+
+
+def _fusionner(morceaux):
+    morceaux.sort()
+    res = [morceaux[0]]
+    for debut, fin in morceaux[1:]:
+        if debut <= res[-1][1] + 1:
+            if fin > res[-1][1]:
+                res[-1] = (res[-1][0], fin)
+        else:
+            res.append((debut, fin))
+    return res
+
+
+def _tarjan(succ, racines):
+    """
+    Composantes fortement connexes (Tarjan itératif), numérotées puits d'abord ;
+    les parcours partent des sommets de racines, dans l'ordre.
+    Retourne (composante de chaque sommet, liste des sommets de chaque composante).
+    """
+    n = len(succ)
+    numero = [-1] * n
+    bas = [0] * n
+    composante = [-1] * n
+    composantes = []
+    pile = []
+    compteur = 0
+    for racine in racines:
+        if numero[racine] != -1:
+            continue
+        appels = [(racine, 0)]
+        numero[racine] = bas[racine] = compteur
+        compteur += 1
+        pile.append(racine)
+        while appels:
+            u, i = appels[-1]
+            if i < len(succ[u]):
+                appels[-1] = (u, i + 1)
+                v = succ[u][i]
+                if numero[v] == -1:
+                    numero[v] = bas[v] = compteur
+                    compteur += 1
+                    pile.append(v)
+                    appels.append((v, 0))
+                elif composante[v] == -1:
+                    bas[u] = min(bas[u], numero[v])
+                continue
+            appels.pop()
+            if appels:
+                parent = appels[-1][0]
+                bas[parent] = min(bas[parent], bas[u])
+            if bas[u] == numero[u]:
+                membres = []
+                while True:
+                    v = pile.pop()
+                    composante[v] = len(composantes)
+                    membres.append(v)
+                    if v == u:
+                        break
+                composantes.append(membres)
+    return composante, composantes
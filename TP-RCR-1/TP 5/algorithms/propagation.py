@@ -1,45 +1,171 @@
-def get_label(reseau_semantique, node, relation):
+from algorithms.semantic_network import SemanticNetwork
 
-    node_relation_edges = [edge["from"] for edge in reseau_semantique["edges"] if (edge["to"] == node["id"] and edge["label"] == relation)]
-    
-    node_relation_edges_label = [node["label"] for node in reseau_semantique["nodes"] if node["id"] in node_relation_edges]
+
+def get_label(reseau, node, relation):
+    node_relation_edges_label = reseau.labels_of(reseau.sources(node["id"], relation))
     reponse = "il y a un lien entre les 2 noeuds : " + ", ".join(node_relation_edges_label)
     return reponse
 
-def propagation_de_marqueurs(reseau_semantique, requetes):
-    nodes = reseau_semantique["nodes"]
-    solutions_found = []
-
-    for req in requetes:
-        node1, node2, relation = req
-        solution_found = False
-
-        try:
-            M1 = [node for node in nodes if node["label"] == node1][0]
-            M2 = [node for node in nodes if node["label"] == node2][0]
-
-            edges = reseau_semantique["edges"]
-
-            # Vérification directe de la relation recherchée
-            direct_relation = any(edge for edge in edges if edge["from"] == M1["id"] and edge["to"] == M2["id"] and edge["label"] == relation)
-            if direct_relation:
-                solution_found = True
-            else:
-                propagation_edges = [edge for edge in edges if (edge["to"] == M1["id"] and edge["label"] == "is a")]
-
-                while len(propagation_edges) != 0 and not solution_found:
-                    temp_node = propagation_edges.pop()
-                    temp_node_contient_edges = [edge for edge in edges if (edge["from"] == temp_node["from"] and edge["label"] == relation)]
-                    solution_found = any(d['to'] == M2["id"] for d in temp_node_contient_edges)
-                    if not solution_found:
-                        temp_node_is_a_edges = [edge for edge in edges if (edge["to"] == temp_node["from"] and edge["label"] == "is a")]
-                        propagation_edges.extend(temp_node_is_a_edges)
-
-            solutions_found.append(get_label(reseau_semantique, M2, relation) if solution_found else "il n'y a pas de lien entre les 2 noeuds")
-        
-        except IndexError:
-            solutions_found.append("Aucune reponse n'est fournie par manque de connaissances.")
-    
-    return solutions_found
+def marquer(reseau, depart, arrivee, relation, exceptions=True):
+    """
+    Propagation de marqueurs bidirectionnelle : M1 est lié à M2 si un sous-concept X
+    de M1 (M1 lui-même, ou X is a ... is a M1) a un arc relation vers M2.
+    Le marqueur de M1 descend les arcs "is a", celui de M2 remonte les arcs "is a"
+    depuis les sources de relation vers M2 ; on étend à chaque pas la plus petite
+    frontière, jusqu'à ce que les marqueurs se rencontrent.
+    Les dictionnaires de parents servent de marques de visite (chaque noeud est
+    exploré au plus une fois, même si la hiérarchie a des cycles) et permettent de
+    reconstruire le chemin : liste d'arcs (from, relation, to) en ids, ou None.
+    """
+    haut = {depart: None}   # noeud marqué depuis M1 -> son parent vers M1
+    bas = {}                # noeud marqué depuis M2 -> son enfant vers la source X
+
+    def marque_m2(n):
+        return n in bas or reseau.has_edge(n, arrivee, relation, exceptions)
+
+    def chemin(m):
+        descente = [m]
+        while bas.get(descente[-1]) is not None:
+            descente.append(bas[descente[-1]])
+        noeuds = descente[::-1]
+        while haut[noeuds[-1]] is not None:
+            noeuds.append(haut[noeuds[-1]])
+        arcs = [(a, "is a", b) for a, b in zip(noeuds, noeuds[1:])]
+        return arcs + [(noeuds[0], relation, arrivee)]
+
+    if marque_m2(depart):
+        return chemin(depart)
+
+    frontiere_haut = [depart]
+    frontiere_bas = None    # sources de relation vers M2, construites à la première utilisation
+    taille_bas = reseau.in_degree(arrivee, relation, exceptions)
+    while frontiere_haut and (frontiere_bas is None or frontiere_bas):
+        suivante = []
+        if len(frontiere_haut) <= (taille_bas if frontiere_bas is None else len(frontiere_bas)):
+            for n in frontiere_haut:
+                for c in reseau.sources(n, "is a", exceptions):
+                    if c not in haut:
+                        haut[c] = n
+                        if marque_m2(c):
+                            return chemin(c)
+                        suivante.append(c)
+            frontiere_haut = suivante
+        else:
+            if frontiere_bas is None:
+                frontiere_bas = []
+                for x in reseau.sources(arrivee, relation, exceptions):
+                    if x not in bas:
+                        bas[x] = None
+                        frontiere_bas.append(x)
+            for n in frontiere_bas:
+                for p in reseau.targets(n, "is a", exceptions):
+                    if p not in bas:
+                        bas[p] = n
+                        if p in haut:
+                            return chemin(p)
+                        suivante.append(p)
+            frontiere_bas = suivante
+    return None
+
+def labels_chemin(reseau, chemin):
+    return [(reseau.label(a), relation, reseau.label(b)) for a, relation, b in chemin]
+
+def sous_concepts(reseau, depart, exceptions=True):
+    """
+    Fermeture "is a" descendante de depart : noeud -> parent vers depart
+    (depart -> None), dans l'ordre du parcours en largeur.
+    """
+    parents = {depart: None}
+    frontiere = [depart]
+    while frontiere:
+        suivante = []
+        for n in frontiere:
+            for c in reseau.sources(n, "is a", exceptions):
+                if c not in parents:
+                    parents[c] = n
+                    suivante.append(c)
+        frontiere = suivante
+    return parents
+
+def _remonter(parents, x, arrivee, relation):
+    noeuds = [x]
+    while parents[noeuds[-1]] is not None:
+        noeuds.append(parents[noeuds[-1]])
+    return [(a, "is a", b) for a, b in zip(noeuds, noeuds[1:])] + [(x, relation, arrivee)]
+
+def chemins_par_lots(reseau, requetes, exceptions=True, index=None):
+    """
+    Planificateur de requêtes (id1, id2, relation) : retourne pour chacune le
+    chemin trouvé (comme marquer) ou None.
+    - Avec un HierarchyIndex, les sources de relation vers chaque M2 sont triées
+      une fois par leur numéro ; une requête cherche alors par dichotomie une
+      source dans les intervalles de M1 (temps quasi constant), puis remonte
+      le chemin de cette source jusqu'à M1.
+    - Sinon, les requêtes sont groupées par (M1, relation) : une requête isolée est
+      résolue par marquer, un groupe partage la fermeture "is a" de M1, calculée
+      une seule fois, et la table cible -> sous-concept témoin de sa relation.
+    """
+    if index is not None and index.exceptions != exceptions:
+        raise ValueError("L'index n'a pas été construit avec le même traitement des exceptions")
+    res = [None] * len(requetes)
+    groupes = {}
+    rangs = {}
+    for i, (depart, arrivee, relation) in enumerate(requetes):
+        if index is not None:
+            if (arrivee, relation) not in rangs:
+                rangs[arrivee, relation] = index.ranks(reseau.sources(arrivee, relation, exceptions))
+            x = index.witness(rangs[arrivee, relation], depart)
+            if x is not None:
+                noeuds = index.chain(reseau, x, depart)
+                res[i] = [(a, "is a", b) for a, b in zip(noeuds, noeuds[1:])] + [(x, relation, arrivee)]
+        else:
+            groupes.setdefault((depart, relation), []).append(i)
+
+    fermetures = {}
+    for (depart, relation), membres in groupes.items():
+        if len(membres) == 1:
+            i = membres[0]
+            res[i] = marquer(reseau, depart, requetes[i][1], relation, exceptions)
+            continue
+        if depart not in fermetures:
+            fermetures[depart] = sous_concepts(reseau, depart, exceptions)
+        parents = fermetures[depart]
+        temoins = {}
+        for x in parents:
+            for cible in reseau.targets(x, relation, exceptions):
+                temoins.setdefault(cible, x)
+        for i in membres:
+            arrivee = requetes[i][1]
+            if arrivee in temoins:
+                res[i] = _remonter(parents, temoins[arrivee], arrivee, relation)
+    return res
+
+def repondre(reseau, requetes, get_label, exceptions=True, index=None, chemins=False):
+    """
+    Réponses (et chemins) d'une liste de requêtes par labels, via le planificateur.
+    """
+    a_resoudre = []
+    positions = []
+    for i, (node1, node2, relation) in enumerate(requetes):
+        if node1 in reseau.ids and node2 in reseau.ids:
+            a_resoudre.append((reseau.ids[node1], reseau.ids[node2], relation))
+            positions.append(i)
+
+    solutions_found = ["Aucune reponse n'est fournie par manque de connaissances."] * len(requetes)
+    paths = [None] * len(requetes)
+    for i, path in zip(positions, chemins_par_lots(reseau, a_resoudre, exceptions, index)):
+        node2, relation = requetes[i][1], requetes[i][2]
+        solutions_found[i] = get_label(reseau, reseau.node(node2), relation) if path else "il n'y a pas de lien entre les 2 noeuds"
+        paths[i] = labels_chemin(reseau, path) if path else None
+
+    return (solutions_found, paths) if chemins else solutions_found
 
+def propagation_de_marqueurs(reseau_semantique, requetes, chemins=False, index=None):
+    """
+    Réponse à chaque requête (node1, node2, relation) ; avec chemins=True, retourne
+    aussi pour chaque requête le chemin trouvé (arcs (label, relation, label)) ou None.
+    index est un HierarchyIndex optionnel, utile pour les grands lots de requêtes.
+    """
+    reseau = SemanticNetwork.of(reseau_semantique)
+    return repondre(reseau, requetes, get_label, index=index, chemins=chemins)
 
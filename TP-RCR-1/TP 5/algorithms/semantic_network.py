@@ -0,0 +1,175 @@
+from algorithms.compact_network import iter_network
+
+
+class SemanticNetwork:
+    """
+    Réseau sémantique indexé, construit une seule fois à partir du JSON
+    ({"nodes": [...], "edges": [...]}) :
+    - label -> id et id -> noeud,
+    - arcs sortants et entrants par (noeud, relation),
+    - arcs sortants par noeud, toutes relations confondues,
+    - les mêmes index sans les arcs d'exception, et pour chaque noeud l'ensemble
+      des (relation, cible) que ses arcs d'exception bloquent.
+    Les index contiennent les numéros des arcs dans la liste d'origine : les
+    algorithmes parcourent les voisins dans le même ordre qu'avec les listes JSON.
+
+    add_edge / remove_edge modifient le réseau, incrémentent version et préviennent
+    les observateurs (caches construits sur le réseau) avec l'arc concerné.
+    """
+
+    def __init__(self, reseau_semantique):
+        self.nodes = {}         # id -> noeud
+        self.ids = {}           # label -> id (premier noeud portant ce label)
+        self.rang = {}          # id -> position du noeud dans la liste d'origine
+        self.edges = list(reseau_semantique["edges"])
+        self.sortants = {}      # (id, relation) -> numéros des arcs partant du noeud
+        self.entrants = {}      # (id, relation) -> numéros des arcs arrivant au noeud
+        self.tous_sortants = {}  # id -> numéros des arcs partant du noeud
+        self.sortants_stricts = {}  # mêmes index, arcs d'exception exclus
+        self.entrants_stricts = {}
+        self.blocages = {}      # id -> {(relation, cible)} bloqués par ses exceptions
+        self.version = 0
+        self.observers = []
+
+        for i, node in enumerate(reseau_semantique["nodes"]):
+            self.nodes.setdefault(node["id"], node)
+            self.ids.setdefault(node["label"], node["id"])
+            self.rang.setdefault(node["id"], i)
+
+        for i, edge in enumerate(self.edges):
+            self._indexer(i, edge)
+
+    def _indexer(self, i, edge):
+        self.sortants.setdefault((edge["from"], edge["label"]), []).append(i)
+        self.entrants.setdefault((edge["to"], edge["label"]), []).append(i)
+        self.tous_sortants.setdefault(edge["from"], []).append(i)
+        if edge.get("edge_type") == "exception":
+            self.blocages.setdefault(edge["from"], set()).add((edge["label"], edge["to"]))
+        else:
+            self.sortants_stricts.setdefault((edge["from"], edge["label"]), []).append(i)
+            self.entrants_stricts.setdefault((edge["to"], edge["label"]), []).append(i)
+
+    @classmethod
+    def load(cls, chemin, layout=False):
+        """
+        Lit le fichier JSON en flux (voir compact_network.iter_network) ;
+        les coordonnées x/y des noeuds ne sont gardées qu'avec layout=True.
+        """
+        reseau = {"nodes": [], "edges": []}
+        for cle, objet in iter_network(chemin):
+            if cle == "nodes" and not layout:
+                objet.pop("x", None)
+                objet.pop("y", None)
+            reseau[cle].append(objet)
+        return cls(reseau)
+
+    @classmethod
+    def of(cls, reseau_semantique):
+        """
+        Accepte indifféremment un réseau déjà indexé (SemanticNetwork ou
+        CompactNetwork) ou le dictionnaire JSON.
+        """
+        return cls(reseau_semantique) if isinstance(reseau_semantique, dict) else reseau_semantique
+
+    # --- Noeuds ---
+
+    def node(self, label):
+        """
+        Noeud portant ce label ; KeyError si le réseau ne le connaît pas.
+        """
+        return self.nodes[self.ids[label]]
+
+    def labels(self):
+        return [node["label"] for node in self.nodes.values()]
+
+    def label(self, node_id):
+        node = self.nodes.get(node_id)
+        return node["label"] if node is not None else ""
+
+    def labels_of(self, node_ids):
+        """
+        Labels d'un ensemble d'ids, dans l'ordre des noeuds du JSON.
+        """
+        return [self.nodes[i]["label"] for i in sorted(set(node_ids) & self.nodes.keys(), key=self.rang.get)]
+
+    # --- Arcs ---
+
+    def targets(self, node_id, relation, exceptions=True):
+        """
+        Ids des noeuds atteints depuis node_id par un arc relation.
+        Avec exceptions=False, les arcs de type "exception" sont ignorés.
+        """
+        index = self.sortants if exceptions else self.sortants_stricts
+        return [self.edges[i]["to"] for i in index.get((node_id, relation), ())]
+
+    def sources(self, node_id, relation, exceptions=True):
+        """
+        Ids des noeuds ayant un arc relation vers node_id.
+        """
+        index = self.entrants if exceptions else self.entrants_stricts
+        return [self.edges[i]["from"] for i in index.get((node_id, relation), ())]
+
+    def add_edge(self, edge):
+        """
+        Ajoute un arc ({"from", "to", "label"[, "edge_type"]}) ; retourne son numéro.
+        """
+        i = len(self.edges)
+        self.edges.append(edge)
+        self._indexer(i, edge)
+        self._modifie(edge)
+        return i
+
+    def remove_edge(self, from_id, to_id, relation):
+        """
+        Retire le premier arc from_id -relation-> to_id ; KeyError s'il n'existe pas.
+        Les numéros des autres arcs ne changent pas (la case devient None).
+        """
+        for i in self.sortants.get((from_id, relation), ()):
+            if self.edges[i]["to"] == to_id:
+                edge = self.edges[i]
+                self.sortants[from_id, relation].remove(i)
+                self.entrants[to_id, relation].remove(i)
+                self.tous_sortants[from_id].remove(i)
+                self.edges[i] = None
+                if edge.get("edge_type") == "exception":
+                    restants = [self.edges[j] for j in self.tous_sortants[from_id]]
+                    self.blocages[from_id] = {(e["label"], e["to"]) for e in restants
+                                              if e.get("edge_type") == "exception"}
+                else:
+                    self.sortants_stricts[from_id, relation].remove(i)
+                    self.entrants_stricts[to_id, relation].remove(i)
+                self._modifie(edge)
+                return edge
+        raise KeyError((from_id, to_id, relation))
+
+    def _modifie(self, edge):
+        self.version += 1
+        for observer in self.observers:
+            observer(edge)
+
+    def blocks(self, node_id, relation, to_id):
+        """
+        True si un arc d'exception de node_id bloque node_id -relation-> to_id.
+        """
+        return (relation, to_id) in self.blocages.get(node_id, ())
+
+    def has_edge(self, from_id, to_id, relation, exceptions=True):
+        return to_id in self.targets(from_id, relation, exceptions)
+
+    def in_degree(self, node_id, relation, exceptions=True):
+        index = self.entrants if exceptions else self.entrants_stricts
+        return len(index.get((node_id, relation), ()))
+
+    def out_edges(self, node_id):
+        """
+        Arcs (relation, cible) partant de node_id, toutes relations confondues.
+        """
+        return [(self.edges[i]["label"], self.edges[i]["to"]) for i in self.tous_sortants.get(node_id, ())]
+
+    def iter_edges(self):
+        """
+        Tous les arcs, sous la forme (from, to, relation, exception).
+        """
+        for edge in self.edges:
+            if edge is not None:
+                yield edge["from"], edge["to"], edge["label"], edge.get("edge_type") == "exception"
@@ -1,5 +1,5 @@
 from algorithms import propagation, heritage, exceptions
-import json
+from algorithms.semantic_network import SemanticNetwork
 
 MENU = """                  
                              _______________________________________________________________________
@@ -16,15 +16,15 @@ MENU = """
                             | 4) Quitter                                                            |
                             |_______________________________________________________________________|"""
 
-# Load JSON files
-propagation_json = open('Bases/propagation.json')
-heritage_json = open('Bases/heritage.json')
-exception_json = open('Bases/exception.json')
+def afficher_chemin(chemin):
+    # Path followed by the markers, one edge per step
+    if chemin:
+        print("   chemin : " + " ; ".join(f"{a} {relation} {b}" for a, relation, b in chemin))
 
-# Load the JSON data into Python dictionaries
-reseau_semantique_propagation = json.load(propagation_json)
-reseau_semantique_heritage = json.load(heritage_json)
-reseau_semantique_exception = json.load(exception_json)
+# Load the JSON files once into indexed semantic networks
+reseau_semantique_propagation = SemanticNetwork.load('Bases/propagation.json')
+reseau_semantique_heritage = SemanticNetwork.load('Bases/heritage.json')
+reseau_semantique_exception = SemanticNetwork.load('Bases/exception.json')
 
 while True:
 
@@ -39,15 +39,16 @@ while True:
             ["Reseaux Semantique", "Modes Graphiques", "is a"],
             ["Modes de Representations des connaissances", "Axiome A9", "is a"]
         ]
-        solutions = propagation.propagation_de_marqueurs(reseau_semantique_propagation, requetes)
+        solutions, chemins = propagation.propagation_de_marqueurs(reseau_semantique_propagation, requetes, chemins=True)
         
         for i, req in enumerate(requetes):
             print(f"\n{req[0]} {req[2]} {req[1]} --> {solutions[i]}")
+            afficher_chemin(chemins[i])
 
     elif choix == "2":
         print("\n*********************************** Partie 2 : L'algorithme d'heritage ***********************************")
         
-        nodes = [node["label"] for node in reseau_semantique_heritage["nodes"]]
+        nodes = reseau_semantique_heritage.labels()
         print("\nNoeuds disponibles : " + ", ".join(nodes))
 
         while True:
@@ -78,9 +79,10 @@ while True:
             ["Reseaux Semantique", "Modes Graphiques", "is a"],
             ["Modes de Representations des connaissances", "Axiome A9", "is a"]
         ]
-        solutions = exceptions.propagation_de_marqueurs(reseau_semantique_exception, requetes)
+        solutions, chemins = exceptions.propagation_de_marqueurs(reseau_semantique_exception, requetes, chemins=True)
         for i, req in enumerate(requetes):
             print(f"\n{req[0]} {req[2]} {req[1]} --> {solutions[i]}")
+            afficher_chemin(chemins[i])
 
     elif choix == "4":
         print("\nFin du programme.")
@@ -0,0 +1,332 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from algorithms import propagation, heritage, exceptions
+from algorithms.semantic_network import SemanticNetwork
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+BASES = {
+    "propagation": os.path.join(DOSSIER, "Bases", "propagation.json"),
+    "heritage": os.path.join(DOSSIER, "Bases", "heritage.json"),
+    "exception": os.path.join(DOSSIER, "Bases", "exception.json"),
+}
+
+
+class LRUCache:
+    """
+    Cache des résultats, du plus ancien au plus récemment utilisé.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._donnees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cle):
+        if cle in self._donnees:
+            self._donnees.move_to_end(cle)
+            self.hits += 1
+            return True, self._donnees[cle]
+        self.misses += 1
+        return False, None
+
+    def put(self, cle, valeur):
+        self._donnees[cle] = valeur
+        self._donnees.move_to_end(cle)
+        if len(self._donnees) > self.maxsize:
+            self._donnees.popitem(last=False)
+
+    def __len__(self):
+        return len(self._donnees)
+
+
+class Latences:
+    """
+    Nombre d'appels, d'erreurs, de réponses en cache et latences (ms) d'une opération ;
+    les percentiles portent sur les 1000 derniers appels.
+    """
+
+    def __init__(self):
+        self.appels = 0
+        self.erreurs = 0
+        self.cache = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recentes = deque(maxlen=1000)
+
+    def ajouter(self, ms, erreur=False, cache=False):
+        self.appels += 1
+        self.erreurs += erreur
+        self.cache += cache
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.recentes.append(ms)
+
+    def resume(self):
+        triees = sorted(self.recentes)
+
+        def centile(p):
+            return round(triees[min(len(triees) - 1, int(p * len(triees)))], 3) if triees else None
+
+        return {"count": self.appels, "errors": self.erreurs, "cached": self.cache,
+                "mean_ms": round(self.total / self.appels, 3) if self.appels else None,
+                "p50_ms": centile(0.5), "p95_ms": centile(0.95), "max_ms": round(self.max, 3)}
+
+
+class VerrouBase:
+    """
+    Verrou lecteurs/écrivain d'une base : les requêtes la lisent en parallèle, une
+    modification attend qu'elles se terminent et passe avant les requêtes suivantes.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._lecteurs = 0
+        self._ecrivains = 0     # modifications en attente ou en cours
+        self._ecriture = False
+
+    @contextmanager
+    def lecture(self):
+        with self._condition:
+            self._condition.wait_for(lambda: not self._ecrivains)
+            self._lecteurs += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._lecteurs -= 1
+                if not self._lecteurs:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def ecriture(self):
+        with self._condition:
+            self._ecrivains += 1
+            self._condition.wait_for(lambda: not self._lecteurs and not self._ecriture)
+            self._ecriture = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._ecriture = False
+                self._ecrivains -= 1
+                self._condition.notify_all()
+
+
+def _requetes(requete):
+    # une requête seule ("query") ou un lot ("queries"), sous forme de tuples
+    if "queries" in requete:
+        return tuple(tuple(q) for q in requete["queries"]), True
+    return (tuple(requete["query"]),), False
+
+
+class QueryService:
+    """
+    Service de requêtes sur des réseaux sémantiques chargés une seule fois.
+    Chaque requête est un objet JSON {"op": ..., "base": ..., ...} ; la réponse
+    reprend son "id" éventuel. Les résultats sont mis en cache (LRU) sous la clé
+    (base, version de la base, opération, requête) : modifier une base change sa
+    version, les anciens résultats ne sont donc plus jamais servis.
+
+    handle peut être appelé depuis plusieurs threads : chaque base a son verrou
+    lecteurs/écrivain, le cache et les latences sont protégés par un verrou commun.
+    """
+
+    def __init__(self, bases, cache_size=4096):
+        self.bases = {nom: SemanticNetwork.of(reseau) for nom, reseau in bases.items()}
+        self.verrous = {nom: VerrouBase() for nom in self.bases}
+        for reseau in self.bases.values():
+            heritage.engine(reseau)     # créé ici plutôt que par deux threads à la fois
+        self.cache = LRUCache(cache_size)
+        self.latences = {}
+        self._stats = threading.Lock()  # cache et latences
+        self.operations = {
+            "propagation": self._propagation,
+            "exceptions": self._exceptions,
+            "defeasible": self._defaisable,
+            "heritage": self._heritage,
+            "add_edge": self._ajouter_arc,
+            "remove_edge": self._retirer_arc,
+            "bases": self._lister,
+            "metrics": self._metriques,
+        }
+        # opérations dont le résultat ne dépend que de la base et de la requête
+        self.memorisables = {"propagation", "exceptions", "defeasible", "heritage"}
+        self.modifications = {"add_edge", "remove_edge"}
+
+    @classmethod
+    def load(cls, chemins, cache_size=4096):
+        return cls({nom: SemanticNetwork.load(chemin) for nom, chemin in chemins.items()}, cache_size)
+
+    # --- Opérations ---
+
+    def _base(self, requete):
+        nom = requete.get("base")
+        if nom not in self.bases:
+            raise KeyError(f"base inconnue : {nom!r} (disponibles : {', '.join(self.bases)})")
+        return self.bases[nom]
+
+    def _verrou(self, requete):
+        self._base(requete)
+        return self.verrous[requete["base"]]
+
+    def _marqueurs(self, module, requete):
+        requetes, lot = _requetes(requete)
+        solutions, chemins = module.propagation_de_marqueurs(self._base(requete), [list(q) for q in requetes],
+                                                             chemins=True)
+        res = [{"answer": s, "path": c} for s, c in zip(solutions, chemins)]
+        return res if lot else res[0]
+
+    def _propagation(self, requete):
+        return self._marqueurs(propagation, requete)
+
+    def _exceptions(self, requete):
+        return self._marqueurs(exceptions, requete)
+
+    def _defaisable(self, requete):
+        requetes, lot = _requetes(requete)
+        solutions, chemins = exceptions.heritage_defaisable(self._base(requete), [list(q) for q in requetes],
+                                                            chemins=True)
+        res = [{"answer": s, "path": c} for s, c in zip(solutions, chemins)]
+        return res if lot else res[0]
+
+    def _heritage(self, requete):
+        noeuds, proprietes = heritage.heritage(self._base(requete), requete["node"])
+        return {"ancestors": noeuds, "properties": proprietes}
+
+    def _arc(self, requete):
+        reseau = self._base(requete)
+        arc = requete["edge"]
+        return reseau, reseau.ids[arc["from"]], reseau.ids[arc["to"]], arc["label"]
+
+    def _ajouter_arc(self, requete):
+        reseau, source, cible, relation = self._arc(requete)
+        edge = {"from": source, "to": cible, "label": relation}
+        if requete["edge"].get("edge_type"):
+            edge["edge_type"] = requete["edge"]["edge_type"]
+        reseau.add_edge(edge)
+        return {"version": reseau.version}
+
+    def _retirer_arc(self, requete):
+        reseau, source, cible, relation = self._arc(requete)
+        reseau.remove_edge(source, cible, relation)
+        return {"version": reseau.version}
+
+    def _lister(self, requete):
+        return {nom: {"version": r.version, "nodes": len(r.labels())} for nom, r in self.bases.items()}
+
+    def _metriques(self, requete):
+        with self._stats:
+            return {"operations": {op: l.resume() for op, l in sorted(self.latences.items())},
+                    "cache": {"size": len(self.cache), "maxsize": self.cache.maxsize,
+                              "hits": self.cache.hits, "misses": self.cache.misses}}
+
+    # --- Traitement ---
+
+    def handle(self, requete):
+        """
+        Répond à une requête (dictionnaire) ; les erreurs sont renvoyées dans la réponse.
+        """
+        debut = time.perf_counter()
+        op = requete.get("op") if isinstance(requete, dict) else None
+        reponse = {"id": requete.get("id")} if isinstance(requete, dict) else {}
+        en_cache = False
+        try:
+            if op not in self.operations:
+                raise KeyError(f"opération inconnue : {op!r} (disponibles : {', '.join(self.operations)})")
+            if op in self.memorisables:
+                with self._verrou(requete).lecture():
+                    reseau = self._base(requete)
+                    cle = (requete["base"], reseau.version, op,
+                           json.dumps({k: v for k, v in requete.items() if k not in ("id", "op", "base")},
+                                      sort_keys=True))
+                    with self._stats:
+                        en_cache, resultat = self.cache.get(cle)
+                    if not en_cache:
+                        resultat = self.operations[op](requete)
+                        with self._stats:
+                            self.cache.put(cle, resultat)
+            elif op in self.modifications:
+                with self._verrou(requete).ecriture():
+                    resultat = self.operations[op](requete)
+            else:
+                resultat = self.operations[op](requete)
+            reponse["result"] = resultat
+        except (KeyError, ValueError, TypeError) as e:
+            reponse["error"] = f"{type(e).__name__}: {e.args[0] if e.args else e}"
+        ms = (time.perf_counter() - debut) * 1000
+        nom = op if op in self.operations else "invalid"
+        with self._stats:
+            self.latences.setdefault(nom, Latences()).ajouter(ms, "error" in reponse, en_cache)
+        reponse["cached"] = en_cache
+        reponse["ms"] = round(ms, 3)
+        return reponse
+
+    def handle_line(self, ligne):
+        try:
+            requete = json.loads(ligne)
+        except json.JSONDecodeError as e:
+            return json.dumps({"error": f"JSON invalide : {e}"}, ensure_ascii=False)
+        return json.dumps(self.handle(requete), ensure_ascii=False)
+
+    # --- Serveur ---
+
+    async def _client(self, lecteur, ecrivain):
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                if ligne.strip():
+                    # hors de la boucle : une requête longue ne bloque pas les autres clients
+                    reponse = await asyncio.to_thread(self.handle_line, ligne)
+                    ecrivain.write(reponse.encode() + b"\n")
+                    await ecrivain.drain()
+        except ConnectionError:
+            pass
+        finally:
+            ecrivain.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """
+        Serveur TCP JSON-lines : une requête JSON par ligne, une réponse par ligne.
+        Les connexions sont servies en parallèle par la boucle asyncio ; les requêtes
+        sont traitées dans des threads (asyncio.to_thread).
+        """
+        serveur = await asyncio.start_server(self._client, host, port)
+        adresses = ", ".join(str(s.getsockname()) for s in serveur.sockets)
+        print(f"Service en écoute sur {adresses}", file=sys.stderr)
+        async with serveur:
+            await serveur.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Service JSON-lines de requêtes sur les réseaux sémantiques du TP 5.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stdio", action="store_true",
+                        help="lire les requêtes sur l'entrée standard au lieu d'ouvrir un port")
+    parser.add_argument("--base", action="append", metavar="NOM=CHEMIN",
+                        help="base à charger (défaut : les trois bases du TP)")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    chemins = dict(b.split("=", 1) for b in args.base) if args.base else BASES
+    service = QueryService.load(chemins, args.cache_size)
+    if args.stdio:
+        for ligne in sys.stdin:
+            if ligne.strip():
+                print(service.handle_line(ligne), flush=True)
+    else:
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
@@ -1,58 +1,65 @@
 from owlready2 import *
+from reasoner import sync_reasoner_tableau
+from stockage import ouvrir, exporter
 
-onto = get_ontology("http://testxyz.org/onto.owl")
 
-with onto:
+def tbox(onto):
+    with onto:
 
-    # Définition des concepts (classes)
-    class Personne(Thing): pass
-    class Aliment(Thing): pass
-    class University(Thing): pass
+        # Définition des concepts (classes)
+        class Personne(Thing): pass
+        class Aliment(Thing): pass
+        class University(Thing): pass
 
-    AllDisjoint([Personne, Aliment, University])  # Disjonction stricte
+        AllDisjoint([Personne, Aliment, University])  # Disjonction stricte
 
-    # Définition des propriétés (rôles)
-    class mange(Personne >> Thing): pass
-    class enseigne(Personne >> Thing): pass
-    class enseigne_par(ObjectProperty): inverse_property = enseigne
-    class mange_par(ObjectProperty): inverse_property = mange
-    class PartieDe(Thing >> Thing): pass
+        # Définition des propriétés (rôles)
+        class mange(Personne >> Thing): pass
+        class enseigne(Personne >> Thing): pass
+        class enseigne_par(ObjectProperty): inverse_property = enseigne
+        class mange_par(ObjectProperty): inverse_property = mange
+        class PartieDe(Thing >> Thing): pass
 
-    # Définition des entités composées
-    class Faculty(Thing): equivalent_to = [Thing & PartieDe.some(University)]
-    class Departement(Thing): equivalent_to = [Thing & PartieDe.some(Faculty)]
-    class Enseignant(Personne): equivalent_to = [Personne & enseigne.only(Personne)]
-    class Etudiant(Personne): equivalent_to = [Personne & enseigne_par.only(Enseignant)]
+        # Définition des entités composées
+        class Faculty(Thing): equivalent_to = [Thing & PartieDe.some(University)]
+        class Departement(Thing): equivalent_to = [Thing & PartieDe.some(Faculty)]
+        class Enseignant(Personne): equivalent_to = [Personne & enseigne.only(Personne)]
+        class Etudiant(Personne): equivalent_to = [Personne & enseigne_par.only(Enseignant)]
 
-    # Définition d'instances génériques (ABox partielle)
-    class Mohamed(Thing): equivalent_to = [Personne & mange.only(Aliment)]
-    class Meriem(Personne): equivalent_to = [Enseignant & mange.some(Aliment) & enseigne.only(Etudiant)]
-    class MalBouffe(Thing): equivalent_to = [Aliment & mange_par.some(Personne)]
+        # Définition d'instances génériques (ABox partielle)
+        class Mohamed(Thing): equivalent_to = [Personne & mange.only(Aliment)]
+        class Meriem(Personne): equivalent_to = [Enseignant & mange.some(Aliment) & enseigne.only(Etudiant)]
+        class MalBouffe(Thing): equivalent_to = [Aliment & mange_par.some(Personne)]
 
-    AllDisjoint([Etudiant, Enseignant])
-    AllDisjoint([Meriem, Mohamed])
-    AllDisjoint([MalBouffe, Departement, Faculty, University])
+        AllDisjoint([Etudiant, Enseignant])
+        AllDisjoint([Meriem, Mohamed])
+        AllDisjoint([MalBouffe, Departement, Faculty, University])
 
-    sync_reasoner_pellet(infer_property_values=True)
-    onto.save(file="tp_rc1.owl", format="rdfxml")
+        sync_reasoner_tableau(infer_property_values=True, incremental=True)
+    exporter(onto, "tp_rc1.nt")
 
-with onto:
-    USTHB = onto.University()
-    Sidali = onto.Etudiant()
-    Chocolat = onto.Aliment()
-    Belhadi = onto.Personne()
 
-    SI = Thing()     # Département
-    INFO = Thing()   # Faculté
+def abox(onto):
+    with onto:
+        USTHB = onto.University()
+        Sidali = onto.Etudiant()
+        Chocolat = onto.Aliment()
+        Belhadi = onto.Personne()
 
-    INFO.PartieDe.append(USTHB)
-    SI.PartieDe.append(INFO)
+        SI = Thing()     # Département
+        INFO = Thing()   # Faculté
 
-    Sidali.mange = [Chocolat]
-    Belhadi.enseigne = [Sidali]
+        INFO.PartieDe.append(USTHB)
+        SI.PartieDe.append(INFO)
 
-    sync_reasoner_pellet(infer_property_values=True)
-    onto.save(file="tp_rc2.owl", format="rdfxml")
+        Sidali.mange = [Chocolat]
+        Belhadi.enseigne = [Sidali]
 
+        sync_reasoner_tableau(infer_property_values=True, incremental=True)
 
 
+# L'ontologie et les faits inférés restent dans le quadstore d'une exécution à l'autre :
+# seules les étapes nouvelles ou modifiées sont exécutées.
+onto, executees = ouvrir("tp_rc.sqlite3", "http://testxyz.org/onto.owl", [tbox, abox])
+if executees:
+    exporter(onto, "tp_rc2.nt")
@@ -0,0 +1,985 @@
+import sqlite3
+import sys
+import time
+import weakref
+from collections import defaultdict
+
+import owlready2
+from owlready2 import (And, Or, Not, Inverse, Restriction, ThingClass, ObjectPropertyClass, ObjectProperty,
+                       Thing, Nothing, Ontology, World, SOME, ONLY, OwlReadyInconsistentOntologyError,
+                       rdf_type, owl_named_individual)
+from owlready2.reasoning import _apply_reasoning_results, _apply_inferred_obj_relations, _INFERRENCES_ONTOLOGY
+
+# Concepts internes, en forme normale négative (tuples hachables) :
+# ("top",), ("bottom",), ("atom", storid), ("not", storid), ("and", frozenset), ("or", frozenset),
+# ("some", rôle, C), ("all", rôle, C). Un rôle est (storid de la propriété, inverse ?).
+TOP = ("top",)
+BOTTOM = ("bottom",)
+_AUCUNE = frozenset()   # dépendances d'un concept qui ne vient d'aucun point de choix
+_ANCIENNE = frozenset([0])  # ... ou d'un choix fait lors d'une recherche précédente
+
+
+def _inverse(role):
+    return role[0], not role[1]
+
+
+def _et(concepts):
+    termes = set()
+    for c in concepts:
+        if c == BOTTOM:
+            return BOTTOM
+        if c[0] == "and":
+            termes |= c[1]
+        elif c != TOP:
+            termes.add(c)
+    if not termes:
+        return TOP
+    return next(iter(termes)) if len(termes) == 1 else ("and", frozenset(termes))
+
+
+def _ou(concepts):
+    termes = set()
+    for c in concepts:
+        if c == TOP:
+            return TOP
+        if c[0] == "or":
+            termes |= c[1]
+        elif c != BOTTOM:
+            termes.add(c)
+    if not termes:
+        return BOTTOM
+    return next(iter(termes)) if len(termes) == 1 else ("or", frozenset(termes))
+
+
+def _non(c):
+    """
+    Négation en forme normale négative.
+    """
+    t = c[0]
+    if t == "top":
+        return BOTTOM
+    if t == "bottom":
+        return TOP
+    if t == "atom":
+        return ("not", c[1])
+    if t == "not":
+        return ("atom", c[1])
+    if t == "and":
+        return _ou(_non(d) for d in c[1])
+    if t == "or":
+        return _et(_non(d) for d in c[1])
+    if t == "some":
+        return ("all", c[1], _non(c[2]))
+    return ("some", c[1], _non(c[2]))
+
+
+def _ordre(c):
+    # atomes d'abord : un conflit se voit sans rien développer
+    return c[0] not in ("atom", "not"), repr(c)
+
+
+class _Graphe:
+    """
+    Graphe de complétion : un label par noeud (concept -> points de choix dont il
+    dépend), les rôles des arcs vus depuis chaque extrémité (rôle -> dépendances),
+    et le parent des noeuds anonymes (None pour les individus).
+    file contient les (noeud, concept) pas encore traités, ouverts les disjonctions
+    dans l'ordre de leur ajout : celles d'avant curseur sont déjà satisfaites.
+
+    Pendant une recherche, trace note chaque ajout pour pouvoir revenir à un point
+    de choix (retour) sans avoir recopié le graphe.
+    """
+
+    def __init__(self):
+        self.labels = []
+        self.voisins = []
+        self.parent = []
+        self.file = []
+        self.ouverts = []
+        self.curseur = 0
+        self.trace = None
+
+    def copie(self):
+        g = _Graphe()
+        g.labels = [dict(l) for l in self.labels]
+        g.voisins = [{y: dict(r) for y, r in v.items()} for v in self.voisins]
+        g.parent = list(self.parent)
+        g.file = list(self.file)
+        g.ouverts = list(self.ouverts)
+        g.curseur = self.curseur
+        return g
+
+    def etat(self):
+        return len(self.trace), len(self.labels), len(self.ouverts), self.curseur
+
+    def retour(self, etat):
+        """
+        Annule tout ce qui a été ajouté depuis etat (voir etat()).
+        """
+        marque, nb_noeuds, nb_ouverts, curseur = etat
+        trace, labels, voisins = self.trace, self.labels, self.voisins
+        while len(trace) > marque:
+            op = trace.pop()
+            if len(op) == 2:
+                del labels[op[0]][op[1]]
+            elif len(op) == 3:
+                del voisins[op[0]][op[1]][op[2]]
+            else:
+                del voisins[op[0]][op[1]]
+        del labels[nb_noeuds:], voisins[nb_noeuds:], self.parent[nb_noeuds:]
+        del self.ouverts[nb_ouverts:]
+        self.curseur = curseur
+        self.file = []
+
+
+def _coller(g, h):
+    """
+    Recopie le graphe complet h à la suite de g ; retourne le décalage des noeuds.
+    Les dépendances de h deviennent _ANCIENNE : ses choix ne seront plus remis en cause.
+    """
+    d = len(g.labels)
+    g.labels.extend({c: deps and _ANCIENNE for c, deps in l.items()} for l in h.labels)
+    g.voisins.extend({y + d: {r: deps and _ANCIENNE for r, deps in roles.items()} for y, roles in v.items()}
+                     for v in h.voisins)
+    g.parent.extend(p if p is None else p + d for p in h.parent)
+    return d
+
+
+def _composantes(individus, relations):
+    """
+    Composantes connexes de la ABox (union-find sur les relations).
+    Retourne (storid -> membres, membres -> relations de la composante).
+    """
+    chef = {s: s for s in individus}
+
+    def trouver(s):
+        while chef[s] != s:
+            chef[s] = chef[chef[s]]
+            s = chef[s]
+        return s
+
+    for a, _, b in relations:
+        ra, rb = trouver(a), trouver(b)
+        if ra != rb:
+            chef[ra] = rb
+    groupes = defaultdict(set)
+    for s in individus:
+        groupes[trouver(s)].add(s)
+    composante = {}
+    par_composante = {}
+    for membres in groupes.values():
+        membres = frozenset(membres)
+        par_composante[membres] = []
+        for s in membres:
+            composante[s] = membres
+    for r in relations:
+        par_composante[composante[r[0]]].append(r)
+    return composante, par_composante
+
+
+def _fermer_journal(db, nom):
+    try:
+        db.execute(f"DROP TRIGGER IF EXISTS {nom}_ajout")
+        db.execute(f"DROP TRIGGER IF EXISTS {nom}_retrait")
+        db.execute(f"DROP TRIGGER IF EXISTS {nom}_modif")
+        db.execute(f"DROP TABLE IF EXISTS {nom}")
+    except sqlite3.Error:
+        pass    # monde déjà fermé
+
+
+class TableauReasoner:
+    """
+    Raisonneur par tableau pour ALCHI (ALC avec rôles inverses et hiérarchie de
+    rôles), sur les classes, propriétés objet et individus d'un monde owlready2.
+
+    Optimisations :
+    - absorption : les axiomes C ⊑ D sont ramenés autant que possible à A ⊑ D' pour
+      un concept atomique A (dépliés seulement quand A apparaît dans un label) ;
+      ∃r.A ⊑ D devient A ⊑ ∀r⁻.D, et domaines et portées ne s'appliquent qu'aux arcs ;
+      seuls les axiomes non absorbables sont ajoutés à chaque noeud ;
+    - branchement sémantique et retour arrière dirigé par les dépendances sur les
+      disjonctions, blocage par égalité des labels ;
+    - cache des tests de satisfiabilité, et filtrage des candidats par le modèle
+      trouvé : B ne peut subsumer A que si B figure dans le modèle de A ;
+    - hiérarchie des classes calculée à la demande, classe par classe.
+    """
+
+    def __init__(self, world=None):
+        self.world = world or owlready2.default_world
+        self.classes = [c for c in self.world.classes() if c is not Thing and c is not Nothing]
+        self.proprietes = list(self.world.object_properties())
+        self.individus = {}                 # storid -> individu de la ABox
+        self._entites = {e.storid: e for e in self.classes}
+
+        self.canon = {}                     # storid -> rôle canonique (une propriété ou l'inverse d'une autre)
+        self.deplier = defaultdict(list)    # storid de A -> concepts ajoutés avec A
+        self.domaine = defaultdict(list)    # rôle -> concepts ajoutés à l'origine d'un arc
+        self.globaux = []                   # axiomes non absorbés, ajoutés à chaque noeud
+        self._sur = {}                      # rôle -> rôles qui le contiennent (lui compris)
+
+        self._roles()
+        self._axiomes()
+
+        self._sat = {}                      # concepts de départ -> label du modèle trouvé, ou None
+        self._subsumants = {}
+        self._types = {}                    # storid d'un individu -> classes nommées
+        self._acquis = {}                   # storid -> classes déjà établies, à compléter après des ajouts
+        self._assertions = ({}, set())      # ABox lue lors de la dernière mise à jour
+        self._incidentes = defaultdict(set)  # storid -> relations de la ABox qui le touchent
+        self._composante = {}               # storid -> membres de sa composante connexe
+        self._par_composante = {}           # membres -> relations de la composante
+        self._modeles = {}                  # membres -> (storid -> noeud, graphe complet ou None)
+        self._deterministes = {}            # membres -> (storid -> noeud, graphe après les règles déterministes)
+        self._incoherentes = set()          # composantes sans modèle
+        self._journal = None                # table SQLite des triplets modifiés, après la première lecture
+        self.stats = {"tests": 0, "cached": 0, "resumed": 0, "branches": 0, "nodes": 0}
+
+    # --- Traduction de l'ontologie ---
+
+    def _roles(self):
+        for p in self.proprietes:
+            if p.storid in self.canon:
+                continue
+            q = p.inverse_property
+            self.canon[p.storid] = _inverse(self.canon[q.storid]) if q is not None and q.storid in self.canon \
+                else (p.storid, False)
+
+        directs = defaultdict(set)
+        for p in self.proprietes:
+            r = self.canon[p.storid]
+            for s in p.is_a:
+                if isinstance(s, ObjectPropertyClass) and s is not ObjectProperty and s.storid in self.canon:
+                    directs[r].add(self.canon[s.storid])
+                    directs[_inverse(r)].add(_inverse(self.canon[s.storid]))
+            for d in p.domain:
+                self._absorber(("some", r, TOP), self._concept(d))
+            for d in p.range:
+                self._absorber(("some", _inverse(r), TOP), self._concept(d))
+
+        for r in list(directs):
+            sur = {r}
+            pile = [r]
+            while pile:
+                for s in directs.get(pile.pop(), ()):
+                    if s not in sur:
+                        sur.add(s)
+                        pile.append(s)
+            self._sur[r] = frozenset(sur)
+
+    def _role(self, p):
+        if isinstance(p, Inverse):
+            return _inverse(self._role(p.property))
+        return self.canon[p.storid]
+
+    def _concept(self, x):
+        """
+        Concept owlready2 -> concept interne en forme normale négative.
+        """
+        if x is Thing:
+            return TOP
+        if x is Nothing:
+            return BOTTOM
+        if isinstance(x, ThingClass):
+            return ("atom", x.storid)
+        if isinstance(x, And):
+            return _et(self._concept(c) for c in x.Classes)
+        if isinstance(x, Or):
+            return _ou(self._concept(c) for c in x.Classes)
+        if isinstance(x, Not):
+            return _non(self._concept(x.Class))
+        if isinstance(x, Restriction) and x.type in (SOME, ONLY):
+            role, c = self._role(x.property), self._concept(x.value)
+            if x.type == SOME:
+                return BOTTOM if c == BOTTOM else ("some", role, c)
+            return TOP if c == TOP else ("all", role, c)
+        raise ValueError(f"construction hors du fragment ALCHI : {x}")
+
+    def _axiomes(self):
+        for cls in self.classes:
+            a = ("atom", cls.storid)
+            for parent in cls.is_a:
+                if isinstance(parent, ThingClass) or isinstance(parent, (And, Or, Not, Restriction)):
+                    self._absorber(a, self._concept(parent))
+            for eq in cls.equivalent_to:
+                c = self._concept(eq)
+                self._absorber(a, c)
+                self._absorber(c, a)
+        for disjonction in self.world.disjoint_classes():
+            membres = [self._concept(c) for c in disjonction.entities]
+            for i, c in enumerate(membres):
+                for d in membres[i + 1:]:
+                    self._absorber(_et([c, d]), BOTTOM)
+
+    def _absorber(self, gauche, droite):
+        """
+        Range l'axiome gauche ⊑ droite là où il coûtera le moins au tableau.
+        """
+        if droite == TOP or gauche == BOTTOM:
+            return
+        t = gauche[0]
+        if t == "or":
+            for c in gauche[1]:
+                self._absorber(c, droite)
+        elif t == "atom":
+            self.deplier[gauche[1]].append(droite)
+        elif t == "and" and any(c[0] == "atom" for c in gauche[1]):
+            a = min((c for c in gauche[1] if c[0] == "atom"), key=repr)
+            self.deplier[a[1]].append(_ou([_non(_et(gauche[1] - {a})), droite]))
+        elif t == "some" and gauche[2] == TOP:
+            self.domaine[gauche[1]].append(droite)
+        elif t == "some" and gauche[2][0] == "atom":
+            self.deplier[gauche[2][1]].append(("all", _inverse(gauche[1]), droite))
+        else:
+            self.globaux.append(_ou([_non(gauche), droite]))
+
+    # --- Tableau ---
+
+    def _ajouter(self, g, x, c, deps):
+        if c != TOP and c not in g.labels[x]:
+            g.labels[x][c] = deps
+            g.file.append((x, c))
+            if c[0] == "or":
+                g.ouverts.append((x, c))
+            if g.trace is not None:
+                g.trace.append((x, c))
+
+    def _noeud(self, g, parent, deps=_AUCUNE):
+        x = len(g.labels)
+        g.labels.append({})
+        g.voisins.append({})
+        g.parent.append(parent)
+        self.stats["nodes"] += 1
+        for c in self.globaux:
+            self._ajouter(g, x, c, deps)
+        return x
+
+    def _relier(self, g, x, y, role, deps=_AUCUNE):
+        if y not in g.voisins[x]:
+            g.voisins[x][y] = {}
+            g.voisins[y][x] = {}
+            if g.trace is not None:
+                g.trace.extend(((x, y, None, None), (y, x, None, None)))
+        rx, ry = g.voisins[x][y], g.voisins[y][x]
+        for r in self._sur.get(role, (role,)):
+            if r in rx:
+                continue
+            rx[r] = ry[_inverse(r)] = deps
+            if g.trace is not None:
+                g.trace.extend(((x, y, r), (y, x, _inverse(r))))
+            for d in self.domaine.get(r, ()):
+                self._ajouter(g, x, d, deps)
+            for d in self.domaine.get(_inverse(r), ()):
+                self._ajouter(g, y, d, deps)
+            for c, dc in list(g.labels[x].items()):
+                if c[0] == "all" and c[1] == r:
+                    self._ajouter(g, y, c[2], dc | deps)
+            for c, dc in list(g.labels[y].items()):
+                if c[0] == "all" and c[1] == _inverse(r):
+                    self._ajouter(g, x, c[2], dc | deps)
+
+    def _propager(self, g):
+        """
+        Règles déterministes (⊓, ∀, dépliage) jusqu'au point fixe.
+        Retourne None, ou en cas de conflit les points de choix dont il dépend.
+        """
+        labels = g.labels
+        while g.file:
+            x, c = g.file.pop()
+            t, deps = c[0], labels[x][c]
+            if t == "bottom":
+                return deps
+            if t == "atom":
+                if ("not", c[1]) in labels[x]:
+                    return deps | labels[x]["not", c[1]]
+                for d in self.deplier.get(c[1], ()):
+                    self._ajouter(g, x, d, deps)
+            elif t == "not":
+                if ("atom", c[1]) in labels[x]:
+                    return deps | labels[x]["atom", c[1]]
+            elif t == "and":
+                for d in c[1]:
+                    self._ajouter(g, x, d, deps)
+            elif t == "all":
+                for y, roles in g.voisins[x].items():
+                    if c[1] in roles:
+                        self._ajouter(g, y, c[2], deps | roles[c[1]])
+        return None
+
+    def _bloque(self, g, x):
+        """
+        Blocage par égalité : un noeud anonyme dont un ancêtre anonyme porte le même
+        label (ou dont un ancêtre est lui-même bloqué) n'est plus développé.
+        """
+        ancetres = []
+        p = g.parent[x]
+        while p is not None and g.parent[p] is not None:
+            ancetres.append(p)
+            p = g.parent[p]
+        for i, n in enumerate([x] + ancetres):
+            if any(g.labels[a].keys() == g.labels[n].keys() for a in ancetres[i:]):
+                return True
+        return False
+
+    def _disjonction(self, g):
+        """
+        Première disjonction ouverte d'un noeud non bloqué, dans l'ordre d'ajout.
+        Une disjonction satisfaite le reste jusqu'au prochain retour : le curseur
+        passe les disjonctions satisfaites du début une fois pour toutes.
+        """
+        labels, ouverts = g.labels, g.ouverts
+        while g.curseur < len(ouverts):
+            x, c = ouverts[g.curseur]
+            if not c[1] & labels[x].keys():
+                break
+            g.curseur += 1
+        for i in range(g.curseur, len(ouverts)):
+            x, c = ouverts[i]
+            if not c[1] & labels[x].keys() and (g.parent[x] is None or not self._bloque(g, x)):
+                return x, c
+        return None
+
+    def _developper(self, g):
+        """
+        Applique les règles jusqu'à un conflit ("clash", dépendances), un modèle
+        ("complet",) ou une disjonction à trancher ("ou", noeud, disjonction).
+        """
+        while True:
+            conflit = self._propager(g)
+            if conflit is not None:
+                return "clash", conflit
+            ou = self._disjonction(g)
+            if ou is not None:
+                return ("ou",) + ou
+            libres = [x for x in range(len(g.labels)) if g.parent[x] is None or not self._bloque(g, x)]
+            nouveau = False
+            for x in libres:
+                for c in sorted((c for c in g.labels[x] if c[0] == "some"), key=repr):
+                    if not any(c[1] in roles and (c[2] == TOP or c[2] in g.labels[y])
+                               for y, roles in g.voisins[x].items()):
+                        deps = g.labels[x][c]
+                        y = self._noeud(g, x, deps)
+                        self._ajouter(g, y, c[2], deps)
+                        self._relier(g, x, y, c[1], deps)
+                        nouveau = True
+                        break
+                if nouveau:
+                    break
+            if not nouveau:
+                return ("complet",)
+
+    def _chercher(self, g):
+        """
+        Recherche en profondeur sur les disjonctions, avec retour arrière dirigé par
+        les dépendances : un conflit qui ne dépend pas d'un point de choix fait
+        abandonner toutes les branches restantes de ce choix.
+        Retourne un graphe complet ou None.
+        """
+        choix = []      # [état du graphe au point de choix, noeud, disjoints, rang, dépendances, id, négations]
+        g.trace = []
+        while True:
+            res = self._developper(g)
+            if res[0] == "complet":
+                g.trace = None
+                return g
+            if res[0] == "ou":
+                _, x, ou = res
+                point = [g.etat(), x, sorted(ou[1], key=_ordre), 0, g.labels[x][ou], len(choix) + 1, []]
+                choix.append(point)
+                self._branche(g, point)
+                continue
+            conflit = res[1]
+            while choix:
+                point = choix[-1]
+                b = point[5]
+                if b not in conflit:
+                    choix.pop()         # ce choix n'est pas en cause
+                    continue
+                point[4] = point[4] | (conflit - {b})
+                # branchement sémantique : la suite des branches sait que ce disjoint échoue
+                point[6].append((_non(point[2][point[3]]), conflit))
+                point[3] += 1
+                if point[3] < len(point[2]):
+                    self._branche(g, point)
+                    break
+                choix.pop()
+                conflit = point[4]
+            else:
+                g.trace = None
+                return None
+
+    def _branche(self, g, point):
+        etat, x, disjoints, i, deps, b, negations = point
+        self.stats["branches"] += 1
+        g.retour(etat)
+        self._ajouter(g, x, disjoints[i], deps | {b})
+        for c, dc in negations:
+            self._ajouter(g, x, c, dc)
+
+    def _satisfiable(self, concepts):
+        """
+        Label de la racine d'un modèle de la conjonction des concepts, ou None.
+        """
+        cle = frozenset(concepts)
+        if cle in self._sat:
+            self.stats["cached"] += 1
+            return self._sat[cle]
+        self.stats["tests"] += 1
+        g = _Graphe()
+        x = self._noeud(g, None)
+        for c in cle:
+            self._ajouter(g, x, c, _AUCUNE)
+        modele = self._chercher(g)
+        self._sat[cle] = set(modele.labels[x]) if modele is not None else None
+        return self._sat[cle]
+
+    # --- ABox, par composantes connexes ---
+
+    def _relation(self, a, p, b):
+        # (a, rôle, b), rôle toujours dans le sens de sa propriété canonique
+        role = self.canon[p]
+        return (b, _inverse(role), a) if role[1] else (a, role, b)
+
+    def _lire_abox(self):
+        """
+        Assertions actuelles du monde : individus, types (concepts internes) et
+        relations (a, rôle, b), rôle toujours dans le sens de sa propriété canonique.
+        """
+        individus = {ind.storid: ind for ind in self.world.individuals()}
+        types = {s: frozenset(self._concept(t) for t in ind.is_a) for s, ind in individus.items()}
+        relations = set()
+        for p in self.proprietes:
+            for a, b in p.get_relations():
+                if a.storid in individus and b.storid in individus:
+                    relations.add(self._relation(a.storid, p.storid, b.storid))
+        return individus, types, relations
+
+    def _ouvrir_journal(self):
+        """
+        Journal des triplets objet ajoutés, retirés ou modifiés dans le quadstore : une
+        table et des déclencheurs SQLite temporaires, propres à ce raisonneur, qui voient
+        toutes les écritures (API owlready2, destroy_entity, chargement d'un fichier).
+        """
+        db = self.world.graph.db
+        nom = f"journal_tableau_{id(self)}"
+        db.execute(f"CREATE TEMP TABLE {nom} (s INTEGER, o INTEGER)")
+        db.execute(f"CREATE TEMP TRIGGER {nom}_ajout AFTER INSERT ON objs "
+                   f"BEGIN INSERT INTO {nom} VALUES (NEW.s, NEW.o); END")
+        db.execute(f"CREATE TEMP TRIGGER {nom}_retrait AFTER DELETE ON objs "
+                   f"BEGIN INSERT INTO {nom} VALUES (OLD.s, OLD.o); END")
+        db.execute(f"CREATE TEMP TRIGGER {nom}_modif AFTER UPDATE ON objs "
+                   f"BEGIN INSERT INTO {nom} VALUES (OLD.s, OLD.o); INSERT INTO {nom} VALUES (NEW.s, NEW.o); END")
+        self._journal = nom
+        weakref.finalize(self, _fermer_journal, db, nom)
+
+    def _individu(self, s):
+        # même critère que world.individuals()
+        if self.world._has_obj_triple_spo(s, rdf_type, owl_named_individual):
+            individu = self.world._get_by_storid(s)
+            if isinstance(individu, Thing):
+                return individu
+        return None
+
+    def _lire_journal(self):
+        """
+        Relit les individus mentionnés par les triplets journalisés depuis la dernière
+        lecture, et vide le journal. Retourne (storids relus, individus, types, relations)
+        au format de _lire_abox ; les relations sont celles qui touchent un individu relu.
+        """
+        db = self.world.graph.db
+        lignes = db.execute(f"SELECT s, o FROM {self._journal}").fetchall()
+        db.execute(f"DELETE FROM {self._journal}")
+        mentionnes = {x for ligne in lignes for x in ligne if x > 0}
+        # une construction anonyme modifiée change les types des individus qui l'utilisent
+        anonymes = [x for ligne in lignes for x in ligne if x < 0]
+        vus = set(anonymes)
+        while anonymes:
+            for (x,) in db.execute("SELECT s FROM objs WHERE o = ?", (anonymes.pop(),)):
+                if x > 0:
+                    mentionnes.add(x)
+                elif x not in vus:
+                    vus.add(x)
+                    anonymes.append(x)
+
+        relus = set()
+        individus = {}
+        for s in mentionnes:
+            individu = self._individu(s)
+            if individu is not None:
+                individus[s] = individu
+            if individu is not None or s in self.individus:
+                relus.add(s)
+        types = {s: frozenset(self._concept(t) for t in ind.is_a) for s, ind in individus.items()}
+
+        def individu(x):
+            return x in individus or (x in self.individus and x not in relus)
+
+        relations = set()
+        requete = "SELECT s, p, o FROM objs WHERE s = ? UNION SELECT s, p, o FROM objs WHERE o = ?"
+        for s in individus:
+            for a, p, b in db.execute(requete, (s, s)):
+                if p in self.canon and individu(a) and individu(b):
+                    relations.add(self._relation(a, p, b))
+        return relus, individus, types, relations
+
+    def _appliquer(self, relus, individus, types, relations):
+        """
+        Remplace dans la ABox mémorisée ce qui concerne les individus relus (voir
+        _lire_journal). Retourne (types ajoutés par individu relu, relations ajoutées,
+        relations retirées, storids touchés par un retrait).
+        """
+        anciens_types, toutes = self._assertions
+        ajouts_types = {s: cs - anciens_types.get(s, _AUCUNE) for s, cs in types.items()}
+        retires = {s for s in relus if not anciens_types.get(s, _AUCUNE) <= types.get(s, _AUCUNE)}
+        anciennes = set()
+        for s in relus:
+            anciennes |= self._incidentes.get(s, set())
+        ajouts_relations = relations - anciennes
+        retraits_relations = anciennes - relations
+        retires |= {s for a, _, b in retraits_relations for s in (a, b)}
+
+        for s in relus:
+            if s in individus:
+                self.individus[s] = individus[s]
+                anciens_types[s] = types[s]
+            else:
+                self.individus.pop(s, None)
+                anciens_types.pop(s, None)
+        for r in retraits_relations:
+            toutes.discard(r)
+            for s in (r[0], r[2]):
+                self._incidentes[s].discard(r)
+        for r in ajouts_relations:
+            toutes.add(r)
+            for s in (r[0], r[2]):
+                self._incidentes[s].add(r)
+        for s in relus:
+            if s not in individus:
+                self._incidentes.pop(s, None)
+        return ajouts_types, ajouts_relations, retraits_relations, retires
+
+    def _graphe(self, membres, types, relations):
+        g = _Graphe()
+        noeud = {s: self._noeud(g, None) for s in sorted(membres)}
+        for s in noeud:
+            for c in types[s]:
+                self._ajouter(g, noeud[s], c, _AUCUNE)
+        for a, role, b in relations:
+            self._relier(g, noeud[a], noeud[b], role)
+        return g, noeud
+
+    def _reprendre(self, anciennes, membres, types, ajouts_types, ajouts_relations):
+        """
+        Modèle d'une composante qui n'a fait que grandir : les modèles complets de ses
+        anciennes composantes sont recopiés et seuls les ajouts sont propagés.
+        Les choix faits lors des recherches précédentes ne sont plus remis en cause :
+        si l'ajout les contredit, None (et la composante est recalculée).
+        """
+        g = _Graphe()
+        noeud = {}
+        for m in sorted(anciennes, key=min):
+            ancien_noeud, ancien = self._modeles[m]
+            d = _coller(g, ancien)
+            noeud.update((s, x + d) for s, x in ancien_noeud.items())
+        for s in sorted(membres - noeud.keys()):
+            noeud[s] = self._noeud(g, None)
+        for s in membres:
+            for c in ajouts_types.get(s, ()):   # tous ses types pour un nouvel individu
+                self._ajouter(g, noeud[s], c, _AUCUNE)
+        for a, role, b in ajouts_relations:
+            self._relier(g, noeud[a], noeud[b], role)
+        modele = self._chercher(g)
+        return (noeud, modele) if modele is not None else None
+
+    def update(self):
+        """
+        Met à jour la ABox et ne refait que le travail nécessaire. La première fois, le
+        monde est lu en entier ; ensuite, seuls les individus mentionnés par les triplets
+        modifiés depuis (voir _ouvrir_journal) sont relus, et seules leurs composantes
+        connexes sont revues :
+        - une composante inchangée garde son modèle et les types de ses individus,
+        - une composante qui n'a reçu que des ajouts repart des modèles de ses anciennes
+          composantes, seuls les ajouts sont propagés ; les types déjà établis de ses
+          individus restent impliqués, seules les autres classes seront testées,
+        - une composante touchée par un retrait est recalculée seule, types compris.
+        Retourne les storids des individus dont les types sont à compléter.
+        """
+        if self._journal is None:
+            self._ouvrir_journal()      # avant la lecture : aucune écriture ne peut échapper
+            individus, types, relations = self._lire_abox()
+            relus = set(individus)
+        else:
+            relus, individus, types, relations = self._lire_journal()
+        if not relus:
+            return set()
+        types_abox = self._assertions[0]
+        ajouts_types, ajouts_relations, _, retires = self._appliquer(relus, individus, types, relations)
+        touches = retires | {s for s, cs in ajouts_types.items() if cs} \
+            | {s for a, _, b in ajouts_relations for s in (a, b)}
+
+        # seules les composantes des individus touchés peuvent changer
+        zone_avant = {self._composante[s] for s in touches if s in self._composante}
+        zone = {s for m in zone_avant for s in m if s in self.individus} | (touches & self.individus.keys())
+        relations_zone = {r for s in zone for r in self._incidentes.get(s, ())}
+        composante, par_composante = _composantes(zone, relations_zone)
+
+        recalcules = set()
+        modeles = {}
+        for membres, rels in par_composante.items():
+            if membres in zone_avant and not membres & touches:
+                zone_avant.discard(membres)     # inchangée : rien à remplacer
+                continue
+            recalcules |= membres
+            anciennes = {self._composante[s] for s in membres if s in self._composante}
+            modele = None
+            if anciennes and not membres & retires \
+                    and all(m <= membres and self._modeles[m][1] is not None for m in anciennes):
+                self.stats["resumed"] += 1
+                modele = self._reprendre(anciennes, membres, types_abox, ajouts_types,
+                                         [r for r in ajouts_relations if r[0] in membres])
+            if modele is None:
+                self.stats["tests"] += 1
+                g, noeud = self._graphe(membres, types_abox, rels)
+                modele = (noeud, self._chercher(g))
+            modeles[membres] = modele
+
+        for m in zone_avant:
+            for s in m:
+                del self._composante[s]
+            del self._par_composante[m]
+            del self._modeles[m]
+            self._deterministes.pop(m, None)
+            self._incoherentes.discard(m)
+        self._composante.update(composante)
+        self._par_composante.update(par_composante)
+        self._modeles.update(modeles)
+        for membres, modele in modeles.items():
+            if modele[1] is None:
+                self._incoherentes.add(membres)
+        for s in relus - self.individus.keys():
+            self._types.pop(s, None)
+            self._acquis.pop(s, None)
+        for s in recalcules:
+            acquis = self._types.pop(s, set()) | self._acquis.pop(s, set())
+            if acquis and not composante[s] & retires:
+                self._acquis[s] = acquis
+        return recalcules
+
+    def rebase(self):
+        """
+        Enregistre sans raisonner les faits écrits dans le monde depuis la dernière mise
+        à jour, à appeler quand ce sont déjà des conséquences de la ABox (types et
+        relations inférés) : les modèles et les types calculés restent valables.
+        Une relation écrite relie deux individus d'une même composante.
+        """
+        if self._journal is None:
+            return
+        relus, individus, types, relations = self._lire_journal()
+        _, ajouts_relations, retraits_relations, _ = self._appliquer(relus, individus, types, relations)
+        for r in retraits_relations:
+            self._par_composante[self._composante[r[0]]].remove(r)
+        for r in ajouts_relations:
+            self._par_composante[self._composante[r[0]]].append(r)
+
+    # --- Requêtes ---
+
+    def is_satisfiable(self, cls):
+        return self._satisfiable([self._concept(cls)]) is not None
+
+    def subsumes(self, general, specific):
+        """
+        True si specific ⊑ general (classes ou constructions owlready2).
+        """
+        return self._satisfiable([self._concept(specific), _non(self._concept(general))]) is None
+
+    def subsumers(self, cls):
+        """
+        Classes nommées qui subsument cls (cls comprise), mémorisées.
+        Seules les classes présentes dans un modèle de cls sont testées.
+        """
+        if cls not in self._subsumants:
+            a = self._concept(cls)
+            modele = self._satisfiable([a])
+            if modele is None:
+                self._subsumants[cls] = set(self.classes)
+            else:
+                candidats = [self._entites[c[1]] for c in modele if c[0] == "atom" and c[1] in self._entites]
+                self._subsumants[cls] = {b for b in candidats
+                                         if b is cls or self._satisfiable([a, ("not", b.storid)]) is None}
+        return self._subsumants[cls]
+
+    def equivalents(self, cls):
+        return {b for b in self.subsumers(cls) if b is not cls and cls in self.subsumers(b)}
+
+    def parents(self, cls):
+        """
+        Subsumants directs de cls (hiérarchie construite à la demande).
+        """
+        strictes = self.subsumers(cls) - self.equivalents(cls) - {cls}
+        return {b for b in strictes
+                if not any(c is not b and b in self.subsumers(c) and c not in self.subsumers(b) for c in strictes)}
+
+    def is_consistent(self):
+        """
+        Cohérence de la ABox avec la TBox : chaque composante connexe a un modèle.
+        """
+        if self._journal is None:
+            self.update()
+        return not self._incoherentes
+
+    def _deterministe(self, membres):
+        """
+        Graphe de la composante après les seules règles déterministes, construit une fois
+        et recopié pour chaque test d'instance de ses individus.
+        """
+        if membres not in self._deterministes:
+            types, _ = self._assertions
+            g, noeud = self._graphe(membres, types, self._par_composante[membres])
+            self._propager(g)       # pas de conflit : la composante a un modèle
+            self._deterministes[membres] = (noeud, g)
+        return self._deterministes[membres]
+
+    def types(self, individu):
+        """
+        Classes nommées dont l'individu est instance (toutes, pas seulement les plus spécifiques).
+        Seules les classes du modèle de sa composante sont testées, sur cette seule composante ;
+        celles que les règles déterministes suffisent à établir, ou déjà établies avant
+        des ajouts (voir update), ne sont pas testées.
+        """
+        s = individu.storid
+        if s not in self._types:
+            if not self.is_consistent():
+                raise OwlReadyInconsistentOntologyError("ontologie incohérente")
+            membres = self._composante[s]
+            noeud, modele = self._modeles[membres]
+            noeud_test, g0 = self._deterministe(membres)
+            x = noeud_test[s]
+            res = self._acquis.pop(s, set())
+            for c in modele.labels[noeud[s]]:
+                if c[0] != "atom" or c[1] not in self._entites or self._entites[c[1]] in res:
+                    continue
+                if g0.labels[x].get(c) == _AUCUNE:
+                    res.add(self._entites[c[1]])
+                    continue
+                g = g0.copie()
+                self._ajouter(g, x, ("not", c[1]), _AUCUNE)
+                self.stats["tests"] += 1
+                if self._chercher(g) is None:
+                    res.add(self._entites[c[1]])
+            self._types[s] = res
+        return self._types[s]
+
+    def most_specific_types(self, individu):
+        types = self.types(individu)
+        return {b for b in types if not any(c is not b and b in self.subsumers(c) and c not in self.subsumers(b)
+                                            for c in types)}
+
+    def property_values(self, individus=None):
+        """
+        Relations (a, propriété nommée, b) impliquées par les assertions,
+        par les propriétés inverses et par la hiérarchie des propriétés.
+        Si individus (storids) est donné, seules les assertions qui les touchent comptent.
+        """
+        par_role = defaultdict(list)
+        for p in self.proprietes:
+            par_role[self.canon[p.storid]].append(p)
+        if individus is None:
+            assertions = self._assertions[1]
+        else:
+            assertions = {r for s in individus for r in self._incidentes.get(s, ())}
+        relations = set()
+        for a, role, b in assertions:
+            a, b = self.individus[a], self.individus[b]
+            for r in self._sur.get(role, (role,)):
+                for q in par_role.get(r, ()):
+                    relations.add((a, q, b))
+                for q in par_role.get(_inverse(r), ()):
+                    relations.add((b, q, a))
+        return relations
+
+
+_raisonneurs = weakref.WeakKeyDictionary()    # monde -> (signature de la TBox, raisonneur)
+
+
+def _signature_tbox(world):
+    """
+    Tout ce que le raisonneur lit de la TBox : si rien n'a changé, sa classification reste valable.
+    """
+    classes = tuple((c.storid, tuple(map(repr, c.is_a)), tuple(map(repr, c.equivalent_to)))
+                    for c in world.classes())
+    proprietes = tuple((p.storid, repr(p.inverse_property), tuple(map(repr, p.is_a)),
+                        tuple(map(repr, p.domain)), tuple(map(repr, p.range)))
+                       for p in world.object_properties())
+    disjonctions = tuple(tuple(map(repr, d.entities)) for d in world.disjoint_classes())
+    return classes, proprietes, disjonctions
+
+
+def sync_reasoner_tableau(x=None, infer_property_values=False, debug=1, incremental=False):
+    """
+    Remplace sync_reasoner_pellet : même choix de monde et d'ontologie cible, mêmes
+    faits inférés (hiérarchie des classes, classes incohérentes équivalentes à Nothing,
+    types des individus, valeurs de propriétés), mais sans sérialiser l'ontologie
+    ni lancer de JVM. Retourne le raisonneur, pour l'interroger ensuite.
+
+    Avec incremental=True, le raisonneur du passage précédent sur ce monde est repris
+    si la TBox n'a pas changé : la classification n'est pas refaite, et seules les
+    composantes de la ABox touchées par des ajouts ou des retraits sont recalculées
+    (voir TableauReasoner.update) ; seuls leurs individus sont réécrits.
+    """
+    if isinstance(x, World):
+        world = x
+    elif isinstance(x, Ontology):
+        world = x.world
+    elif isinstance(x, list):
+        world = x[0].world
+    else:
+        world = owlready2.default_world
+    if isinstance(x, Ontology):
+        ontology = x
+    elif owlready2.CURRENT_NAMESPACES.get():
+        ontology = owlready2.CURRENT_NAMESPACES.get()[-1].ontology
+    else:
+        ontology = world.get_ontology(_INFERRENCES_ONTOLOGY)
+
+    debut = time.perf_counter()
+    precedent = _raisonneurs.get(world) if incremental else None
+    if precedent is not None and precedent[0] == _signature_tbox(world):
+        reasoner, tbox = precedent[1], False
+    else:
+        reasoner, tbox = TableauReasoner(world), True
+    recalcules = reasoner.update()
+    if not reasoner.is_consistent():
+        raise OwlReadyInconsistentOntologyError("la ABox n'a pas de modèle (raisonneur par tableau)")
+
+    new_parents = defaultdict(list)
+    new_equivs = defaultdict(list)
+    entity_2_type = {}
+    for cls in reasoner.classes if tbox else ():
+        entity_2_type[cls.storid] = "class"
+        if not reasoner.is_satisfiable(cls):
+            new_equivs[cls.storid].append(owlready2.owl_nothing)
+            continue
+        new_equivs[cls.storid].extend(b.storid for b in reasoner.equivalents(cls))
+        parents = reasoner.parents(cls)
+        if parents:
+            new_parents[cls.storid].extend(p.storid for p in parents)
+    for s in sorted(recalcules):
+        entity_2_type[s] = "individual"
+        new_parents[s].extend(c.storid for c in reasoner.most_specific_types(reasoner.individus[s]) or [Thing])
+
+    if debug:
+        print(f"* Tableau * {len(reasoner.classes)} classes{'' if tbox else ' (déjà classées)'}, "
+              f"{len(recalcules)}/{len(reasoner.individus)} individus recalculés : "
+              f"{reasoner.stats['tests']} tests ({reasoner.stats['cached']} en cache), "
+              f"{time.perf_counter() - debut:.3f} s", file=sys.stderr)
+
+    _apply_reasoning_results(world, ontology, debug, new_parents, new_equivs, entity_2_type)
+    if infer_property_values:
+        relations = [(a.storid, p, b.storid) for a, p, b in reasoner.property_values(recalcules)
+                     if not world._has_obj_triple_spo(a.storid, p.storid, b.storid)
+                     and not (p._inverse_property and world._has_obj_triple_spo(b.storid, p._inverse_storid, a.storid))]
+        _apply_inferred_obj_relations(world, ontology, debug, relations)
+
+    # les faits écrits sont des conséquences : ils deviennent la référence du prochain passage
+    reasoner.rebase()
+    _raisonneurs[world] = (_signature_tbox(world), reasoner)
+    return reasoner
@@ -0,0 +1,98 @@
+import hashlib
+import inspect
+import os
+import sqlite3
+import sys
+
+import owlready2
+
+TABLE = "etapes_tp"     # étapes déjà appliquées au quadstore, dans l'ordre
+
+
+def empreinte(etape):
+    """
+    Empreinte d'une étape : son nom et le hachage de son code source.
+    """
+    return etape.__name__, hashlib.sha1(inspect.getsource(etape).encode()).hexdigest()
+
+
+def _etapes_enregistrees(chemin):
+    # lues avant l'ouverture par owlready2 (qui verrouille la base en mode exclusif)
+    if not os.path.exists(chemin):
+        return []
+    with sqlite3.connect(chemin) as db:
+        if not db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE,)).fetchone():
+            return []
+        return [tuple(e) for e in db.execute(f"SELECT nom, empreinte FROM {TABLE} ORDER BY rang")]
+
+
+def _supprimer(chemin):
+    for fichier in (chemin, chemin + "-journal", chemin + "-wal", chemin + "-shm"):
+        if os.path.exists(fichier):
+            os.remove(fichier)
+
+
+def ouvrir(chemin, iri, etapes=None, world=None, debug=1):
+    """
+    Ouvre le quadstore SQLite d'owlready2 (créé au besoin) et y reprend l'ontologie iri
+    telle qu'enregistrée, sans la reconstruire ni relire de RDF/XML.
+
+    etapes est la liste des fonctions qui construisent l'ontologie (chacune reçoit
+    l'ontologie). Seules les étapes absentes du quadstore sont exécutées ; chacune est
+    validée (commit SQLite) avec son empreinte, donc seuls ses ajouts sont écrits.
+    Si le code d'une étape déjà appliquée a changé, ses anciens faits ne peuvent pas
+    être retirés un à un : le quadstore est alors reconstruit depuis la première étape.
+    Sans etapes, le quadstore est repris tel quel.
+
+    Les index de owlready2 (objs(s,p), objs(o,p,c,s), datas(s,p), ...) sont créés
+    avec la base et ses statistiques sont recalculées à chaque ouverture.
+    Retourne (ontologie, noms des étapes exécutées).
+    """
+    world = world or owlready2.default_world
+    enregistrees = _etapes_enregistrees(chemin)
+    if etapes is None:
+        etapes = []
+        voulues = enregistrees
+    else:
+        voulues = [empreinte(e) for e in etapes]
+    if enregistrees != voulues[:len(enregistrees)]:
+        if debug:
+            print(f"* Stockage * {chemin} : étapes modifiées, reconstruction", file=sys.stderr)
+        _supprimer(chemin)
+        enregistrees = []
+
+    world.set_backend(filename=chemin)
+    world.graph.db.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (rang INTEGER PRIMARY KEY, nom TEXT, empreinte TEXT)")
+    ontologie = world.get_ontology(iri)
+    world.save()
+
+    executees = []
+    for rang in range(len(enregistrees), len(etapes)):
+        etapes[rang](ontologie)
+        world.graph.db.execute(f"INSERT INTO {TABLE} VALUES (?, ?, ?)", (rang, *voulues[rang]))
+        world.save()
+        executees.append(voulues[rang][0])
+    if debug:
+        print(f"* Stockage * {chemin} : {len(enregistrees)} étape(s) reprise(s), "
+              f"{len(executees)} exécutée(s)", file=sys.stderr)
+    return ontologie, executees
+
+
+def exporter(ontologie, chemin):
+    """
+    Exporte selon l'extension de chemin :
+    - .nt : N-Triples, écrits directement depuis les tables SQLite,
+    - .sqlite3 : copie binaire du quadstore entier (API de sauvegarde de SQLite),
+    - sinon : RDF/XML, comme onto.save.
+    """
+    extension = os.path.splitext(chemin)[1]
+    if extension == ".sqlite3":
+        if os.path.exists(chemin):
+            os.remove(chemin)
+        ontologie.world.save()     # la sauvegarde attend la fin de la transaction en cours
+        copie = sqlite3.connect(chemin)
+        with copie:
+            ontologie.world.graph.db.backup(copie)
+        copie.close()
+    else:
+        ontologie.save(file=chemin, format="ntriples" if extension == ".nt" else "rdfxml")